@@ -0,0 +1,134 @@
+# benchmarks/detail_parse_scaling.py
+#!/usr/bin/env python3
+"""
+Detail-stage throughput against a local stand-in server: pages are fetched
+by the scraper's I/O threads and parsed inline (0 processes, GIL-bound) or
+on a process pool of increasing size.
+
+    python benchmarks/detail_parse_scaling.py --pages 200 --processes 0 1 2 4
+"""
+
+import argparse
+import logging
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+root_dir = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(root_dir / "src"))
+
+SCHOOLS = [
+    ("Highlands Elementary School", "K-5"),
+    ("Kennedy Junior High School", "6-8"),
+    ("Naperville North High School", "9-12"),
+]
+
+
+def fake_page(pid: int, filler_rows: int) -> bytes:
+    """A property page with a schools table buried in a lot of other markup"""
+    rows = "".join(
+        f'<div class="row r{i}"><span class="label">Feature {i}</span>'
+        f'<span class="value">Value {pid}-{i}</span><a href="/x/{i}">more</a></div>'
+        for i in range(filler_rows)
+    )
+    items = "".join(
+        f'<div class="ListItem"><div class="ListItem__heading">{name}</div>'
+        f'<div class="ListItem__description">Public, {grades} &bull; Serves this home</div></div>'
+        for name, grades in SCHOOLS
+    )
+    return (f'<html><head><title>{pid}</title></head><body>{rows}'
+            f'<div class="schools-table">{items}</div>{rows}</body></html>').encode()
+
+
+def serve(port: int, filler_rows: int) -> None:
+    page_cache = {}
+
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            pid = int(self.path.rsplit("/", 1)[-1])
+            body = page_cache.get(pid % 50)
+            if body is None:
+                body = page_cache[pid % 50] = fake_page(pid % 50, filler_rows)
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    ThreadingHTTPServer(("127.0.0.1", port), Handler).serve_forever()
+
+
+def make_scraper(tmp: Path):
+    from housewatch.config import ProjectConfig
+    from housewatch.scraper.rate_control import AdaptiveRateController, RateSettings
+    from housewatch.scraper.redfin_scraper import RedfinScraper
+    from housewatch.storage.json_storage import HouseStorage
+
+    storage = HouseStorage(str(tmp / "seen.json"), str(tmp / "matched.json"))
+    # No pacing: measure the pipeline, not the politeness delay
+    rate = AdaptiveRateController(RateSettings(initial_rps=1e6, max_rps=1e6))
+    return RedfinScraper(ProjectConfig(), storage, rate_controller=rate)
+
+
+def make_houses(port: int, pages: int):
+    from housewatch.models.house import House
+
+    return [
+        House(listing_id=str(i), address=f"{i} Main St", city="Naperville", state="IL",
+              zip_code="60540", price=500000, url=f"http://127.0.0.1:{port}/IL/home/{i}")
+        for i in range(pages)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Detail-stage throughput vs parse processes")
+    parser.add_argument("--pages", type=int, default=200)
+    parser.add_argument("--processes", type=int, nargs="+",
+                        default=sorted({0, 1, 2, os.cpu_count() or 1}))
+    parser.add_argument("--fetch-workers", type=int, default=8)
+    parser.add_argument("--filler-rows", type=int, default=1500, help="markup size per page")
+    parser.add_argument("--port", type=int, default=8799)
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+
+    server = multiprocessing.Process(target=serve, args=(args.port, args.filler_rows), daemon=True)
+    server.start()
+    time.sleep(0.5)
+
+    page_kib = len(fake_page(0, args.filler_rows)) / 1024
+    print(f"{args.pages} pages of {page_kib:.0f} KiB, {args.fetch_workers} fetch threads, "
+          f"{os.cpu_count()} cores")
+    print(f"{'processes':>9} {'seconds':>8} {'pages/s':>8} {'speed-up':>9}")
+
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            scraper = make_scraper(Path(tmp))
+            scraper.fetch_workers = args.fetch_workers
+            houses = make_houses(args.port, args.pages)
+
+            baseline = None
+            for processes in args.processes:
+                scraper.parse_workers = processes
+                start = time.perf_counter()
+                details, _ = scraper._fetch_all_details(houses)
+                elapsed = time.perf_counter() - start
+
+                assert len(details) == args.pages, f"only {len(details)} pages parsed"
+                assert all(schools["high"] for _, schools in details)
+                baseline = baseline or elapsed
+                print(f"{processes:>9} {elapsed:>8.2f} {args.pages / elapsed:>8.1f} "
+                      f"{baseline / elapsed:>8.2f}x")
+    finally:
+        server.terminate()
+
+
+if __name__ == "__main__":
+    main()
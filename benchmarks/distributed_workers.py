@@ -0,0 +1,93 @@
+# benchmarks/distributed_workers.py
+#!/usr/bin/env python3
+"""
+Detail-fetch throughput of the job queue against a local stand-in server,
+with 1, 2, 4 ... worker processes. Each worker stands in for one host: its
+rate controller is capped at --rps, the way a per-IP limit caps a real one,
+so throughput should grow about linearly with the number of workers.
+
+    python benchmarks/distributed_workers.py --pages 240 --workers 1 2 4 --rps 10
+"""
+
+import argparse
+import logging
+import multiprocessing
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+root_dir = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(root_dir / "src"))
+
+from detail_parse_scaling import fake_page, make_houses, serve  # noqa: E402
+
+
+def run_worker(queue_path: Path, worker_id: str, rps: float) -> None:
+    from housewatch.config import ProjectConfig
+    from housewatch.scraper.distributed import DistributedSettings, Worker
+    from housewatch.scraper.rate_control import AdaptiveRateController, RateSettings
+    from housewatch.scraper.redfin_scraper import RedfinScraper
+    from housewatch.storage.job_queue import JobQueue
+
+    logging.disable(logging.WARNING)
+    rate = AdaptiveRateController(RateSettings(initial_rps=rps, max_rps=rps))
+    scraper = RedfinScraper(ProjectConfig(), storage=None, rate_controller=rate)
+    scraper.parse_workers = 0    # one core per stand-in host is plenty at these rates
+    settings = DistributedSettings(batch_size=4, poll_seconds=0.05, idle_exit_seconds=0.2)
+    with JobQueue(queue_path) as queue:
+        Worker(scraper, queue, worker_id, settings).run(once=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Job-queue throughput vs number of workers")
+    parser.add_argument("--pages", type=int, default=240)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--rps", type=float, default=10.0, help="request rate cap per worker")
+    parser.add_argument("--filler-rows", type=int, default=200, help="markup size per page")
+    parser.add_argument("--port", type=int, default=8798)
+    args = parser.parse_args()
+
+    from housewatch.scraper.distributed import DistributedSettings, QueueDispatcher
+    from housewatch.storage.job_queue import JobQueue
+
+    logging.disable(logging.WARNING)
+
+    server = multiprocessing.Process(target=serve, args=(args.port, args.filler_rows), daemon=True)
+    server.start()
+    time.sleep(0.5)
+
+    page_kib = len(fake_page(0, args.filler_rows)) / 1024
+    print(f"{args.pages} pages of {page_kib:.0f} KiB, {args.rps:g} requests/s per worker")
+    print(f"{'workers':>7} {'seconds':>8} {'pages/s':>8} {'speed-up':>9}")
+
+    try:
+        baseline = None
+        for count in args.workers:
+            with tempfile.TemporaryDirectory() as tmp:
+                queue_path = Path(tmp) / "jobs.sqlite"
+                houses = make_houses(args.port, args.pages)
+                with JobQueue(queue_path) as queue:
+                    dispatch = QueueDispatcher(queue, DistributedSettings(poll_seconds=0.05))
+
+                    start = time.perf_counter()
+                    workers = [multiprocessing.Process(target=run_worker,
+                                                       args=(queue_path, f"w{i}", args.rps))
+                               for i in range(count)]
+                    for w in workers:
+                        w.start()
+                    details, failed = dispatch(houses)
+                    elapsed = time.perf_counter() - start
+                    for w in workers:
+                        w.join()
+
+                assert len(details) == args.pages, f"only {len(details)} pages done, {len(failed)} failed"
+                baseline = baseline or elapsed
+                print(f"{count:>7} {elapsed:>8.2f} {args.pages / elapsed:>8.1f} "
+                      f"{baseline / elapsed:>8.2f}x")
+    finally:
+        server.terminate()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+# benchmarks/house_memory.py
+#!/usr/bin/env python3
+"""
+Per-house memory of the listing containers, measured with tracemalloc.
+
+Compares the original @dataclass House (per-instance __dict__ and a fresh
+schools dict per house), the slotted House, and the columnar HouseBatch.
+
+    python benchmarks/house_memory.py --count 50000
+"""
+
+import argparse
+import gc
+import sys
+import tracemalloc
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+root_dir = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(root_dir / "src"))
+
+from housewatch.models.house import House
+from housewatch.models.house_batch import HouseBatch
+
+
+@dataclass
+class LegacyHouse:
+    """House as it was before __slots__ (kept here for comparison only)"""
+    listing_id: str
+    address: str
+    city: str
+    state: str
+    zip_code: str
+    price: int
+    year_built: Optional[int] = None
+    property_type: str = ""
+    hoa_fee: float = 0.0
+    beds: Optional[int] = None
+    baths: Optional[float] = None
+    sqft: Optional[int] = None
+    lot_size: Optional[float] = None
+    url: str = ""
+    schools: Dict[str, List[str]] = field(default_factory=dict)
+    listed_date: Optional[object] = None
+    last_update: Optional[object] = None
+
+    def __post_init__(self):
+        if not self.schools:
+            self.schools = {"elementary": [], "middle": [], "high": []}
+
+
+CITIES = ["Naperville", "Lisle", "Woodridge", "Aurora", "Wheaton"]
+
+
+def fields_for(i: int) -> dict:
+    # Strings are built per row, as they are when decoded from JSON
+    return dict(
+        listing_id=str(180000000 + i),
+        address=f"{i} Main St",
+        city="".join(CITIES[i % len(CITIES)]),
+        state="".join("IL"),
+        zip_code=str(60540 + i % 20),
+        price=500000 + i,
+        year_built=1980 + i % 40,
+        property_type="".join("Single Family"),
+        hoa_fee=0.0,
+        beds=3 + i % 3,
+        baths=2.5,
+        sqft=2000 + i % 900,
+        lot_size=8000.0,
+        url=f"https://www.redfin.com/IL/Naperville/{i}-Main-St/home/{i}",
+    )
+
+
+def measure(build, count: int) -> int:
+    gc.collect()
+    tracemalloc.start()
+    container = build(count)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del container
+    return current
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-house memory of listing containers")
+    parser.add_argument("--count", type=int, default=50000)
+    args = parser.parse_args()
+    n = args.count
+
+    results = {
+        "List[LegacyHouse] (before)": measure(lambda k: [LegacyHouse(**fields_for(i)) for i in range(k)], n),
+        "List[House] (slots)": measure(lambda k: [House(**fields_for(i)) for i in range(k)], n),
+        "HouseBatch (columnar)": measure(lambda k: HouseBatch(House(**fields_for(i)) for i in range(k)), n),
+    }
+
+    baseline = next(iter(results.values()))
+    print(f"{n} houses")
+    print(f"{'container':<28} {'total MiB':>10} {'bytes/house':>12} {'vs before':>10}")
+    for name, total in results.items():
+        print(f"{name:<28} {total / 2**20:>10.2f} {total / n:>12.0f} {total / baseline:>9.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+# benchmarks/price_history.py
+#!/usr/bin/env python3
+"""
+Size and query speed of the price-history store with synthetic samples:
+--properties listings, each repriced --changes times over a year, written
+in --runs segments (one per simulated run) and then merged.
+
+    python benchmarks/price_history.py --properties 100000 --changes 10
+"""
+
+import argparse
+import json
+import logging
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+root_dir = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(root_dir / "src"))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Price history size and query speed")
+    parser.add_argument("--properties", type=int, default=100000)
+    parser.add_argument("--changes", type=int, default=10, help="price changes per property")
+    parser.add_argument("--runs", type=int, default=8, help="segments written before the merge")
+    args = parser.parse_args()
+
+    from housewatch.storage.timeseries import PriceHistory, PriceHistorySettings
+
+    logging.disable(logging.WARNING)
+    rng = random.Random(7)
+    now = int(time.time())
+    start = now - 365 * 86400
+    step = 365 * 86400 // (args.runs * args.changes)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        history = PriceHistory(Path(tmp), PriceHistorySettings(max_segments=args.runs - 1))
+        prices = {pid: rng.randrange(200_000, 1_500_000, 1000) for pid in range(1, args.properties + 1)}
+
+        began = time.perf_counter()
+        ts = start
+        for run in range(args.runs):
+            for _ in range(args.changes):
+                ts += step
+                for pid in prices:
+                    if rng.random() < 0.5:
+                        prices[pid] = int(prices[pid] * rng.uniform(0.9, 1.05)) // 1000 * 1000
+                    history.record(pid, prices[pid], "Active", ts)
+            history.flush()
+        write_s = time.perf_counter() - began
+
+        samples = len(history)
+        size = sum(p.stat().st_size for p in Path(tmp).glob("segment-*.bin"))
+        as_json = len(json.dumps([[1234567890, ts, 1234000, "Active"]])) - 2
+        print(f"{samples:,} samples of {args.properties:,} properties in {len(history.segments)} segment(s)")
+        print(f"  {size / 2**20:.1f} MiB on disk, {size / samples:.1f} bytes/sample "
+              f"(about {as_json} as JSON rows), written in {write_s:.1f}s")
+
+        began = time.perf_counter()
+        for pid in rng.sample(range(1, args.properties + 1), 1000):
+            history.history(pid)
+        print(f"  history(): {(time.perf_counter() - began) * 1000:.1f} us per property")
+
+        for pct, days in ((5, 30), (10, 90)):
+            began = time.perf_counter()
+            drops = history.price_drops(pct, days, now=ts)
+            print(f"  price_drops({pct}%, {days} days): {len(drops):,} properties "
+                  f"in {time.perf_counter() - began:.2f}s")
+        history.close()
+
+
+if __name__ == "__main__":
+    main()
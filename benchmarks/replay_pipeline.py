@@ -0,0 +1,61 @@
+# benchmarks/replay_pipeline.py
+#!/usr/bin/env python3
+"""
+Whole-pipeline throughput on recorded traffic: RedfinScraper.fetch() is
+served from a cassette (see `main.py --record`) with fresh state on every
+repeat, so runs of different versions see identical inputs and no network.
+
+    python benchmarks/replay_pipeline.py data/cassettes/20240101-120000.zip --repeat 5
+"""
+
+import argparse
+import logging
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+root_dir = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(root_dir / "src"))
+
+
+def replay_once(cassette, tmp: Path):
+    from housewatch.config import ProjectConfig
+    from housewatch.scraper.redfin_scraper import RedfinScraper
+    from housewatch.storage.json_storage import HouseStorage
+
+    storage = HouseStorage(str(tmp / "seen.json"), str(tmp / "matched.json"))
+    scraper = RedfinScraper(ProjectConfig(), storage, cassette=cassette)
+    start = time.perf_counter()
+    matches = scraper.fetch()
+    return time.perf_counter() - start, len(storage.seen_houses), len(matches)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pipeline throughput on a recorded cassette")
+    parser.add_argument("cassette", type=Path)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    from housewatch.scraper.cassette import Cassette
+
+    logging.disable(logging.WARNING)
+
+    with Cassette.open(args.cassette) as cassette:
+        print(f"{len(cassette.index)} recorded requests in {args.cassette}")
+        print(f"{'run':>3} {'seconds':>8} {'evaluated':>9} {'matches':>7} {'houses/s':>9}")
+        times = []
+        for i in range(args.repeat):
+            with tempfile.TemporaryDirectory() as tmp:
+                elapsed, evaluated, matches = replay_once(cassette, Path(tmp))
+            times.append(elapsed)
+            print(f"{i + 1:>3} {elapsed:>8.2f} {evaluated:>9} {matches:>7} {evaluated / elapsed:>9.1f}")
+        if cassette.misses:
+            print(f"warning: {cassette.misses} requests were not in the cassette")
+
+    print(f"median {statistics.median(times):.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+# benchmarks/search_decode_rss.py
+#!/usr/bin/env python3
+"""
+Peak memory of decoding search responses: full-body json.loads (previous
+path) vs. the streaming homes decoder. Each mode runs in its own process
+over synthetic Redfin-shaped payloads (350 homes per region by default).
+
+    python benchmarks/search_decode_rss.py --regions 20
+"""
+
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+root_dir = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(root_dir / "src"))
+
+CHUNK = 64 * 1024
+
+
+def fake_home(region: int, i: int) -> dict:
+    """A search home with roughly the size and shape of a real one"""
+    pid = region * 100000 + i
+    return {
+        "mlsId": {"label": "MLS#", "value": str(11000000 + pid)},
+        "showMlsId": False, "mlsStatus": "Active", "showDatasourceLogo": True,
+        "price": {"value": 650000 + i * 100, "level": 1},
+        "hideSalePrice": False, "hoa": {"value": 0, "level": 1},
+        "isHoaFrequencyKnown": True,
+        "sqFt": {"value": 2400 + i, "level": 1}, "pricePerSqFt": {"value": 270, "level": 1},
+        "lotSize": {"value": 9000, "level": 1}, "beds": 4, "baths": 2.5, "fullBaths": 2,
+        "partialBaths": 1, "location": {"value": "Brookdale", "level": 1},
+        "stories": 2.0, "latLong": {"value": {"latitude": 41.7 + i * 1e-4, "longitude": -88.1 - i * 1e-4}, "level": 1},
+        "streetLine": {"value": f"{i} Example Ave", "level": 1}, "unitNumber": {"level": 1},
+        "city": "Naperville", "state": "IL", "zip": "60565", "postalCode": {"value": "60565", "level": 1},
+        "countryCode": "US", "showAddressOnMap": True, "soldDate": None, "searchStatus": 1,
+        "propertyType": 6, "uiPropertyType": 1, "listingType": 1, "propertyId": pid,
+        "listingId": pid + 7, "dataSourceId": 153, "marketId": 3, "yearBuilt": {"value": 1995, "level": 1},
+        "dom": {"value": 5, "level": 1}, "timeOnRedfin": {"value": 432000000, "level": 1},
+        "originalTimeOnRedfin": {"value": 432000000, "level": 1}, "timeZone": "US/Central",
+        "primaryPhotoDisplayLevel": 1, "photos": {"value": "0-25:0,26-40:1", "level": 1},
+        "alternatePhotosInfo": {"mediaListIndex": 0, "groupCode": "153_1", "positionSpec": list(range(40))},
+        "listingAgent": {"name": "Agent Name", "redfinAgentId": 0},
+        "listingRemarks": "Beautiful home with an open floor plan. " * 12,
+        "remarksAccessLevel": 1, "servicePolicyId": 1, "businessMarketIds": [3],
+        "url": f"/IL/Naperville/{i}-Example-Ave-60565/home/{pid}",
+        "hasInsight": False, "sashes": [{"sashType": 1, "sashTypeName": "New", "sashTypeColor": "#00B36B"}],
+        "isHot": False, "hasVirtualTour": False, "hasVideoTour": False, "has3DTour": True,
+        "newConstructionCommunityInfo": {}, "isRedfin": False, "isNewConstruction": False,
+        "listingBroker": {"name": "Some Realty Group"}, "scanUrl": "https://example.com/3d/" + "x" * 40,
+    }
+
+
+def body_chunks(region: int, homes: int):
+    """Response body as the network delivers it, without building it whole"""
+    head = '{}&&{"version":535,"errorMessage":"Success","resultCode":0,"payload":{"homes":['
+    pending = head.encode()
+    for i in range(homes):
+        pending += (("," if i else "") + json.dumps(fake_home(region, i))).encode()
+        while len(pending) >= CHUNK:
+            yield pending[:CHUNK]
+            pending = pending[CHUNK:]
+    pending += b'],"dataSources":[{"id":153,"name":"MRED"}],"buildings":{}}}'
+    yield pending
+
+
+def run_full(regions: int, homes: int) -> int:
+    """Previous path: resp.text, strip copy, json.loads, keep every raw home"""
+    all_homes = []
+    for region in range(regions):
+        content = b"".join(body_chunks(region, homes))   # resp.content
+        text = content.decode("utf-8")                    # resp.text
+        text = text.replace("{}&&", "", 1) if text.startswith("{}&&") else text
+        data = json.loads(text)
+        all_homes.extend(data.get("payload", {}).get("homes", []))
+    seen = {}
+    for h in all_homes:
+        seen[h.get("propertyId") or h.get("listingId")] = h
+    return len(seen)
+
+
+def run_stream(regions: int, homes: int) -> int:
+    from housewatch.scraper.search_stream import iter_search_homes
+
+    seen = {}
+    for region in range(regions):
+        for h in iter_search_homes(body_chunks(region, homes)):
+            seen[h.get("propertyId") or h.get("listingId")] = h
+    return len(seen)
+
+
+def child(mode: str, regions: int, homes: int) -> None:
+    run = run_full if mode == "full" else run_stream
+    tracemalloc.start()
+    start = time.perf_counter()
+    count = run(regions, homes)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    rss_kib = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(json.dumps({"homes": count, "seconds": elapsed, "peak_traced": peak, "max_rss_kib": rss_kib}))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Peak memory of search response decoding")
+    parser.add_argument("--regions", type=int, default=20)
+    parser.add_argument("--homes", type=int, default=350)
+    parser.add_argument("--child", choices=["full", "stream"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.child, args.regions, args.homes)
+        return
+
+    print(f"{args.regions} regions x {args.homes} homes")
+    print(f"{'mode':<8} {'homes':>6} {'seconds':>8} {'peak traced MiB':>16} {'max RSS MiB':>12}")
+    for mode in ("full", "stream"):
+        out = subprocess.run(
+            [sys.executable, __file__, "--child", mode,
+             "--regions", str(args.regions), "--homes", str(args.homes)],
+            capture_output=True, text=True, check=True,
+        )
+        r = json.loads(out.stdout)
+        print(f"{mode:<8} {r['homes']:>6} {r['seconds']:>8.2f} "
+              f"{r['peak_traced'] / 2**20:>16.1f} {r['max_rss_kib'] / 1024:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+# benchmarks/startup_importtime.py
+#!/usr/bin/env python3
+"""
+Start-up cost of the cron entry point, measured with `python -X importtime`.
+
+Each scenario runs in a fresh interpreter; the import time of all top-level
+imports is summed (median over --repeat runs) and heavy third-party modules
+that were pulled in are listed.
+
+    python benchmarks/startup_importtime.py --repeat 7
+"""
+
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+root_dir = Path(__file__).resolve().parent.parent
+
+SCENARIOS = {
+    # `python -m housewatch.main --help` / report commands
+    "import housewatch.main": "import housewatch.main",
+    # What a run that finds no new listings touches: config + search only
+    "no-new-listings run": (
+        "import housewatch.main; "
+        "from housewatch.config import ProjectConfig; ProjectConfig(); "
+        "from housewatch.scraper.redfin_scraper import RedfinScraper; "
+        "import requests"
+    ),
+}
+
+HEAVY_MODULES = ("requests", "urllib3", "bs4", "lxml", "smtplib", "email.mime", "yaml", "dotenv")
+
+LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def measure(statement: str):
+    """Return (total top-level import µs, set of imported module names)"""
+    env = dict(os.environ, PYTHONPATH=str(root_dir / "src"))
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        cwd=root_dir, env=env, capture_output=True, text=True, check=True,
+    )
+
+    total = 0
+    modules = set()
+    for line in proc.stderr.splitlines():
+        m = LINE.match(line)
+        if not m:
+            continue
+        cumulative, indent, name = int(m.group(2)), len(m.group(3)), m.group(4)
+        modules.add(name)
+        if indent == 1:  # top-level import
+            total += cumulative
+    return total, modules
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'scenario':<26} {'median ms':>10} {'min ms':>8}  heavy modules loaded")
+    for name, statement in SCENARIOS.items():
+        totals = []
+        modules = set()
+        for _ in range(args.repeat):
+            total, modules = measure(statement)
+            totals.append(total)
+
+        heavy = sorted(h for h in HEAVY_MODULES
+                       if any(m == h or m.startswith(h + ".") for m in modules))
+        print(f"{name:<26} {statistics.median(totals) / 1000:>10.1f} "
+              f"{min(totals) / 1000:>8.1f}  {', '.join(heavy) or '-'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,35 +1,567 @@
 # src/housewatch/config.py
 
+import hashlib
+import logging
+import os
+import pickle
+from dataclasses import dataclass
 from pathlib import Path
-from housewatch.utils.load_config import load_config
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+from housewatch.utils.load_config import (
+    env_placeholders,
+    load_env,
+    read_yaml,
+    root_dir,
+    substitute_env,
+)
+
+logger = logging.getLogger(__name__)
+
+# Anchored to the project root, so runs from any working directory find them
+CONFIG_DIR = root_dir / "configs"
+CACHE_PATH = root_dir / "data" / "cache" / "config.pickle"
+# Bump when the cached layout or the compiled structures change
+CACHE_VERSION = 5
+
+CONFIG_FILES = (
+    ("email", "email.yaml"),
+    ("criteria", "criteria.yaml"),
+    ("app", "app.yaml"),
+)
+
+KNOWN_MODULES = {"property", "location", "schools", "geometry", "details"}
+SCHOOL_LEVELS = ("elementary", "middle", "high")
+
+
+class ConfigError(ValueError):
+    """Raised when a configuration file is missing or invalid"""
+
+
+@dataclass(frozen=True)
+class CriteriaPlan:
+    """Search-stage thresholds, resolved once from criteria.property/location"""
+    state: str
+    property_type: str
+    min_price: float
+    max_price: float
+    min_year_built: int
+    max_hoa: float
+
+
+@dataclass(frozen=True)
+class CompiledConfig:
+    """Structures derived from the raw config, cached on disk with it"""
+    plan: CriteriaPlan
+    schools: Any                             # filters.school_filter.SchoolMatcher
+    region_ids: Tuple[Optional[str], ...]    # (None,) for a coordinate search
+    search_params: Mapping[Optional[str], Mapping[str, Any]]
+    geometry: Any = None                     # filters.geo_filter.GeoFilter if the module is active
+    data_files: Tuple[tuple, ...] = ()       # stamps of files read while compiling (GeoJSON)
+    details: Any = None                      # filters.detail_filter.DetailMatcher if the module is active
+
+
+@dataclass(frozen=True)
+class ConfigSnapshot:
+    """Validated, read-only view of all configuration files"""
+    email: Mapping[str, Any]
+    criteria: Mapping[str, Any]
+    app: Mapping[str, Any]
+    compiled: CompiledConfig
+    sources: Tuple[Path, ...]
 
 
 class ProjectConfig:
     """Load all configurations with optional .local.yaml replacement"""
-    
-    def __init__(self):
 
-        self.email = self._load("configs/email.yaml", "email")
-        self.criteria = self._load("configs/criteria.yaml", "criteria")
-        self.app = self._load("configs/app.yaml", "app")
+    def __init__(self, config_dir: Path = CONFIG_DIR, cache_path: Optional[Path] = CACHE_PATH):
 
+        self._snapshot = load_snapshot(Path(config_dir), cache_path)
 
-    def _load(self, base_path: str, root_key: str):
-        """
-        Load <name>.local.yaml if it exists, otherwise <name>.yaml
-        """
+        self.email = self._snapshot.email
+        self.criteria = self._snapshot.criteria
+        self.app = self._snapshot.app
+        self.compiled = self._snapshot.compiled
 
-        path = Path(base_path)
 
-        local_path = path.with_name(
-            path.stem + ".local" + path.suffix
-        )
+    def get(self, key, default=None):
+        return getattr(self, key, default)
 
-        target = str(local_path) if local_path.exists() else base_path
-        data = load_config(target)
 
-        return data.get(root_key, data)
-    
-    
-    def get(self, key, default=None):
-        return getattr(self, key, default)
\ No newline at end of file
+# ----------------------------------------------------------------------
+# Snapshot loading
+# ----------------------------------------------------------------------
+
+# config_dir -> (cache key, snapshot); reused by daemon or repeated runs
+_snapshots: Dict[Path, Tuple[tuple, ConfigSnapshot]] = {}
+
+
+def load_snapshot(config_dir: Path = CONFIG_DIR, cache_path: Optional[Path] = CACHE_PATH) -> ConfigSnapshot:
+    """
+    Return the config snapshot, skipping YAML parsing and recompilation unless
+    a source file (mtime/size) or a referenced environment variable changed.
+    """
+    load_env()
+
+    sources = [_resolve(config_dir / name) for _, name in CONFIG_FILES]
+    file_key = tuple(_file_stamp(path) for path in sources)
+
+    memo = _snapshots.get(config_dir)
+    if (memo and memo[0][0] == file_key and memo[0][1] == _env_hash(memo[0][2])
+            and _data_files_unchanged(memo[1].compiled)):
+        return memo[1]
+
+    cached = _read_cache(cache_path, file_key)
+    if cached is not None:
+        raw = cached["raw"]
+    else:
+        raw = {root_key: _root(read_yaml(path), root_key, path)
+               for (root_key, _), path in zip(CONFIG_FILES, sources)}
+
+    env_names = tuple(sorted(env_placeholders(raw)))
+    env_hash = _env_hash(env_names)
+
+    data = {key: substitute_env(tree) for key, tree in raw.items()}
+    validate(data)
+
+    if (cached is not None and cached["env_hash"] == env_hash
+            and _data_files_unchanged(cached["compiled"])):
+        compiled = cached["compiled"]
+    else:
+        compiled = compile_config(data["app"], data["criteria"])
+        _write_cache(cache_path, {
+            "version": CACHE_VERSION,
+            "file_key": file_key,
+            "env_hash": env_hash,
+            "raw": raw,           # before substitution: no secrets on disk
+            "compiled": compiled,
+        })
+
+    snapshot = ConfigSnapshot(
+        email=freeze(data["email"]),
+        criteria=freeze(data["criteria"]),
+        app=freeze(data["app"]),
+        compiled=CompiledConfig(
+            plan=compiled.plan,
+            schools=compiled.schools,
+            region_ids=compiled.region_ids,
+            search_params=freeze(compiled.search_params),
+            geometry=compiled.geometry,
+            data_files=compiled.data_files,
+            details=compiled.details,
+        ),
+        sources=tuple(sources),
+    )
+    _snapshots[config_dir] = ((file_key, env_hash, env_names), snapshot)
+    return snapshot
+
+
+def _resolve(path: Path) -> Path:
+    """
+    Load <name>.local.yaml if it exists, otherwise <name>.yaml
+    """
+    local_path = path.with_name(path.stem + ".local" + path.suffix)
+    return local_path if local_path.exists() else path
+
+
+def _file_stamp(path: Path) -> tuple:
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        raise ConfigError(f"Cannot find: {path}") from None
+    return (str(path), st.st_mtime_ns, st.st_size)
+
+
+def _data_files_unchanged(compiled: CompiledConfig) -> bool:
+    for stamp in compiled.data_files:
+        try:
+            if _file_stamp(Path(stamp[0])) != stamp:
+                return False
+        except ConfigError:
+            return False
+    return True
+
+
+def _env_hash(names) -> str:
+    digest = hashlib.sha256()
+    for name in names:
+        digest.update(f"{name}={os.environ.get(name)}\0".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _root(data, root_key: str, path: Path) -> dict:
+    section = data.get(root_key, data) if isinstance(data, dict) else data
+    if not isinstance(section, dict):
+        raise ConfigError(f"{path}: expected a mapping under '{root_key}'")
+    return section
+
+
+def _read_cache(cache_path: Optional[Path], file_key: tuple) -> Optional[dict]:
+    if cache_path is None or not cache_path.exists():
+        return None
+    try:
+        with open(cache_path, "rb") as f:
+            cached = pickle.load(f)
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable config cache {cache_path}: {e}")
+        return None
+
+    if cached.get("version") != CACHE_VERSION or cached.get("file_key") != file_key:
+        return None
+    return cached
+
+
+def _write_cache(cache_path: Optional[Path], payload: dict) -> None:
+    if cache_path is None:
+        return
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = cache_path.with_suffix(".tmp")
+        with open(tmp_path, "wb") as f:
+            pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        logger.warning(f"Could not write config cache {cache_path}: {e}")
+
+
+def freeze(obj):
+    """Recursively turn dicts into read-only mappings and lists into tuples"""
+    if isinstance(obj, dict):
+        return MappingProxyType({k: freeze(v) for k, v in obj.items()})
+    if isinstance(obj, (list, tuple)):
+        return tuple(freeze(v) for v in obj)
+    return obj
+
+
+# ----------------------------------------------------------------------
+# Validation
+# ----------------------------------------------------------------------
+
+def validate(data: Dict[str, dict]) -> None:
+    """Check types and ranges of all sections, report every problem at once"""
+    errors = []
+
+    app = data["app"]
+    redfin = app.get("redfin")
+    if not isinstance(redfin, dict):
+        errors.append("app.redfin: missing section")
+    else:
+        num_homes = redfin.get("num_homes")
+        if not isinstance(num_homes, int) or not 1 <= num_homes <= 350:
+            errors.append(f"app.redfin.num_homes: expected an integer in 1..350, got {num_homes!r}")
+        incremental = redfin.get("incremental", {})
+        if not isinstance(incremental, dict):
+            errors.append("app.redfin.incremental: expected a mapping")
+        else:
+            for key in ("full_sweep_hours", "margin_minutes"):
+                if key in incremental and not _is_number(incremental[key], positive=True):
+                    errors.append(f"app.redfin.incremental.{key}: expected a positive number, "
+                                  f"got {incremental[key]!r}")
+    if "timeout" in app and not _is_number(app["timeout"], positive=True):
+        errors.append(f"app.timeout: expected a positive number, got {app['timeout']!r}")
+    rate_limit = app.get("rate_limit", {})
+    if not isinstance(rate_limit, dict):
+        errors.append("app.rate_limit: expected a mapping")
+    else:
+        for key, value in rate_limit.items():
+            if key == "max_retries":
+                if not isinstance(value, int) or isinstance(value, bool) or value < 0:
+                    errors.append(f"app.rate_limit.max_retries: expected a non-negative integer, got {value!r}")
+            elif not _is_number(value, positive=True):
+                errors.append(f"app.rate_limit.{key}: expected a positive number, got {value!r}")
+        if (_is_number(rate_limit.get("min_rps")) and _is_number(rate_limit.get("max_rps"))
+                and rate_limit["min_rps"] > rate_limit["max_rps"]):
+            errors.append("app.rate_limit: min_rps is greater than max_rps")
+
+    details = app.get("details", {})
+    if not isinstance(details, dict):
+        errors.append("app.details: expected a mapping")
+    else:
+        for key in ("fetch_workers", "parse_workers"):
+            value = details.get(key)
+            if value is not None and (not isinstance(value, int) or isinstance(value, bool) or value < 0):
+                errors.append(f"app.details.{key}: expected a non-negative integer, got {value!r}")
+        if details.get("fetch_workers") == 0:
+            errors.append("app.details.fetch_workers: must be at least 1")
+
+    priors = app.get("priors", {})
+    if not isinstance(priors, dict):
+        errors.append("app.priors: expected a mapping")
+    else:
+        for key in ("confidence", "max_match_rate", "explore_rate"):
+            value = priors.get(key)
+            if value is not None and not (_is_number(value) and 0 <= value < 1):
+                errors.append(f"app.priors.{key}: expected a number in [0, 1), got {value!r}")
+
+    listing_store = app.get("listing_store", {})
+    if not isinstance(listing_store, dict):
+        errors.append("app.listing_store: expected a mapping")
+    elif "max_age_days" in listing_store and not _is_number(listing_store["max_age_days"], positive=True):
+        errors.append(f"app.listing_store.max_age_days: expected a positive number, "
+                      f"got {listing_store['max_age_days']!r}")
+
+    retry = app.get("retry", {})
+    if not isinstance(retry, dict):
+        errors.append("app.retry: expected a mapping")
+    else:
+        for key, value in retry.items():
+            if not _is_number(value, positive=True):
+                errors.append(f"app.retry.{key}: expected a positive number, got {value!r}")
+
+    distributed = app.get("distributed", {})
+    if not isinstance(distributed, dict):
+        errors.append("app.distributed: expected a mapping")
+    else:
+        for key, value in distributed.items():
+            if key != "queue_path" and not _is_number(value, positive=True):
+                errors.append(f"app.distributed.{key}: expected a positive number, got {value!r}")
+
+    schedule = app.get("schedule", {})
+    if not isinstance(schedule, dict):
+        errors.append("app.schedule: expected a mapping")
+    else:
+        for key in ("min_interval_minutes", "max_interval_hours", "target_new_per_poll"):
+            if key in schedule and not _is_number(schedule[key], positive=True):
+                errors.append(f"app.schedule.{key}: expected a positive number, got {schedule[key]!r}")
+        if (_is_number(schedule.get("min_interval_minutes")) and _is_number(schedule.get("max_interval_hours"))
+                and schedule["min_interval_minutes"] > schedule["max_interval_hours"] * 60):
+            errors.append("app.schedule: min_interval_minutes is longer than max_interval_hours")
+
+    budget = app.get("budget", {})
+    if not isinstance(budget, dict):
+        errors.append("app.budget: expected a mapping")
+    else:
+        for key, value in budget.items():
+            if value is not None and not _is_number(value, positive=True):
+                errors.append(f"app.budget.{key}: expected a positive number of minutes or null, got {value!r}")
+        if (_is_number(budget.get("run_minutes")) and _is_number(budget.get("notify_minutes"))
+                and budget["notify_minutes"] >= budget["run_minutes"]):
+            errors.append("app.budget: notify_minutes leaves no time of run_minutes for the rest")
+
+    history = app.get("price_history", {})
+    if not isinstance(history, dict):
+        errors.append("app.price_history: expected a mapping")
+    elif "max_segments" in history and not (isinstance(history["max_segments"], int)
+                                            and history["max_segments"] >= 1):
+        errors.append(f"app.price_history.max_segments: expected a positive integer, "
+                      f"got {history['max_segments']!r}")
+
+    query = app.get("query", {})
+    if not isinstance(query, dict):
+        errors.append("app.query: expected a mapping")
+    else:
+        for key in ("port", "cache_entries", "page_size", "max_page_size"):
+            value = query.get(key, 1)
+            if not isinstance(value, int) or isinstance(value, bool) or value < 1:
+                errors.append(f"app.query.{key}: expected a positive integer, got {value!r}")
+
+    names = app.get("school_names", {})
+    if not isinstance(names, dict):
+        errors.append("app.school_names: expected a mapping")
+    elif "threshold" in names and not (_is_number(names["threshold"], positive=True) and names["threshold"] <= 1):
+        errors.append(f"app.school_names.threshold: expected a number in (0, 1], got {names['threshold']!r}")
+
+    zones = app.get("school_zones")
+    if zones is not None:
+        if not isinstance(zones, dict) or not isinstance(zones.get("path"), str):
+            errors.append("app.school_zones: expected a mapping with a 'path' to a GeoJSON file")
+        elif zones.get("boundary_tolerance_m") is not None and not _is_number(zones["boundary_tolerance_m"]):
+            errors.append(f"app.school_zones.boundary_tolerance_m: expected a number, "
+                          f"got {zones['boundary_tolerance_m']!r}")
+
+    criteria = data["criteria"]
+    modules = criteria.get("active_modules", [])
+    if not isinstance(modules, list):
+        errors.append("criteria.active_modules: expected a list")
+        modules = []
+    for module in modules:
+        if module not in KNOWN_MODULES:
+            errors.append(f"criteria.active_modules: unknown module {module!r}")
+
+    prop = criteria.get("property", {})
+    if not isinstance(prop, dict):
+        errors.append("criteria.property: expected a mapping")
+        prop = {}
+    for key in ("min_price", "max_price", "hoa_fee", "min_year_built", "min_beds", "min_baths"):
+        if prop.get(key) is not None and not _is_number(prop[key]):
+            errors.append(f"criteria.property.{key}: expected a number, got {prop[key]!r}")
+    if (_is_number(prop.get("min_price")) and _is_number(prop.get("max_price"))
+            and prop["min_price"] > prop["max_price"]):
+        errors.append("criteria.property: min_price is greater than max_price")
+
+    loc = criteria.get("location", {})
+    if not isinstance(loc, dict):
+        errors.append("criteria.location: expected a mapping")
+        loc = {}
+    if "location" in modules:
+        has_region = loc.get("region_ids") or loc.get("region_id")
+        if has_region and loc.get("region_type") is None:
+            errors.append("criteria.location.region_type: required with region_id(s)")
+        if not has_region and not (_is_number(loc.get("latitude")) and _is_number(loc.get("longitude"))):
+            errors.append("criteria.location: needs region_ids, region_id, or latitude/longitude")
+
+    schools = criteria.get("schools", {})
+    if not isinstance(schools, dict):
+        errors.append("criteria.schools: expected a mapping of level -> list of names")
+    else:
+        for level, names in schools.items():
+            if level not in SCHOOL_LEVELS:
+                errors.append(f"criteria.schools: unknown level {level!r}")
+            elif not isinstance(names, list) or not all(isinstance(n, str) for n in names):
+                errors.append(f"criteria.schools.{level}: expected a list of names")
+
+    if "geometry" in modules:
+        geometry = criteria.get("geometry")
+        if not isinstance(geometry, dict):
+            errors.append("criteria.geometry: expected a mapping with include/exclude areas")
+        else:
+            for key in ("include", "exclude"):
+                areas = geometry.get(key) or []
+                if not isinstance(areas, list):
+                    errors.append(f"criteria.geometry.{key}: expected a list of areas")
+                    continue
+                for i, area in enumerate(areas):
+                    problem = _check_area(area)
+                    if problem:
+                        errors.append(f"criteria.geometry.{key}[{i}]: {problem}")
+
+    details = criteria.get("details", {})
+    if not isinstance(details, dict):
+        errors.append("criteria.details: expected a mapping")
+    else:
+        for key in ("min_school_rating", "max_school_distance_mi", "max_days_on_market", "max_hoa_dues"):
+            if details.get(key) is not None and not _is_number(details[key]):
+                errors.append(f"criteria.details.{key}: expected a number, got {details[key]!r}")
+        for key in ("exclude_keywords", "require_keywords"):
+            words = details.get(key) or []
+            if not isinstance(words, list) or not all(isinstance(w, str) for w in words):
+                errors.append(f"criteria.details.{key}: expected a list of words")
+
+    enrichment = app.get("enrichment", {})
+    if not isinstance(enrichment, dict):
+        errors.append("app.enrichment: expected a mapping")
+    else:
+        from housewatch.scraper.detail_parser import FIELDS
+        for name in enrichment.get("fields") or []:
+            if name not in FIELDS:
+                errors.append(f"app.enrichment.fields: unknown field {name!r} "
+                              f"(known: {', '.join(sorted(FIELDS))})")
+
+    ranking = app.get("ranking", {})
+    if not isinstance(ranking, dict):
+        errors.append("app.ranking: expected a mapping")
+    else:
+        top_k = ranking.get("top_k", 1)
+        if not isinstance(top_k, int) or isinstance(top_k, bool) or top_k < 1:
+            errors.append(f"app.ranking.top_k: expected a positive integer, got {top_k!r}")
+        for key in ("lot_size_target", "oldest_year"):
+            if key in ranking and not _is_number(ranking[key], positive=True):
+                errors.append(f"app.ranking.{key}: expected a positive number, got {ranking[key]!r}")
+        weights = ranking.get("weights", {})
+        if not isinstance(weights, dict):
+            errors.append("app.ranking.weights: expected a mapping of component -> weight")
+        else:
+            from housewatch.filters.ranking import COMPONENTS
+            for name, weight in weights.items():
+                if name not in COMPONENTS:
+                    errors.append(f"app.ranking.weights: unknown component {name!r} "
+                                  f"(known: {', '.join(COMPONENTS)})")
+                elif not _is_number(weight) or weight < 0:
+                    errors.append(f"app.ranking.weights.{name}: expected a non-negative number, got {weight!r}")
+
+    email = data["email"]
+    if "smtp_port" in email and not isinstance(email["smtp_port"], int):
+        errors.append(f"email.smtp_port: expected an integer, got {email['smtp_port']!r}")
+    recipients = email.get("recipient_emails", [])
+    if not isinstance(recipients, (list, str)):
+        errors.append("email.recipient_emails: expected a list or a single address")
+
+    if errors:
+        raise ConfigError("Invalid configuration:\n  - " + "\n  - ".join(errors))
+
+
+def _check_area(area) -> Optional[str]:
+    """Problem with one geometry area, or None"""
+    if not isinstance(area, dict):
+        return "expected a mapping"
+    if "radius_km" in area:
+        center = area.get("center")
+        if not _is_number(area["radius_km"], positive=True):
+            return f"radius_km: expected a positive number, got {area['radius_km']!r}"
+        if not (isinstance(center, list) and len(center) == 2 and all(_is_number(v) for v in center)):
+            return "center: expected [latitude, longitude]"
+    elif "polygon" in area:
+        points = area["polygon"]
+        if not (isinstance(points, list) and len(points) >= 3 and all(
+                isinstance(p, list) and len(p) == 2 and all(_is_number(v) for v in p) for p in points)):
+            return "polygon: expected a list of 3+ [latitude, longitude] points"
+    elif "geojson" in area:
+        if not isinstance(area["geojson"], str):
+            return "geojson: expected a file path"
+    else:
+        return "needs radius_km/center, polygon or geojson"
+    return None
+
+
+def _is_number(value, positive: bool = False) -> bool:
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return False
+    return value > 0 if positive else True
+
+
+# ----------------------------------------------------------------------
+# Derived structures
+# ----------------------------------------------------------------------
+
+def compile_config(app: dict, criteria: dict) -> CompiledConfig:
+    """Build the criteria plan, school/detail matchers, geometry filter and per-region request params"""
+    from housewatch.filters.school_filter import SchoolMatcher
+    from housewatch.filters.school_index import DEFAULT_THRESHOLD
+    from housewatch.scraper.redfin_scraper import build_params
+
+    prop = criteria.get("property", {})
+    loc = criteria.get("location", {})
+
+    plan = CriteriaPlan(
+        state=loc.get("state", "IL"),
+        property_type=prop.get("type", "Single Family"),
+        min_price=prop.get("min_price", 0),
+        max_price=prop.get("max_price", 1500000),
+        min_year_built=prop.get("min_year_built", 1980),
+        max_hoa=prop.get("hoa_fee", 0.),
+    )
+
+    region_ids = loc.get("region_ids") or ([loc["region_id"]] if loc.get("region_id") else [None])
+    search_params = {
+        region_id: build_params(app, criteria, region_id_override=region_id)
+        for region_id in region_ids
+    }
+
+    geometry, data_files = None, ()
+    if "geometry" in criteria.get("active_modules", []):
+        from housewatch.filters.geo_filter import GeoFilter
+
+        try:
+            geometry = GeoFilter.from_config(criteria["geometry"])
+        except (OSError, ValueError) as e:
+            raise ConfigError(f"criteria.geometry: {e}") from e
+        data_files = tuple(_file_stamp(path) for path in GeoFilter.files(criteria["geometry"]))
+
+    details = None
+    if "details" in criteria.get("active_modules", []):
+        from housewatch.filters.detail_filter import DetailMatcher
+        details = DetailMatcher.from_config(criteria.get("details", {}))
+
+    return CompiledConfig(
+        plan=plan,
+        schools=SchoolMatcher.from_config(
+            criteria.get("schools", {}),
+            threshold=app.get("school_names", {}).get("threshold", DEFAULT_THRESHOLD),
+        ),
+        region_ids=tuple(region_ids),
+        search_params=search_params,
+        geometry=geometry,
+        data_files=data_files,
+        details=details,
+    )
@@ -1,22 +1,25 @@
 # src/housewatch/filters/composite_filter.py
 
-from typing import List
+from typing import Iterable, List, Union
 from ..models.house import House
+from ..models.house_batch import HouseBatch
 from .school_filter import filter_by_schools
 from .property_filter import filter_by_property_criteria
 
 
-def filter_houses(houses: List[House], config: dict) -> List[House]:
+def filter_houses(houses: Union[HouseBatch, Iterable[House]], config: dict) -> Union[HouseBatch, List[House]]:
     """
     Apply all filters and return only matching houses.
     Now uses the list-based schools config.
+    A HouseBatch in gives a HouseBatch out, a list gives a list.
     """
     filtered = []
+    rows = []
 
     criteria = config.get("criteria", {})
     required_schools = criteria.get("schools", [])
 
-    for house in houses:
+    for row, house in enumerate(houses):
         if not filter_by_property_criteria(house, config):
             continue
         
@@ -24,5 +27,8 @@ def filter_houses(houses: List[House], config: dict) -> List[House]:
             continue
         
         filtered.append(house)
+        rows.append(row)
     
+    if isinstance(houses, HouseBatch):
+        return houses.select(rows)
     return filtered
\ No newline at end of file
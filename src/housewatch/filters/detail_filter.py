@@ -0,0 +1,86 @@
+# src/housewatch/filters/detail_filter.py
+
+from typing import Any, Dict, FrozenSet, Optional, Tuple
+
+
+class DetailMatcher:
+    """
+    Criteria on enrichment fields read from the detail page (criteria.details).
+    A house fails only on a value that breaks a limit; a field the page did
+    not show does not count against it.
+    """
+
+    __slots__ = ("min_school_rating", "max_school_distance_mi", "max_days_on_market",
+                 "max_hoa_dues", "exclude_keywords", "require_keywords")
+
+    def __init__(self, min_school_rating: Optional[float] = None,
+                 max_school_distance_mi: Optional[float] = None,
+                 max_days_on_market: Optional[int] = None,
+                 max_hoa_dues: Optional[float] = None,
+                 exclude_keywords: Tuple[str, ...] = (),
+                 require_keywords: Tuple[str, ...] = ()):
+        self.min_school_rating = min_school_rating
+        self.max_school_distance_mi = max_school_distance_mi
+        self.max_days_on_market = max_days_on_market
+        self.max_hoa_dues = max_hoa_dues
+        self.exclude_keywords = tuple(exclude_keywords)
+        self.require_keywords = tuple(require_keywords)
+
+    @classmethod
+    def from_config(cls, cfg: Dict[str, Any]) -> "DetailMatcher":
+        return cls(
+            min_school_rating=cfg.get("min_school_rating"),
+            max_school_distance_mi=cfg.get("max_school_distance_mi"),
+            max_days_on_market=cfg.get("max_days_on_market"),
+            max_hoa_dues=cfg.get("max_hoa_dues"),
+            exclude_keywords=tuple(cfg.get("exclude_keywords") or ()),
+            require_keywords=tuple(cfg.get("require_keywords") or ()),
+        )
+
+    @property
+    def fields(self) -> FrozenSet[str]:
+        """Enrichment fields the parser has to extract for these criteria"""
+        needed = set()
+        if self.min_school_rating is not None:
+            needed.add("school_ratings")
+        if self.max_school_distance_mi is not None:
+            needed.add("school_distances")
+        if self.max_days_on_market is not None:
+            needed.add("days_on_market")
+        if self.max_hoa_dues is not None:
+            needed.add("hoa_dues")
+        if self.exclude_keywords or self.require_keywords:
+            needed.add("remarks_keywords")
+        return frozenset(needed)
+
+    @property
+    def keywords(self) -> Tuple[str, ...]:
+        return self.exclude_keywords + self.require_keywords
+
+    def matches(self, details: Optional[Dict[str, Any]]) -> bool:
+        details = details or {}
+
+        ratings = details.get("school_ratings")
+        if self.min_school_rating is not None and ratings:
+            if min(ratings.values()) < self.min_school_rating:
+                return False
+
+        distances = details.get("school_distances")
+        if self.max_school_distance_mi is not None and distances:
+            if max(distances.values()) > self.max_school_distance_mi:
+                return False
+
+        days = details.get("days_on_market")
+        if self.max_days_on_market is not None and days is not None and days > self.max_days_on_market:
+            return False
+
+        dues = details.get("hoa_dues")
+        if self.max_hoa_dues is not None and dues is not None and dues > self.max_hoa_dues:
+            return False
+
+        found = {keyword.lower() for keyword in details.get("remarks_keywords", ())}
+        if any(keyword.lower() in found for keyword in self.exclude_keywords):
+            return False
+        if "remarks_keywords" in details and not all(k.lower() in found for k in self.require_keywords):
+            return False
+        return True
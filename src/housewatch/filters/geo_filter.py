@@ -0,0 +1,117 @@
+# src/housewatch/filters/geo_filter.py
+
+import logging
+import math
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+from housewatch.geo.spatial import (
+    METERS_PER_DEG_LAT,
+    GridIndex,
+    Polygon,
+    haversine_m,
+    load_geojson,
+)
+from housewatch.utils.load_config import root_dir
+
+logger = logging.getLogger(__name__)
+
+
+class Circle:
+    """Everything within radius_m of a point"""
+
+    __slots__ = ("lat", "lng", "radius_m", "bbox")
+
+    def __init__(self, lat: float, lng: float, radius_m: float):
+        self.lat = lat
+        self.lng = lng
+        self.radius_m = radius_m
+        d_lat = radius_m / METERS_PER_DEG_LAT
+        d_lng = d_lat / max(math.cos(math.radians(lat)), 1e-6)
+        self.bbox = (lng - d_lng, lat - d_lat, lng + d_lng, lat + d_lat)
+
+    def contains(self, lng: float, lat: float) -> bool:
+        min_x, min_y, max_x, max_y = self.bbox
+        if not (min_x <= lng <= max_x and min_y <= lat <= max_y):
+            return False
+        return haversine_m(self.lat, self.lng, lat, lng) <= self.radius_m
+
+
+class _ShapeSet:
+    """Shapes plus a grid index over their boxes"""
+
+    __slots__ = ("shapes", "grid")
+
+    def __init__(self, shapes: list, cell_size: float):
+        self.shapes = shapes
+        self.grid = GridIndex.build(((i, s.bbox) for i, s in enumerate(shapes)), cell_size)
+
+    def __len__(self) -> int:
+        return len(self.shapes)
+
+    def any_contains(self, lng: float, lat: float) -> bool:
+        shapes = self.shapes
+        return any(shapes[i].contains(lng, lat) for i in self.grid.candidates(lng, lat))
+
+
+class GeoFilter:
+    """
+    Geometry constraints from criteria.geometry: a house passes when it is
+    inside at least one `include` area (if any are given) and inside no
+    `exclude` area. Areas are circles, inline polygons or GeoJSON files
+    (e.g. a commute isochrone exported from a routing tool).
+    """
+
+    __slots__ = ("include", "exclude", "keep_unlocated")
+
+    def __init__(self, include: list, exclude: list, keep_unlocated: bool = False,
+                 cell_size: float = 0.01):
+        self.include = _ShapeSet(include, cell_size)
+        self.exclude = _ShapeSet(exclude, cell_size)
+        self.keep_unlocated = keep_unlocated
+
+    @classmethod
+    def from_config(cls, geometry: Dict[str, Any]) -> "GeoFilter":
+        return cls(
+            include=[shape for area in geometry.get("include") or [] for shape in _shapes(area)],
+            exclude=[shape for area in geometry.get("exclude") or [] for shape in _shapes(area)],
+            keep_unlocated=bool(geometry.get("keep_unlocated", False)),
+            cell_size=geometry.get("cell_size", 0.01),
+        )
+
+    @staticmethod
+    def files(geometry: Dict[str, Any]) -> List[Path]:
+        """GeoJSON files the config refers to (their changes invalidate the config cache)"""
+        areas = list(geometry.get("include") or []) + list(geometry.get("exclude") or [])
+        return [_resolve(area["geojson"]) for area in areas if isinstance(area, dict) and "geojson" in area]
+
+    def matches(self, lat: Optional[float], lng: Optional[float]) -> bool:
+        if lat is None or lng is None or math.isnan(lat) or math.isnan(lng):
+            return self.keep_unlocated
+        if len(self.include) and not self.include.any_contains(lng, lat):
+            return False
+        return not self.exclude.any_contains(lng, lat)
+
+    def mask(self, lats: Sequence[float], lngs: Sequence[float]) -> List[bool]:
+        """matches() over coordinate columns (HouseBatch stores missing values as NaN)"""
+        matches = self.matches
+        return [matches(lat, lng) for lat, lng in zip(lats, lngs)]
+
+
+def _resolve(path: str) -> Path:
+    path = Path(path)
+    return path if path.is_absolute() else root_dir / path
+
+
+def _shapes(area: Dict[str, Any]) -> list:
+    """One config area -> shapes. Inline coordinates are [lat, lng] pairs."""
+    if "radius_km" in area:
+        lat, lng = area["center"]
+        return [Circle(lat, lng, area["radius_km"] * 1000)]
+    if "polygon" in area:
+        return [Polygon([[(lng, lat) for lat, lng in area["polygon"]]])]
+    if "geojson" in area:
+        polygons = load_geojson(_resolve(area["geojson"]))
+        logger.info(f"Loaded {len(polygons)} polygons from {area['geojson']}")
+        return polygons
+    raise ValueError(f"geometry area needs radius_km/center, polygon or geojson: {area!r}")
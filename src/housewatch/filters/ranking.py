@@ -0,0 +1,191 @@
+# src/housewatch/filters/ranking.py
+
+import heapq
+import logging
+import math
+import statistics
+from dataclasses import dataclass, field, fields
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from housewatch.models.house import House
+from housewatch.models.house_batch import NULL_INT, HouseBatch
+
+logger = logging.getLogger(__name__)
+
+# Score components; each is in [0, 1], 0.5 when the house lacks the value
+COMPONENTS = ("value", "schools", "lot_size", "year_built", "hoa")
+
+
+@dataclass
+class RankingSettings:
+    """Tuning knobs, loaded from app.ranking"""
+    enabled: bool = True
+    top_k: int = 20                     # houses shown in full in the email
+    weights: Dict[str, float] = field(default_factory=lambda: {
+        "value": 0.35,        # price per sqft below the zip code's median
+        "schools": 0.25,      # school ratings, or how closely names match the criteria
+        "lot_size": 0.15,
+        "year_built": 0.15,
+        "hoa": 0.10,          # lower dues, relative to the criteria's maximum
+    })
+    lot_size_target: float = 10000.0    # sqft; lots this big or bigger score 1
+    oldest_year: int = 1950             # built this year or earlier scores 0
+
+    @classmethod
+    def from_config(cls, cfg: Optional[dict]) -> "RankingSettings":
+        cfg = cfg or {}
+        known = {f.name for f in fields(cls)}
+        settings = cls(**{k: v for k, v in cfg.items() if k in known and k != "weights"})
+        if cfg.get("weights"):
+            # Components left out keep their default weight; 0 turns one off
+            settings.weights = {**settings.weights, **cfg["weights"]}
+        return settings
+
+
+@dataclass
+class Remainder:
+    """Matches ranked below the top K, summarized for the digest"""
+    count: int = 0
+    min_price: Optional[int] = None
+    max_price: Optional[int] = None
+    best_score: Optional[float] = None
+
+    def add(self, score: float, price: int) -> None:
+        self.count += 1
+        if price:
+            self.min_price = price if self.min_price is None else min(self.min_price, price)
+            self.max_price = price if self.max_price is None else max(self.max_price, price)
+        self.best_score = score if self.best_score is None else max(self.best_score, score)
+
+
+class TopK:
+    """
+    Bounded min-heap of the k best (score, item) pairs seen so far: each
+    push is O(log k), and whatever falls out goes to a Remainder, so memory
+    stays at k items however many are pushed.
+    """
+
+    def __init__(self, k: int):
+        self.k = k
+        self.remainder = Remainder()
+        self._heap: List[Tuple[float, int, object, int]] = []
+        self._pushed = 0
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def push(self, score: float, item, price: int = 0) -> None:
+        # The push counter breaks ties in arrival order and keeps items
+        # from ever being compared
+        entry = (score, -self._pushed, item, price)
+        self._pushed += 1
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, entry)
+            return
+        if self.k and entry > self._heap[0]:
+            entry = heapq.heapreplace(self._heap, entry)
+        self.remainder.add(entry[0], entry[3])
+
+    def ranked(self) -> List[Tuple[float, object]]:
+        """Kept items, best first"""
+        return [(score, item) for score, _, item, _ in sorted(self._heap, reverse=True)]
+
+
+class Ranker:
+    """
+    Scores matches and keeps the best top_k for the digest. The value
+    component compares each house's price per sqft to the median of its
+    zip code among the search results of the run (see observe_market()).
+    """
+
+    def __init__(self, settings: Optional[RankingSettings] = None, schools=None,
+                 max_hoa: Optional[float] = None, now: Optional[datetime] = None):
+        self.settings = settings or RankingSettings()
+        self.schools = schools            # filters.school_filter.SchoolMatcher
+        self.max_hoa = max_hoa            # criteria maximum; None: scored against 1000/month
+        self.newest_year = (now or datetime.now()).year
+        self.medians: Dict[str, float] = {}
+        self.overall_median: Optional[float] = None
+
+        weights = {name: float(self.settings.weights.get(name, 0)) for name in COMPONENTS}
+        total = sum(weights.values())
+        self._weights = {name: w / total for name, w in weights.items() if w > 0} if total > 0 else {}
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def observe_market(self, batch: HouseBatch) -> None:
+        """Median price per sqft per zip code over the search results"""
+        by_zip: Dict[str, List[float]] = {}
+        prices, sqfts = batch.column("price"), batch.column("sqft")
+        for zip_code, price, sqft in zip(batch.column("zip_code"), prices, sqfts):
+            if price > 0 and sqft > 0:
+                by_zip.setdefault(zip_code, []).append(price / sqft)
+
+        for zip_code, values in by_zip.items():
+            self.medians[zip_code] = statistics.median(values)
+        everything = [v for values in by_zip.values() for v in values]
+        if everything:
+            self.overall_median = statistics.median(everything)
+
+    def scores(self, batch: HouseBatch) -> Iterator[float]:
+        """Score of every row, yielded in one pass over the batch's columns"""
+        w = self._weights
+
+        s = self.settings
+        year_span = max(self.newest_year - s.oldest_year, 1)
+        max_hoa = self.max_hoa if self.max_hoa else 1000.0
+        schools_col, details_col = batch.sparse["schools"], batch.sparse["details"]
+        columns = zip(batch.column("zip_code"), batch.column("price"), batch.column("sqft"),
+                      batch.column("lot_size"), batch.column("year_built"), batch.column("hoa_fee"))
+
+        for row, (zip_code, price, sqft, lot, year, hoa) in enumerate(columns):
+            total = 0.0
+            if "value" in w:
+                median = self.medians.get(zip_code, self.overall_median)
+                if median and price > 0 and sqft > 0:
+                    value = 1.0 - (price / sqft) / (2 * median)
+                else:
+                    value = 0.5
+                total += w["value"] * _clamp(value)
+            if "schools" in w:
+                total += w["schools"] * self._school_strength(schools_col.get(row), details_col.get(row))
+            if "lot_size" in w:
+                total += w["lot_size"] * (0.5 if math.isnan(lot) else _clamp(lot / s.lot_size_target))
+            if "year_built" in w:
+                total += w["year_built"] * (
+                    0.5 if year == NULL_INT else _clamp((year - s.oldest_year) / year_span))
+            if "hoa" in w:
+                total += w["hoa"] * (0.5 if math.isnan(hoa) else _clamp(1.0 - hoa / max_hoa))
+            yield total
+
+    def rank(self, batch: HouseBatch) -> Tuple[List[Tuple[float, House]], Remainder]:
+        """(score, house) for the best top_k, best first, and a summary of the rest"""
+        top = TopK(self.settings.top_k)
+        prices = batch.column("price")
+        for row, score in enumerate(self.scores(batch)):
+            top.push(score, row, prices[row])
+        ranked = [(score, batch[row]) for score, row in top.ranked()]
+        if top.remainder.count:
+            logger.info(f"Ranked {len(batch)} matches: top {len(ranked)} kept, "
+                        f"{top.remainder.count} summarized")
+        return ranked, top.remainder
+
+    # ------------------------------------------------------------------
+    # Internal helpers
+    # ------------------------------------------------------------------
+
+    def _school_strength(self, schools: Optional[dict], details: Optional[dict]) -> float:
+        """Mean rating out of 10 when the page had ratings, else name similarity to the criteria"""
+        ratings = (details or {}).get("school_ratings")
+        if ratings:
+            return _clamp(sum(ratings.values()) / len(ratings) / 10)
+        if not schools or self.schools is None:
+            return 0.5
+        return self.schools.similarity(schools)
+
+
+def _clamp(value: float) -> float:
+    return 0.0 if value < 0 else 1.0 if value > 1 else value
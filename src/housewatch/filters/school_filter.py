@@ -1,151 +1,105 @@
 # src/housewatch/filters/school_filter.py
 
-from typing import List, Dict, Any
+from functools import lru_cache
+from typing import List, Dict, Any, Optional, Tuple
 from ..models.house import House
-import re
+from .school_index import DEFAULT_THRESHOLD, SchoolNameIndex
+
+# Similarity the legacy strict/exact modes require (1.0: same canonical name)
+STRICT_THRESHOLD = 0.95
+EXACT_THRESHOLD = 1.0
+
+
+class SchoolMatcher:
+    """
+    Matcher used by the scraper's detail stage and the legacy filters: a
+    house matches when, for every level with criteria, one of its schools
+    is found in that level's SchoolNameIndex. Levels without criteria
+    accept any school.
+    """
+
+    LEVELS = ("elementary", "middle", "high")
+
+    def __init__(self, levels: Dict[str, SchoolNameIndex]):
+        self.levels = levels
+
+    @classmethod
+    def from_config(cls, school_config: Dict[str, Any],
+                    threshold: float = DEFAULT_THRESHOLD) -> "SchoolMatcher":
+        return cls({level: SchoolNameIndex(school_config.get(level) or [], threshold)
+                    for level in cls.LEVELS})
+
+    def matches(self, schools: Dict[str, List[str]]) -> bool:
+        for level in self.levels:
+            if self.best(level, schools.get(level, ())) is None:
+                return False
+        return True
+
+    def best(self, level: str, names) -> Optional[Tuple[str, float]]:
+        """(criteria name, similarity) of the best match among names; ("", 1.0) if the level has no criteria"""
+        index = self.levels.get(level)
+        if not index:
+            return "", 1.0
+        found = [hit for hit in map(index.lookup, names) if hit is not None]
+        return max(found, key=lambda hit: hit[1]) if found else None
+
+    def similarity(self, schools: Dict[str, List[str]]) -> float:
+        """Mean over levels with criteria of the best match similarity (0 for a miss)"""
+        scores = []
+        for level, index in self.levels.items():
+            if index:
+                hit = self.best(level, schools.get(level, ()))
+                scores.append(hit[1] if hit else 0.0)
+        return sum(scores) / len(scores) if scores else 1.0
+
+
+@lru_cache(maxsize=16)
+def _matcher(levels: Tuple[Tuple[str, Tuple[str, ...]], ...], threshold: float) -> SchoolMatcher:
+    return SchoolMatcher.from_config({level: list(names) for level, names in levels}, threshold)
+
+
+def _matcher_for(school_config: Dict[str, Any], threshold: float) -> SchoolMatcher:
+    """Matcher for a criteria.schools mapping, built once per distinct config"""
+    levels = tuple((level, tuple(school_config.get(level) or ())) for level in SchoolMatcher.LEVELS)
+    return _matcher(levels, threshold)
 
 
 def filter_by_schools(house: House, school_config: Dict[str, Any]) -> bool:
     """
     Check if house is in the required school district
-    Returns True if ALL required schools are in house.schools
+    Returns True if, for every level with required schools, one of the
+    house's schools at that level is a close match to one of them
     """
-
     if not house.schools:
         return False
-    
-    house_school_lower = {
-        level: [s.lower().strip() for s in schools]
-        for level, schools in house.schools.items()
-    }
-    
-    # Track matches for each tier
-    elementary_matched = False
-    middle_matched = False
-    high_matched = False
-
-    # Extract school lists from config
-    elementary_schools = school_config.get("elementary", [])
-    middle_schools = school_config.get("middle", [])
-    hihg_schools = school_config.get("high", [])
-
-    # Check elemenatry schools
-    if not elementary_schools:
-        elementary_matched = True
-    else:
-        elementary_matched = any(
-            re.search(_create_flexible_pattern(elem), school, re.IGNORECASE)
-            for elem in elementary_schools
-            for school in house_school_lower["elementary"]
-        )
-    
-    # Check middle schools
-    if not middle_schools:
-        middle_matched = True
-    else:
-        middle_matched = any(
-            re.search(_create_flexible_pattern(mid), school, re.IGNORECASE)
-            for mid in middle_schools
-            for school in house_school_lower["middle"]
-        )
-    
-    # Check high schools
-    if not hihg_schools:
-        high_matched = True
-    else:
-        high_matched = any(
-            re.search(_create_flexible_pattern(high), school, re.IGNORECASE)
-            for high in hihg_schools
-            for school in house_school_lower["high"]
-        )
-    
-    return elementary_matched and middle_matched and high_matched
-
-
-def _create_flexible_pattern(school_name: str) -> str:
-    """
-    Create a flexible regex pattern from school name.
-    Handles abbreviations, word order variations, etc.
-    """
-    name = school_name.lower()
-
-    words = re.findall(r'\b\w+\b', name)
-
-    pattern_parts = []
-    for word in words:
-        if word not in ["school", "high", "elementary", "middle", "junior", "senior"]:
-            pattern_parts.append(f"(?=.*\\b{word}\\b)")
-    
-    if pattern_parts:
-        # Join with lookaheads to allow any order
-        pattern = f"{''.join(pattern_parts)}.*"
-    else:
-        pattern = re.escape(name)
-    
-    return pattern
-        
-            
+    return _matcher_for(school_config, DEFAULT_THRESHOLD).matches(house.schools)
+
+
 def filter_by_schools_strict(house: House, school_config: Dict[str, Any]) -> bool:
     """
-    Strict matching: requires exact school names (case-insensitive)
-    Check if house schools contain the full required school name
+    Strict matching: like filter_by_schools, but only near-identical names
+    (after normalization) count
     """
     if not house.schools:
         return False
-    
-    house_schools_lower = [s.lower().strip() for s in house.schools]
-
-    elementary_ok = False
-    middle_ok = False
-    high_ok = False
-
-    # Check elementary
-    required_elementary_schools = [s.lower() for s in school_config.get("elementary", [])]
-    elementary_ok = any(
-        any(required_elementary in school for school in house_schools_lower)
-        for required_elementary in required_elementary_schools
-    )
-
-    # Check middle (only one required)
-    required_middle_schools = [s.lower() for s in school_config.get("middle", [])]
-    middle_ok = any(
-        any(required_middle in school for school in house_schools_lower)
-        for required_middle in required_middle_schools
-    )
-
-    # Check high (multiple options, need at least one)
-    required_high_schools = [s.lower() for s in school_config.get("high", [])]
-    high_ok = any(
-        any(required_high in school for school in house_schools_lower)
-        for required_high in required_high_schools 
-    )
-
-    return elementary_ok and middle_ok and high_ok
+    return _matcher_for(school_config, STRICT_THRESHOLD).matches(house.schools)
 
 
 def filter_by_schools_exact(house: House, school_config: Dict[str, Any]) -> bool:
     """
-    Exact matching: house schools must exactly match config schools.
+    Exact matching: house schools must match config schools by name, up to
+    case, punctuation and abbreviations ("Jr. High" == "Junior High School").
     """
     if not house.schools:
         return False
-    
-    house_school_lower = [s.lower().strip() for s in house.schools]
-
-    all_required = []
-    for tier in ["elementary", "middle", "high"]:
-        all_required.append([s.lwoer().strip() for s in school_config.get(tier, [])])
-    
-    for required in all_required:
-        if required not in house_school_lower:
-            return False
-    
-    return True
+    return _matcher_for(school_config, EXACT_THRESHOLD).matches(house.schools)
 
 
 def get_school_tiers(house: House, school_config: Dict[str, Any]) -> Dict[str, List[str]]:
     """
-    Identify which schools belong to which tier.
+    Identify which schools belong to which tier: each of the house's
+    schools goes to the first level whose criteria contain a close match,
+    or to "other".
     """
     result = {
         "elementary": [],
@@ -156,39 +110,16 @@ def get_school_tiers(house: House, school_config: Dict[str, Any]) -> Dict[str, L
 
     if not house.schools:
         return result
-    
-    for school in house.schools:
-        school_lower = school.lower()
-        matched = False
-
-        # Check elementary
-        for elem_pattern in school_config.get("elementary", []):
-            if _create_flexible_pattern(elem_pattern) in school_lower:
-                result["elementary"].append(school)
-                matched = True
-                break
-        
-        if matched:
-            continue
-
-        # Check middle
-        for middle_pattern in school_config.get("middle", []):
-            if _create_flexible_pattern(middle_pattern) in school_lower:
-                result["middle"].append(school)
-                matched = True
-                break
-        
-        if matched:
-            continue
-        
-        # Check high
-        for high_pattern in school_config.get("high", []):
-            if _create_flexible_pattern(high_pattern) in school_lower:
-                result["high"].append(school)
-                matched = True
-                break
-        
-        if not matched:
-            result["other"].append(school)
-        
-    return result
\ No newline at end of file
+
+    matcher = _matcher_for(school_config, DEFAULT_THRESHOLD)
+    for names in house.schools.values():
+        for school in names:
+            for level in SchoolMatcher.LEVELS:
+                index = matcher.levels[level]
+                if index and index.lookup(school) is not None:
+                    result[level].append(school)
+                    break
+            else:
+                result["other"].append(school)
+
+    return result
@@ -0,0 +1,122 @@
+# src/housewatch/filters/school_index.py
+
+import re
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+# Similarity a name needs to count as one of the indexed schools
+DEFAULT_THRESHOLD = 0.85
+
+# Abbreviations spelled out before comparing ("Jr. High" -> "junior high")
+ABBREVIATIONS = {
+    "jr": "junior", "sr": "senior", "hs": "high", "ms": "middle", "es": "elementary",
+    "elem": "elementary", "el": "elementary", "int": "intermediate", "intermed": "intermediate",
+    "acad": "academy", "prep": "preparatory", "comm": "community", "ctr": "center",
+    "cntr": "center", "st": "saint", "ste": "sainte", "mt": "mount", "ft": "fort",
+    "jhs": "junior high", "shs": "senior high", "sch": "school", "schl": "school",
+}
+
+# Words that do not tell two schools apart
+STOPWORDS = frozenset({"the", "of", "and", "school", "public", "campus"})
+
+# Grade levels and kinds of school: kept for exact hits, but left out of the
+# fuzzy score, where words shared by most names would pull different
+# schools ("Highland" and "Highlands Elementary") over the threshold
+LEVEL_WORDS = frozenset({
+    "elementary", "primary", "intermediate", "middle", "junior", "senior", "high",
+    "academy", "preparatory", "charter", "magnet", "community", "center",
+})
+
+WORD = re.compile(r"[a-z0-9]+")
+
+
+def normalize(name: str) -> str:
+    """Canonical form of a school name: lower case, abbreviations expanded, stopwords dropped"""
+    name = name.lower().replace("'", "").replace("&", " and ")
+    words = []
+    for word in WORD.findall(name):
+        for part in ABBREVIATIONS.get(word, word).split():
+            if part not in STOPWORDS:
+                words.append(part)
+    return " ".join(words)
+
+
+class SchoolNameIndex:
+    """
+    Fuzzy lookup of school names in a fixed list. Names are compared in
+    canonical form (see normalize()): an equal set of words is a hit with
+    similarity 1.0; otherwise candidates sharing character trigrams are
+    found through an inverted index and scored by Dice similarity, so a
+    lookup touches only the names that share trigrams with the query, not
+    the whole list. Only the distinguishing words are scored (see
+    LEVEL_WORDS). Results are memoized per name.
+    """
+
+    def __init__(self, names: Iterable[str], threshold: float = DEFAULT_THRESHOLD):
+        self.names: Tuple[str, ...] = tuple(dict.fromkeys(names))
+        self.threshold = threshold
+        self._exact: Dict[FrozenSet[str], int] = {}
+        self._sizes: List[int] = []               # distinct trigrams per name
+        self._postings: Dict[str, List[int]] = {}
+        self._memo: Dict[str, Optional[Tuple[str, float]]] = {}
+
+        for i, name in enumerate(self.names):
+            canonical = normalize(name)
+            self._exact.setdefault(frozenset(canonical.split()), i)
+            grams = _trigrams(_distinct(canonical))
+            self._sizes.append(len(grams))
+            for gram in grams:
+                self._postings.setdefault(gram, []).append(i)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __getstate__(self) -> dict:
+        # Compiled configs are pickled; lookups from earlier runs are not
+        state = self.__dict__.copy()
+        state["_memo"] = {}
+        return state
+
+    def lookup(self, name: str) -> Optional[Tuple[str, float]]:
+        """(indexed name, similarity) of the closest name at or above the threshold"""
+        try:
+            return self._memo[name]
+        except KeyError:
+            pass
+
+        canonical = normalize(name)
+        hit = self._exact.get(frozenset(canonical.split()))
+        if hit is not None:
+            result = (self.names[hit], 1.0)
+        else:
+            result = self._closest(canonical)
+        self._memo[name] = result
+        return result
+
+    def _closest(self, canonical: str) -> Optional[Tuple[str, float]]:
+        grams = _trigrams(_distinct(canonical))
+        if not grams:
+            return None
+        shared: Dict[int, int] = {}
+        for gram in grams:
+            for i in self._postings.get(gram, ()):
+                shared[i] = shared.get(i, 0) + 1
+
+        best, best_score = None, 0.0
+        for i, count in shared.items():
+            score = 2 * count / (len(grams) + self._sizes[i])
+            if score > best_score:
+                best, best_score = i, score
+        if best is None or best_score < self.threshold:
+            return None
+        return self.names[best], best_score
+
+
+def _distinct(canonical: str) -> str:
+    """The words of a canonical name that are not LEVEL_WORDS (all of them if none are left)"""
+    words = [word for word in canonical.split() if word not in LEVEL_WORDS]
+    return " ".join(words) if words else canonical
+
+
+def _trigrams(canonical: str) -> FrozenSet[str]:
+    padded = f"  {canonical} "
+    return frozenset(padded[i:i + 3] for i in range(len(padded) - 2))
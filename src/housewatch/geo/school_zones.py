@@ -0,0 +1,113 @@
+# src/housewatch/geo/school_zones.py
+
+import logging
+import math
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from housewatch.config import SCHOOL_LEVELS
+from housewatch.geo.spatial import METERS_PER_DEG_LAT, GridIndex, Polygon, load_geojson
+from housewatch.utils.load_config import root_dir
+
+logger = logging.getLogger(__name__)
+
+# Level names seen in district boundary files
+LEVEL_ALIASES = {
+    "elementary": "elementary", "es": "elementary", "elem": "elementary", "primary": "elementary",
+    "middle": "middle", "ms": "middle", "junior high": "middle", "jh": "middle",
+    "high": "high", "hs": "high", "secondary": "high",
+}
+
+
+class SchoolZoneIndex:
+    """
+    Attendance boundaries loaded from GeoJSON, indexed on a uniform grid.
+    lookup() resolves a house's schools from its coordinates, or returns None
+    when the answer is not certain (outside coverage, overlapping zones, or
+    closer than `tolerance_m` to a boundary) so the caller fetches the page.
+    """
+
+    def __init__(self, zones: List[Polygon], tolerance_m: float = 25.0, cell_size: float = 0.01):
+        self.zones = zones
+        self.tolerance_m = tolerance_m
+        # Boxes padded by the tolerance, so zones just across a cell edge are still tested
+        self.grid = GridIndex.build(((i, self._padded(zone.bbox)) for i, zone in enumerate(zones)),
+                                    cell_size)
+        self.levels = {zone.props["level"] for zone in zones}
+
+    @classmethod
+    def from_config(cls, cfg: Optional[dict]) -> Optional["SchoolZoneIndex"]:
+        """Build from app.school_zones; None if not configured or unreadable"""
+        if not cfg or not cfg.get("path"):
+            return None
+
+        path = Path(cfg["path"])
+        if not path.is_absolute():
+            path = root_dir / path
+        try:
+            polygons = load_geojson(path)
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"School zones disabled, cannot load {path}: {e}")
+            return None
+
+        level_key = cfg.get("level_property", "level")
+        name_key = cfg.get("name_property", "name")
+        zones = []
+        for polygon in polygons:
+            level = LEVEL_ALIASES.get(str(polygon.props.get(level_key, "")).strip().lower())
+            name = polygon.props.get(name_key)
+            if level is None or not name:
+                continue
+            polygon.props = {"level": level, "name": str(name)}
+            zones.append(polygon)
+
+        skipped = len(polygons) - len(zones)
+        if skipped:
+            logger.warning(f"{path}: skipped {skipped} features without a known level or a name")
+        logger.info(f"Loaded {len(zones)} school zones from {path}")
+
+        return cls(zones, tolerance_m=cfg.get("boundary_tolerance_m", 25.0),
+                   cell_size=cfg.get("cell_size", 0.01))
+
+    def _padded(self, bbox):
+        min_x, min_y, max_x, max_y = bbox
+        margin_lat = self.tolerance_m / METERS_PER_DEG_LAT
+        margin_lng = margin_lat / max(math.cos(math.radians(max(abs(min_y), abs(max_y)))), 1e-6)
+        return (min_x - margin_lng, min_y - margin_lat, max_x + margin_lng, max_y + margin_lat)
+
+    def __len__(self) -> int:
+        return len(self.zones)
+
+    def lookup(self, lat: Optional[float], lng: Optional[float],
+               levels: Iterable[str] = SCHOOL_LEVELS) -> Optional[Dict[str, List[str]]]:
+        """Schools for the given levels, or None if any of them is uncertain (or no level is asked for)"""
+        if lat is None or lng is None:
+            return None
+        levels = tuple(levels)
+        if not levels or not self.levels.issuperset(levels):
+            return None
+
+        # Tolerance as degrees, to skip the edge check for zones clearly away
+        margin_lat = self.tolerance_m / METERS_PER_DEG_LAT
+        margin_lng = margin_lat / max(math.cos(math.radians(lat)), 1e-6)
+
+        found = {level: set() for level in levels}
+        for i in self.grid.candidates(lng, lat):
+            zone = self.zones[i]
+            level = zone.props["level"]
+            if level not in found:
+                continue
+            min_x, min_y, max_x, max_y = zone.bbox
+            if (self.tolerance_m
+                    and min_x - margin_lng <= lng <= max_x + margin_lng
+                    and min_y - margin_lat <= lat <= max_y + margin_lat
+                    and zone.edge_distance_m(lng, lat) < self.tolerance_m):
+                return None
+            if zone.contains(lng, lat):
+                found[level].add(zone.props["name"])
+
+        if any(len(names) != 1 for names in found.values()):
+            return None
+
+        # Levels not asked for stay out: an empty list would read as "no school"
+        return {level: list(names) for level, names in found.items()}
@@ -0,0 +1,130 @@
+# src/housewatch/geo/spatial.py
+
+import json
+import math
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+# Coordinates follow GeoJSON: (lng, lat) pairs in degrees
+
+EARTH_RADIUS_M = 6371008.8
+METERS_PER_DEG_LAT = math.pi * EARTH_RADIUS_M / 180
+
+BBox = Tuple[float, float, float, float]    # min_lng, min_lat, max_lng, max_lat
+
+
+class Polygon:
+    """
+    Polygon with optional holes. Containment uses the even-odd rule over all
+    rings, so holes need no special casing.
+    """
+
+    __slots__ = ("rings", "bbox", "props")
+
+    def __init__(self, rings: Sequence[Sequence[Sequence[float]]], props: Optional[dict] = None):
+        self.rings = [tuple((float(p[0]), float(p[1])) for p in ring) for ring in rings if len(ring) >= 3]
+        if not self.rings:
+            raise ValueError("polygon needs at least one ring of 3+ points")
+        xs = [x for x, _ in self.rings[0]]
+        ys = [y for _, y in self.rings[0]]
+        self.bbox: BBox = (min(xs), min(ys), max(xs), max(ys))
+        self.props = props or {}
+
+    def contains(self, lng: float, lat: float) -> bool:
+        min_x, min_y, max_x, max_y = self.bbox
+        if not (min_x <= lng <= max_x and min_y <= lat <= max_y):
+            return False
+
+        inside = False
+        for ring in self.rings:
+            x1, y1 = ring[-1]
+            for x2, y2 in ring:
+                if (y1 > lat) != (y2 > lat):
+                    if lng < x1 + (lat - y1) * (x2 - x1) / (y2 - y1):
+                        inside = not inside
+                x1, y1 = x2, y2
+        return inside
+
+    def edge_distance_m(self, lng: float, lat: float) -> float:
+        """Distance to the nearest edge, on a local flat projection"""
+        kx = METERS_PER_DEG_LAT * math.cos(math.radians(lat))
+        ky = METERS_PER_DEG_LAT
+        best = math.inf
+        for ring in self.rings:
+            ax, ay = (ring[-1][0] - lng) * kx, (ring[-1][1] - lat) * ky
+            for x, y in ring:
+                bx, by = (x - lng) * kx, (y - lat) * ky
+                best = min(best, _segment_distance(ax, ay, bx, by))
+                ax, ay = bx, by
+        return best
+
+
+def _segment_distance(ax: float, ay: float, bx: float, by: float) -> float:
+    """Distance from the origin to segment a-b"""
+    dx, dy = bx - ax, by - ay
+    length2 = dx * dx + dy * dy
+    t = 0.0 if length2 == 0 else max(0.0, min(1.0, -(ax * dx + ay * dy) / length2))
+    return math.hypot(ax + t * dx, ay + t * dy)
+
+
+def haversine_m(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    p1, p2 = math.radians(lat1), math.radians(lat2)
+    dp, dl = p2 - p1, math.radians(lng2 - lng1)
+    a = math.sin(dp / 2) ** 2 + math.cos(p1) * math.cos(p2) * math.sin(dl / 2) ** 2
+    return 2 * EARTH_RADIUS_M * math.asin(math.sqrt(a))
+
+
+class GridIndex:
+    """
+    Uniform grid over item bounding boxes: every item is listed in each cell
+    its box touches, so a point query only tests the items of one cell.
+    """
+
+    __slots__ = ("cell_size", "cells")
+
+    def __init__(self, cell_size: float = 0.01):
+        self.cell_size = cell_size
+        self.cells: Dict[Tuple[int, int], List[int]] = {}
+
+    @classmethod
+    def build(cls, boxes: Iterable[Tuple[int, BBox]], cell_size: float = 0.01) -> "GridIndex":
+        index = cls(cell_size)
+        for item_id, bbox in boxes:
+            index.insert(item_id, bbox)
+        return index
+
+    def insert(self, item_id: int, bbox: BBox) -> None:
+        min_x, min_y, max_x, max_y = bbox
+        for cx in range(self._cell(min_x), self._cell(max_x) + 1):
+            for cy in range(self._cell(min_y), self._cell(max_y) + 1):
+                self.cells.setdefault((cx, cy), []).append(item_id)
+
+    def candidates(self, lng: float, lat: float) -> List[int]:
+        return self.cells.get((self._cell(lng), self._cell(lat)), [])
+
+    def _cell(self, value: float) -> int:
+        return math.floor(value / self.cell_size)
+
+
+def iter_polygons(geojson: dict) -> Iterator[Polygon]:
+    """Polygons of a FeatureCollection, Feature or geometry; multipolygon parts share props"""
+    kind = geojson.get("type")
+    if kind == "FeatureCollection":
+        for feature in geojson.get("features", []):
+            yield from iter_polygons(feature)
+    elif kind == "Feature":
+        geometry = geojson.get("geometry") or {}
+        props = geojson.get("properties") or {}
+        for polygon in iter_polygons(geometry):
+            polygon.props = props
+            yield polygon
+    elif kind == "Polygon":
+        yield Polygon(geojson["coordinates"])
+    elif kind == "MultiPolygon":
+        for rings in geojson["coordinates"]:
+            yield Polygon(rings)
+
+
+def load_geojson(path: Path) -> List[Polygon]:
+    with open(path, "r", encoding="utf-8") as f:
+        return list(iter_polygons(json.load(f)))
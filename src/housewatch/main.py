@@ -2,6 +2,8 @@
 
 import os
 import sys
+import argparse
+import tempfile
 from pathlib import Path
 import logging
 from datetime import datetime
@@ -18,10 +20,11 @@ if str(src_dir) not in sys.path:
 root_dir = src_dir.parent
 
 from housewatch.config import ProjectConfig
-from housewatch.scraper.redfin_scraper import RedfinScraper
-from housewatch.filters.composite_filter import filter_houses
 from housewatch.storage.json_storage import HouseStorage
-from housewatch.notifier.email_notifier import EmailNotifier
+from housewatch.utils.profiling import NullProfiler, StageProfiler
+from housewatch.utils.tracing import NullTracer, Tracer
+# Scraper (requests) and notifier (smtplib) are imported where they are first
+# needed to keep cron start-up cheap
 
 # Setup logging
 logging.basicConfig(
@@ -31,54 +34,414 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-def main():
-    """Main pipeline: scrape -> filter -> storage -> notify"""
-    logger.info("Starting HouseWatch Service...")
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="housewatch",
+        description="Scrape listings, filter them and notify on new matches"
+    )
+    parser.add_argument(
+        "--profile", action="store_true",
+        help="record per-stage CPU profiles and a memory snapshot into data/profiles/<timestamp>/"
+    )
+    parser.add_argument(
+        "--trace", action="store_true",
+        help="record run/stage/HTTP spans into data/traces/<timestamp>.jsonl"
+    )
+    cassette = parser.add_mutually_exclusive_group()
+    cassette.add_argument(
+        "--record", action="store_true",
+        help="save every HTTP response into data/cassettes/<timestamp>.zip"
+    )
+    cassette.add_argument(
+        "--replay", metavar="CASSETTE",
+        help="run offline from a recorded cassette, with fresh state and no email"
+    )
+
+    subparsers = parser.add_subparsers(dest="command")
+    report = subparsers.add_parser("trace-report", help="render a waterfall and per-host latency table")
+    report.add_argument("path", nargs="?", help="trace file (default: latest in data/traces/)")
+    report.add_argument("--limit", type=int, default=200, help="maximum spans in the waterfall")
+
+    reevaluate = subparsers.add_parser(
+        "reevaluate", help="run the current criteria over every stored listing, report new matches")
+    reevaluate.add_argument("--notify", action="store_true",
+                            help="email the new matches and record them like a normal run")
+    reevaluate.add_argument("--offline", action="store_true",
+                            help="skip candidates whose schools were never fetched")
+
+    drops = subparsers.add_parser(
+        "price-drops", help="list tracked listings whose price fell, from the price history")
+    drops.add_argument("--pct", type=float, default=5.0, help="minimum drop in percent (default: 5)")
+    drops.add_argument("--days", type=float, default=30.0, help="window in days (default: 30)")
+    drops.add_argument("--limit", type=int, default=50, help="maximum listings shown")
+    drops.add_argument("--property", type=int, help="print the price history of one property id instead")
+
+    serve = subparsers.add_parser(
+        "serve", help="serve read-only JSON queries over matches and stored listings")
+    serve.add_argument("--host", help="bind address (default: app.query.host)")
+    serve.add_argument("--port", type=int, help="port (default: app.query.port)")
+
+    subparsers.add_parser("coordinator",
+                          help="run the pipeline with detail fetches handed to workers via the job queue")
+    worker = subparsers.add_parser("worker", help="fetch detail pages from the job queue")
+    worker.add_argument("--id", help="worker name, unique per host process (default: host name)")
+    worker.add_argument("--once", action="store_true", help="exit once the queue stays empty")
+
+    return parser.parse_args(argv)
+
+
+def trace_report(args: argparse.Namespace) -> None:
+    """Print the waterfall and per-host percentile table for one trace"""
+    from housewatch.utils.trace_report import latest_trace, render_report
+
+    path = Path(args.path) if args.path else latest_trace(root_dir / "data" / "traces")
+    if path is None or not path.exists():
+        print("No trace found. Run with --trace first.")
+        return
+    print(render_report(path, limit=args.limit))
+
+
+def reevaluate(args: argparse.Namespace) -> None:
+    """
+    Apply the current criteria to the listing store. Only candidates whose
+    detail page was never read go to the network (none with --offline).
+    """
+    from housewatch.models.house_batch import HouseBatch
+    from housewatch.scraper.redfin_scraper import RedfinScraper
+    from housewatch.storage.listing_store import MAX_AGE_DAYS, ListingStore
+
+    config = ProjectConfig()
+    max_age_days = config.app.get("listing_store", {}).get("max_age_days", MAX_AGE_DAYS)
+    storage = HouseStorage(str(root_dir / "data" / "seen_houses.json"),
+                           str(root_dir / "data" / "matched_houses.json"))
+
+    with ListingStore(root_dir / "data" / "listings.sqlite") as store:
+        # Only listings still on the market, and schools known for every level the criteria name
+        candidates = store.candidates(config.compiled.plan, max_age_days=max_age_days,
+                                      levels=config.compiled.schools.levels)
+        geometry = config.compiled.geometry
+        if geometry is not None:
+            candidates = [(house, schools) for house, schools in candidates
+                          if geometry.matches(house.latitude, house.longitude)]
+        known = [(house, schools) for house, schools in candidates if schools is not None]
+        unknown = [house for house, schools in candidates if schools is None]
+        logger.info(f"{len(candidates)} of {len(store)} stored listings pass the search criteria, "
+                    f"{len(unknown)} without school data")
+
+        if unknown and not args.offline:
+            scraper = RedfinScraper(config, storage)
+            fetched, _ = scraper.enrich(unknown)
+            fetched = [(house, schools) for house, schools in fetched if any(schools.values())]
+            store.set_schools(fetched)
+            known += fetched
+
+        matches = HouseBatch()
+        for house, schools in known:
+            if _matches_criteria(config, house, schools):
+                house.schools = schools
+                matches.append(house)
+
+        if not matches:
+            print("No newly qualifying houses.")
+            return
+        print(f"{len(matches)} newly qualifying houses:")
+        for house in matches:
+            print(f"  {house.formatted_price:>12}  {house.full_address}  {house.url}")
+
+        if args.notify:
+            from housewatch.notifier.email_notifier import EmailNotifier
+            storage.save_matched(matches)
+            if EmailNotifier(config.email).send_notification(matches):
+                logger.info("Email notification sent")
+            storage.make_multiple_as_seen(matches)
+            storage.save_seen()
+            store.mark_matched(matches)
+
+
+def _matches_criteria(config, house, schools: dict) -> bool:
+    """Schools and detail fields of a house against the compiled criteria"""
+    detail_matcher = config.compiled.details
+    return (config.compiled.schools.matches(schools)
+            and (detail_matcher is None or detail_matcher.matches(house.details)))
+
+
+def _stored_evaluations(config, store):
+    """(house, matched) for stored listings inside the search criteria whose schools are known"""
+    geometry = config.compiled.geometry
+    for house, schools in store.candidates(config.compiled.plan, include_matched=True,
+                                           levels=config.compiled.schools.levels):
+        if schools is None:
+            continue
+        if geometry is not None and not geometry.matches(house.latitude, house.longitude):
+            continue
+        yield house, _matches_criteria(config, house, schools)
+
+
+def price_drops(args: argparse.Namespace) -> None:
+    """Print the largest recent price drops, or one property's history"""
+    from housewatch.storage.timeseries import PriceHistory, PriceHistorySettings
+
+    config = ProjectConfig()
+    settings = PriceHistorySettings.from_config(config.app.get("price_history"))
+    with PriceHistory(root_dir / "data" / settings.path, settings) as history:
+        if args.property is not None:
+            for ts, price, status in history.history(args.property):
+                print(f"  {datetime.fromtimestamp(ts):%Y-%m-%d %H:%M}  ${price:>12,}  {status}")
+            return
+
+        drops = history.price_drops(args.pct, args.days)
+        print(f"{len(drops)} listings dropped at least {args.pct:g}% in the last "
+              f"{args.days:g} days ({len(history)} samples tracked)")
+
+    # Redfin URLs end in /home/<propertyId>: name the listings the store knows
+    names = {}
+    store_path = root_dir / "data" / "listings.sqlite"
+    if drops and store_path.exists():
+        from housewatch.storage.listing_store import ListingStore
+        with ListingStore(store_path) as store:
+            names = store.by_property_id()
+    for drop in drops[:args.limit]:
+        address, url = names.get(drop.property_id, (f"property {drop.property_id}", ""))
+        print(f"  -{drop.drop_pct:5.1f}%  ${drop.peak_price:>11,} -> ${drop.price:>11,}  "
+              f"{datetime.fromtimestamp(drop.changed_at):%Y-%m-%d}  {address}  {url}")
+
+
+def serve(args: argparse.Namespace) -> None:
+    """Run the local query endpoint until interrupted"""
+    from housewatch.query.index import MatchIndex, QuerySettings
+    from housewatch.query.server import QueryServer
+
+    config = ProjectConfig()
+    settings = QuerySettings.from_config(config.app.get("query"))
+    settings.host = args.host or settings.host
+    settings.port = args.port or settings.port
 
+    index = MatchIndex(root_dir / "data" / "matched_houses.json", settings)
+    server = QueryServer(index, root_dir / "data" / "listings.sqlite", settings)
+    logger.info(f"Serving {len(index)} matches on http://{settings.host}:{settings.port}/matches")
     try:
-        # Load configuration
-        config = ProjectConfig()
-        logger.info("✓ Configuration loaded")
-        #print("config:\n", vars(config))
-
-        # Initialize components
-        seen_path = root_dir / "data" / "seen_houses.json"
-        matched_path = root_dir / "data" / "matched_houses.json"
-        #  If you wanted to start with new storage files
-        #  for p in [seen_path, matched_path]:
-        #     if p.exists():
-        #         p.unlink()
-        #logger.info(f"\n\tSeen path: {seen_path}")
-        #logger.info(f"\n\tMatched path: {matched_path}")
-
-        # ==== This part has been modified to move filtration and storage in redfin_scraper ====
-
-        storage = HouseStorage(str(seen_path), str(matched_path))
-        scraper = RedfinScraper(config, storage)
-        notifier = EmailNotifier(config.email)
-            
-        # Fetch new matched from Redfin
-        new_listings = scraper.fetch()
-        logger.info(f"Found {len(new_listings)} NEW matches!")    
+        server.serve_forever()
+    except KeyboardInterrupt:
+        logger.info("Query server stopped")
+    finally:
+        server.server_close()
+
+
+def worker(args: argparse.Namespace) -> None:
+    """Lease detail-fetch jobs from the shared queue until stopped"""
+    import socket
+
+    from housewatch.scraper.distributed import DistributedSettings, Worker
+    from housewatch.scraper.rate_control import AdaptiveRateController, RateSettings
+    from housewatch.scraper.redfin_scraper import RedfinScraper
+    from housewatch.storage.job_queue import JobQueue
+
+    config = ProjectConfig()
+    settings = DistributedSettings.from_config(config.app.get("distributed"))
+    worker_id = args.id or socket.gethostname()
+    # Every host has its own IP, so its own learned request rate
+    rate_controller = AdaptiveRateController(
+        RateSettings.from_config(config.app.get("rate_limit")),
+        state_path=root_dir / "data" / f"rate_state.{worker_id}.json",
+    )
+    # Workers only fetch and parse; seen/matched storage belongs to the coordinator
+    scraper = RedfinScraper(config, storage=None, rate_controller=rate_controller)
+
+    with JobQueue(root_dir / settings.queue_path) as queue:
+        try:
+            Worker(scraper, queue, worker_id, settings).run(once=args.once)
+        except KeyboardInterrupt:
+            logger.info(f"Worker {worker_id} stopped")
+
+
+def run(profiler, tracer, distributed: bool = False, cassette=None, data_dir: Path = None) -> None:
+    """
+    Main pipeline: scrape -> filter -> storage -> notify
+    A replaying cassette serves every response from its archive; nothing
+    is sent, and data_dir should be a scratch directory.
+    """
+    from housewatch.filters.ranking import Ranker, RankingSettings
+    from housewatch.scraper.rate_control import AdaptiveRateController, RateSettings
+    from housewatch.scraper.redfin_scraper import RedfinScraper
+    from housewatch.scraper.schedule import RegionScheduler, ScheduleSettings
+    from housewatch.storage.priors import MatchPriors, PriorSettings, criteria_key
+    from housewatch.storage.retry_queue import RetryQueue, RetrySettings
+    from housewatch.storage.timeseries import PriceHistory, PriceHistorySettings
+    from housewatch.utils.deadline import BudgetSettings, RunBudget
+
+    data_dir = data_dir or root_dir / "data"
+    replaying = cassette is not None and cassette.replaying
+
+    # Load configuration
+    config = ProjectConfig()
+    logger.info("✓ Configuration loaded")
+    #print("config:\n", vars(config))
+
+    # Initialize components
+    seen_path = data_dir / "seen_houses.json"
+    matched_path = data_dir / "matched_houses.json"
+    #  If you wanted to start with new storage files
+    #  for p in [seen_path, matched_path]:
+    #     if p.exists():
+    #         p.unlink()
+    #logger.info(f"\n\tSeen path: {seen_path}")
+    #logger.info(f"\n\tMatched path: {matched_path}")
+
+    # ==== This part has been modified to move filtration and storage in redfin_scraper ====
+
+    storage = HouseStorage(str(seen_path), str(matched_path))
+    # Deadlines for the run and its search/details/notify stages: work not
+    # done in time is left unseen for the next run
+    budget = RunBudget(BudgetSettings.from_config(config.app.get("budget")))
+    # Learned request rates and open circuit breakers carry over between runs
+    rate_controller = AdaptiveRateController(
+        RateSettings.from_config(config.app.get("rate_limit")),
+        state_path=data_dir / "rate_state.json",
+    )
+    # Failed detail fetches are retried with backoff instead of marked seen
+    retry_queue = RetryQueue(RetrySettings.from_config(config.app.get("retry")),
+                             path=data_dir / "retry_queue.json")
+    # Busy regions are polled more often than quiet ones
+    scheduler = RegionScheduler(ScheduleSettings.from_config(config.app.get("schedule")),
+                                path=data_dir / "region_schedule.json")
+    # Coordinator: detail pages are fetched by workers through the job queue
+    detail_fetcher = queue = None
+    if distributed:
+        from housewatch.scraper.distributed import DistributedSettings, QueueDispatcher
+        from housewatch.storage.job_queue import JobQueue
+        settings = DistributedSettings.from_config(config.app.get("distributed"))
+        queue = JobQueue(root_dir / settings.queue_path)
+        detail_fetcher = QueueDispatcher(queue, settings, budget=budget)
+    # Every parsed listing with its schools, for `reevaluate`
+    listing_store = None
+    if config.app.get("listing_store", {}).get("enabled", True):
+        from housewatch.storage.listing_store import ListingStore
+        listing_store = ListingStore(data_dir / "listings.sqlite")
+    # Per zip/neighborhood/grid-cell match history: likely matches are
+    # fetched first, cells that never match are skipped. Rebuilt from the
+    # stored listings when there is none yet or the criteria changed
+    prior_settings = PriorSettings.from_config(config.app.get("priors"))
+    priors = None
+    if prior_settings.enabled:
+        history = _stored_evaluations(config, listing_store) if listing_store is not None else ()
+        priors = MatchPriors.load(data_dir / "match_priors.json", prior_settings,
+                                  key=criteria_key(config.criteria), history=history)
+    # Price and status of every search result over time, for `price-drops`
+    history_settings = PriceHistorySettings.from_config(config.app.get("price_history"))
+    price_history = None
+    if history_settings.enabled:
+        price_history = PriceHistory(data_dir / history_settings.path, history_settings)
+    # Only the best-scored matches go into the email in full
+    ranking = RankingSettings.from_config(config.app.get("ranking"))
+    ranker = None
+    if ranking.enabled:
+        ranker = Ranker(ranking, schools=config.compiled.schools, max_hoa=config.compiled.plan.max_hoa)
+    scraper = RedfinScraper(config, storage, profiler=profiler, tracer=tracer,
+                            rate_controller=rate_controller, priors=priors, retry_queue=retry_queue,
+                            scheduler=scheduler, detail_fetcher=detail_fetcher, cassette=cassette,
+                            listing_store=listing_store, ranker=ranker, budget=budget,
+                            price_history=price_history)
         
-        if not new_listings:
-            logger.info("No new houses since last check.")
-            return
-               
+    # Fetch new matched from Redfin
+    try:
+        new_listings = scraper.fetch()
+    finally:
+        if queue is not None:
+            queue.close()
+        if listing_store is not None:
+            listing_store.close()
+        if price_history is not None:
+            price_history.close()
+    logger.info(f"Found {len(new_listings)} NEW matches!")    
+    if budget.exhausted:
+        logger.warning(f"Run cut short by the {', '.join(sorted(budget.exhausted))} budget after "
+                       f"{budget.elapsed():.0f}s; unprocessed houses stay unseen for the next run")
+    
+    if not new_listings:
+        logger.info("No new houses since last check.")
+        return
+           
+    with profiler.stage("storage"), tracer.span("storage"):
         storage.save_matched(new_listings)
 
-        # Send notification
-        if notifier.send_notification(new_listings):
-            logger.info("Email notification sent")
-        else:
-            logger.info("Failed to send email notification")
+    if replaying:
+        for house in new_listings:
+            logger.info(f"Replayed match: {house.full_address} {house.url}")
+        return
+
+    # Send notification: the top K in score order, the rest as a summary
+    digest, remainder = new_listings, None
+    if ranker is not None:
+        with profiler.stage("rank"), tracer.span("rank"):
+            ranked, remainder = ranker.rank(new_listings)
+        digest = [house for _, house in ranked]
+
+    from housewatch.notifier.email_notifier import EmailNotifier
+    notifier = EmailNotifier(config.email)
+    with profiler.stage("notify"), tracer.span("notify"), budget.stage("notify") as deadline:
+        sent = notifier.send_notification(digest, remainder=remainder, timeout=deadline.remaining())
+    if sent:
+        logger.info("Email notification sent")
+    else:
+        logger.info("Failed to send email notification")
 
-        # Mark all processed listings as 'seen'
+    # Mark all processed listings as 'seen'
+    with profiler.stage("storage"), tracer.span("storage"):
         storage.make_multiple_as_seen(new_listings)
-        logger.info(f"Marked {len(new_listings)} houses as seen in history.")
+    logger.info(f"Marked {len(new_listings)} houses as seen in history.")
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    if args.command == "trace-report":
+        trace_report(args)
+        return
+    if args.command == "worker":
+        worker(args)
+        return
+    if args.command == "reevaluate":
+        reevaluate(args)
+        return
+    if args.command == "price-drops":
+        price_drops(args)
+        return
+    if args.command == "serve":
+        serve(args)
+        return
+
+    logger.info("Starting HouseWatch Service...")
+
+    profiler = StageProfiler(root_dir / "data" / "profiles") if args.profile else NullProfiler()
+    tracer = Tracer(root_dir / "data" / "traces") if args.trace else NullTracer()
+
+    # Replays start from empty state, so every recorded listing is evaluated again
+    cassette = data_dir = scratch = None
+    if args.record or args.replay:
+        from housewatch.scraper.cassette import Cassette
+        if args.replay:
+            cassette = Cassette.open(Path(args.replay))
+            scratch = tempfile.TemporaryDirectory(prefix="housewatch-replay-")
+            data_dir = Path(scratch.name)
+        else:
+            cassette = Cassette.record_to(
+                root_dir / "data" / "cassettes" / f"{datetime.now():%Y%m%d-%H%M%S}.zip")
+
+    try:
+        with tracer.span("run", kind="run"):
+            run(profiler, tracer, distributed=args.command == "coordinator",
+                cassette=cassette, data_dir=data_dir)
         
     except Exception as e:
         logger.error(f"Main pipeline crashed: {e}", exc_info=True)
+
+    finally:
+        tracer.close()
+        profiler.finish()
+        if cassette is not None:
+            cassette.close()
+        if scratch is not None:
+            scratch.cleanup()
     
     print(f"HouseWatch run completed at {datetime.now().strftime('%Y-%m-%d %H: %M: %S')}")
 
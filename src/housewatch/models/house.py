@@ -1,11 +1,37 @@
 # src/housewatch/modesl/house.py
 
-from dataclasses import dataclass, field
-from typing import Optional, List, Dict
+import sys
+from dataclasses import dataclass
+from typing import Any, Optional, List, Dict
 from datetime import datetime
 
 
-@dataclass
+class _EmptySchools(dict):
+    """
+    Shared read-only placeholder: most houses never get school data, so they
+    all point at one instance instead of allocating their own dict of lists.
+    Assign a new dict to house.schools to fill it in.
+    """
+    __slots__ = ()
+
+    def _read_only(self, *args, **kwargs):
+        raise TypeError("EMPTY_SCHOOLS is shared; assign a new dict to house.schools instead")
+
+    __setitem__ = __delitem__ = clear = pop = popitem = setdefault = update = _read_only
+
+    def __reduce__(self):
+        # Unpickles to the shared instance
+        return (_empty_schools, ())
+
+
+def _empty_schools() -> "_EmptySchools":
+    return EMPTY_SCHOOLS
+
+
+EMPTY_SCHOOLS = _EmptySchools(elementary=(), middle=(), high=())
+
+
+@dataclass(slots=True)
 class House:
     """Represents a house listing with all relevant details"""
     listing_id: str
@@ -22,7 +48,11 @@ class House:
     sqft: Optional[int] = None
     lot_size: Optional[float] = None
     url: str = ""
-    schools: Dict[str, List[str]] = field(default_factory=dict)
+    neighborhood: Optional[str] = None
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
+    schools: Optional[Dict[str, List[str]]] = None
+    details: Optional[Dict[str, Any]] = None     # enrichment fields read from the detail page
     listed_date: Optional[datetime] = None
     last_update: Optional[datetime] = None
 
@@ -35,11 +65,15 @@ class House:
         __post_init__.
         """
         if not self.schools:
-            self.schools = {
-                "elementary": [],
-                "middle": [],
-                "high": []
-            }
+            self.schools = EMPTY_SCHOOLS
+
+        # Few distinct values across thousands of houses: share one string each
+        if type(self.city) is str:
+            self.city = sys.intern(self.city)
+        if type(self.state) is str:
+            self.state = sys.intern(self.state)
+        if type(self.property_type) is str:
+            self.property_type = sys.intern(self.property_type)
     
     @property
     def formatted_price(self) -> str:
@@ -0,0 +1,159 @@
+# src/housewatch/models/house_batch.py
+
+import math
+import sys
+from array import array
+from dataclasses import fields
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
+
+from housewatch.models.house import House
+
+
+# Numeric House fields stored in typed arrays: array typecode per field
+NUMERIC_COLUMNS = {
+    "price": "q",
+    "year_built": "q",
+    "beds": "q",
+    "sqft": "q",
+    "hoa_fee": "d",
+    "baths": "d",
+    "lot_size": "d",
+    "latitude": "d",
+    "longitude": "d",
+}
+
+# String House fields stored as lists; low-cardinality ones are interned
+STRING_COLUMNS = ("listing_id", "address", "city", "state", "zip_code", "property_type", "url", "neighborhood")
+INTERNED_COLUMNS = {"city", "state", "property_type", "zip_code", "neighborhood"}
+
+# Stand-in for None in integer columns (floats use NaN)
+NULL_INT = -(2 ** 63)
+
+# Everything else (schools, dates) is rare or non-scalar: kept sparse per row
+SPARSE_COLUMNS = tuple(
+    f.name for f in fields(House)
+    if f.name not in NUMERIC_COLUMNS and f.name not in STRING_COLUMNS
+)
+
+
+class HouseBatch:
+    """
+    Columnar container for many houses: array-backed numeric columns, string
+    columns and sparse per-row extras. Iterating yields House objects built on
+    demand, so it can be passed wherever a List[House] was expected.
+    """
+
+    __slots__ = ("numeric", "strings", "sparse")
+
+    def __init__(self, houses: Optional[Iterable[House]] = None):
+        self.numeric: Dict[str, array] = {name: array(code) for name, code in NUMERIC_COLUMNS.items()}
+        self.strings: Dict[str, List[Optional[str]]] = {name: [] for name in STRING_COLUMNS}
+        self.sparse: Dict[str, Dict[int, Any]] = {name: {} for name in SPARSE_COLUMNS}
+
+        if houses is not None:
+            self.extend(houses)
+
+    # ------------------------------------------------------------------
+    # Building
+    # ------------------------------------------------------------------
+
+    def append(self, house: House) -> None:
+        row = len(self)
+
+        for name, code in NUMERIC_COLUMNS.items():
+            value = getattr(house, name)
+            if value is None:
+                value = math.nan if code == "d" else NULL_INT
+            self.numeric[name].append(value if code == "d" else int(value))
+
+        for name in STRING_COLUMNS:
+            value = getattr(house, name)
+            if name in INTERNED_COLUMNS and type(value) is str:
+                value = sys.intern(value)
+            self.strings[name].append(value)
+
+        for name in SPARSE_COLUMNS:
+            value = getattr(house, name)
+            if value and not (name == "schools" and not any(value.values())):
+                self.sparse[name][row] = value
+
+    def extend(self, houses: Iterable[House]) -> None:
+        for house in houses:
+            self.append(house)
+
+    # ------------------------------------------------------------------
+    # Access
+    # ------------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self.strings["listing_id"])
+
+    def __getitem__(self, row: int) -> House:
+        if row < 0:
+            row += len(self)
+        if not 0 <= row < len(self):
+            raise IndexError(row)
+
+        values = {name: self.strings[name][row] for name in STRING_COLUMNS}
+        for name, code in NUMERIC_COLUMNS.items():
+            value = self.numeric[name][row]
+            if code == "d":
+                values[name] = None if math.isnan(value) else value
+            else:
+                values[name] = None if value == NULL_INT else value
+        for name in SPARSE_COLUMNS:
+            if row in self.sparse[name]:
+                values[name] = self.sparse[name][row]
+
+        # Non-optional fields keep their House defaults
+        if values["hoa_fee"] is None:
+            values["hoa_fee"] = 0.0
+        if values["price"] is None:
+            values["price"] = 0
+        return House(**values)
+
+    def __iter__(self) -> Iterator[House]:
+        for row in range(len(self)):
+            yield self[row]
+
+    def column(self, name: str) -> Sequence:
+        """Raw column: array for numeric fields, list for strings"""
+        if name in self.numeric:
+            return self.numeric[name]
+        return self.strings[name]
+
+    def select(self, rows: Iterable[int]) -> "HouseBatch":
+        """New batch with the given rows, in the given order"""
+        out = HouseBatch()
+        for new_row, row in enumerate(rows):
+            for name, col in self.numeric.items():
+                out.numeric[name].append(col[row])
+            for name, col in self.strings.items():
+                out.strings[name].append(col[row])
+            for name, col in self.sparse.items():
+                if row in col:
+                    out.sparse[name][new_row] = col[row]
+        return out
+
+    def where(self, mask: Iterable[bool]) -> "HouseBatch":
+        """New batch with the rows whose mask value is true"""
+        return self.select(row for row, keep in enumerate(mask) if keep)
+
+    def to_houses(self) -> List[House]:
+        return list(self)
+
+    def nbytes(self) -> int:
+        """Approximate memory held by the batch (containers plus string payloads)"""
+        total = sys.getsizeof(self)
+        for col in self.numeric.values():
+            total += sys.getsizeof(col)
+        seen = set()
+        for col in self.strings.values():
+            total += sys.getsizeof(col)
+            for value in col:
+                if id(value) not in seen:
+                    seen.add(id(value))
+                    total += sys.getsizeof(value)
+        for col in self.sparse.values():
+            total += sys.getsizeof(col)
+        return total
@@ -1,12 +1,20 @@
 # src/housewatch/notifier/email_notifier.py
 
-import smtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
-from typing import List
+import math
+from typing import Any, Dict, List, Optional
 
 from housewatch.models.house import House
 
+# Row labels for enrichment fields (house.details), in display order
+DETAIL_LABELS = {
+    "school_ratings": "School Ratings",
+    "school_distances": "School Distances",
+    "days_on_market": "Days on Market",
+    "hoa_dues": "HOA Dues",
+    "tax_history": "Property Tax",
+    "remarks_keywords": "Remarks Mention",
+}
+
 
 class EmailNotifier:
     """Send email notifications for new house matches"""
@@ -20,8 +28,12 @@ class EmailNotifier:
         self.recipient_emails = self.config.get("recipient_emails", [])
     
 
-    def send_notification(self, houses: List[House]) -> bool:
-        """Send email notification with matching houses"""
+    def send_notification(self, houses: List[House], remainder=None, timeout: float = math.inf) -> bool:
+        """
+        Send email notification with matching houses. remainder
+        (filters.ranking.Remainder) summarizes matches left out of the list;
+        timeout (seconds) bounds each SMTP operation.
+        """
         if not houses:
             print("No houses to notify")
             return False
@@ -29,23 +41,30 @@ class EmailNotifier:
         if not self.sender_email or not self.sender_password:
             print("Error: email credentials missing (Check your .env and email.yaml)")
             return False
+
+        # Imported here: most runs have nothing to send
+        import smtplib
+        from email.mime.text import MIMEText
+        from email.mime.multipart import MIMEMultipart
         
         try:
             # Create message
             msg = MIMEMultipart('alternative')
-            msg['Subject'] = f"Found {len(houses)} new houses matches!"
+            total = len(houses) + (remainder.count if remainder else 0)
+            msg['Subject'] = f"Found {total} new houses matches!"
             msg['From'] = self.sender_email
 
             # Join multiple recipients with comma
-            recipients = self.recipient_emails if isinstance(self.recipient_emails, list) else [self.recipient_emails]
+            recipients = list(self.recipient_emails) if isinstance(self.recipient_emails, (list, tuple)) else [self.recipient_emails]
             msg['To'] = ", ".join(recipients)
             
             # Create HTML content
-            html_content = self._create_html_content(houses)
+            html_content = self._create_html_content(houses, remainder)
             msg.attach(MIMEText(html_content, 'html', 'utf-8'))
 
             # Send email via SMTP
-            with smtplib.SMTP(self.smtp_server, self.smtp_port) as server:
+            smtp_timeout = {} if math.isinf(timeout) else {"timeout": max(timeout, 1.0)}
+            with smtplib.SMTP(self.smtp_server, self.smtp_port, **smtp_timeout) as server:
                 server.set_debuglevel(0) # use 1 for debug
                 server.starttls() # use TLS security
                 server.login(self.sender_email, self.sender_password)
@@ -59,13 +78,18 @@ class EmailNotifier:
             return False
 
 
-    def _create_html_content(self, houses: List[House]) -> str:
+    def _create_html_content(self, houses: List[House], remainder=None) -> str:
         """Generate HTML email content"""
+        if remainder and remainder.count:
+            found = (f"Found <strong>{len(houses) + remainder.count}</strong> houses matching the criteria, "
+                     f"the best {len(houses)} by score:")
+        else:
+            found = f"Found <strong>{len(houses)}</strong> houses matching the criteria:"
         html = f"""
         <html>
         <body style="font-family: Arial, sans-serif; color: #333;">
             <h2 style="color: #2c3e50;"> New House Matches Found!</h2>
-            <p>Found <strong>{len(houses)}</strong> houses matching the criteria:</p>
+            <p>{found}</p>
             <hr style="border: none; border-top: 1px solid #eee;">
         """
 
@@ -97,6 +121,7 @@ class EmailNotifier:
                     <tr><td><strong>Year Built:</strong></td><td>{house.year_built or 'N/A'}</td></tr>
                     <tr><td><strong>Type:</strong></td><td>{house.property_type}</td></tr>
                     <tr><td><strong>Schools:</strong></td><td>{school_html_str}</td></tr>
+                    {self._details_rows(house.details)}
                 </table>
                 <p style="margin-top: 15px;">
                     <a href="{house.url}" style="background-color: #3498db; color: white; padding: 10px 20px; text-decoration: none; border-radius: 5px; display: inline-block;">View on Redfin</a>
@@ -104,6 +129,15 @@ class EmailNotifier:
             </div>
             """
 
+        if remainder and remainder.count:
+            prices = ""
+            if remainder.min_price is not None:
+                prices = f", priced ${remainder.min_price:,} - ${remainder.max_price:,}"
+            html += f"""
+            <p>{remainder.count} more matches{prices}, are not listed. All matches are saved
+            in matched_houses.json.</p>
+            """
+
         html += """
             <pstyle="color: #7f8c8d; font-size: 12px; margin-top: 30px;>
             --<br>
@@ -114,6 +148,33 @@ class EmailNotifier:
         """
 
         return html
+
+
+    @staticmethod
+    def _details_rows(details: Optional[Dict[str, Any]]) -> str:
+        """Table rows for the enrichment fields a house has"""
+        rows = []
+        for name, label in DETAIL_LABELS.items():
+            value = (details or {}).get(name)
+            if value is None:
+                continue
+            if name == "school_ratings":
+                text = "<br>".join(f"{school}: {rating}/10" for school, rating in value.items())
+            elif name == "school_distances":
+                text = "<br>".join(f"{school}: {miles:g} mi" for school, miles in value.items())
+            elif name == "hoa_dues":
+                text = f"${value:,.0f}/month"
+            elif name == "tax_history":
+                latest = max(value, key=lambda entry: entry["year"])
+                text = f"${latest['tax']:,.0f} ({latest['year']})"
+            elif name == "remarks_keywords":
+                if not value:
+                    continue
+                text = ", ".join(value)
+            else:
+                text = str(value)
+            rows.append(f"<tr><td><strong>{label}:</strong></td><td>{text}</td></tr>")
+        return "\n".join(rows)
                 
 
             
@@ -0,0 +1,236 @@
+# src/housewatch/query/index.py
+
+import json
+import logging
+import re
+import threading
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from dataclasses import dataclass, field, fields
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from housewatch.filters.school_index import normalize
+
+logger = logging.getLogger(__name__)
+
+# "street, City, ST 60540" as written by HouseStorage.save_matched
+ADDRESS_TAIL = re.compile(r",\s*([^,]+),\s*([A-Z]{2})\s+(\d{5})(?:-\d{4})?\s*$")
+
+SORT_KEYS = ("detected_at", "price")
+
+
+@dataclass
+class QuerySettings:
+    """Tuning knobs, loaded from app.query"""
+    host: str = "127.0.0.1"       # `serve` binds here; keep it local
+    port: int = 8787
+    cache_entries: int = 256      # query results kept in the LRU cache
+    page_size: int = 50
+    max_page_size: int = 500
+
+    @classmethod
+    def from_config(cls, cfg: Optional[dict]) -> "QuerySettings":
+        cfg = cfg or {}
+        known = {f.name for f in fields(cls)}
+        return cls(**{k: v for k, v in cfg.items() if k in known})
+
+
+@dataclass(frozen=True)
+class MatchQuery:
+    """Filters, order and page of a match query; None filters are not applied"""
+    city: Optional[str] = None
+    zip_code: Optional[str] = None
+    school: Optional[str] = None
+    min_price: Optional[int] = None
+    max_price: Optional[int] = None
+    since: Optional[float] = None      # detected_at bounds, epoch seconds
+    until: Optional[float] = None
+    sort: str = "detected_at"
+    descending: bool = True
+    offset: int = 0
+    limit: int = 50
+
+
+@dataclass
+class QueryResult:
+    total: int                                   # matches before pagination
+    offset: int
+    limit: int
+    items: List[Dict[str, Any]] = field(default_factory=list)
+
+    def to_json(self) -> dict:
+        return {"total": self.total, "offset": self.offset, "limit": self.limit, "items": self.items}
+
+
+class MatchIndex:
+    """
+    Read-only view of matched_houses.json with secondary indexes:
+    detected_at and price as sorted (value, row) lists for range lookups,
+    city, zip code and normalized school name as row sets. A query starts
+    from its most selective index and checks the other filters on those
+    rows only, so it never scans the whole history. Results are kept in an
+    LRU cache; the file is re-read, and the cache cleared, when its size or
+    mtime changes.
+    """
+
+    def __init__(self, path: Path, settings: Optional[QuerySettings] = None):
+        self.path = Path(path)
+        self.settings = settings or QuerySettings()
+        self._lock = threading.Lock()
+        self._stamp = None
+        self._cache: "OrderedDict[MatchQuery, QueryResult]" = OrderedDict()
+        self.hits = self.misses = 0
+        self._clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._refresh()
+            return len(self.entries)
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def query(self, q: MatchQuery) -> QueryResult:
+        if q.sort not in SORT_KEYS:
+            raise ValueError(f"sort must be one of {', '.join(SORT_KEYS)}, got {q.sort!r}")
+        q = _clamped(q, self.settings.max_page_size)
+
+        with self._lock:
+            self._refresh()
+            cached = self._cache.get(q)
+            if cached is not None:
+                self._cache.move_to_end(q)
+                self.hits += 1
+                return cached
+            self.misses += 1
+
+            rows = self._rows(q)
+            if rows is None:
+                keys = self._detected if q.sort == "detected_at" else self._prices
+                ordered = [row for _, row in keys]
+            else:
+                values = self._row_detected if q.sort == "detected_at" else self._row_price
+                ordered = sorted(rows, key=lambda row: (values[row], row))
+            if q.descending:
+                ordered.reverse()
+            page = ordered[q.offset:q.offset + q.limit]
+            result = QueryResult(len(ordered), q.offset, q.limit, [self.entries[row] for row in page])
+
+            self._cache[q] = result
+            if len(self._cache) > self.settings.cache_entries:
+                self._cache.popitem(last=False)
+            return result
+
+    # ------------------------------------------------------------------
+    # Internal helpers
+    # ------------------------------------------------------------------
+
+    def _rows(self, q: MatchQuery) -> Optional[Set[int]]:
+        """
+        Rows passing every filter, None when there are no filters. The most
+        selective index supplies the candidates (range sizes come from two
+        bisects); the other filters are checked on those rows only.
+        """
+        sets: List[Set[int]] = []
+        if q.city is not None:
+            sets.append(self._by_city.get(q.city.casefold(), set()))
+        if q.zip_code is not None:
+            sets.append(self._by_zip.get(str(q.zip_code), set()))
+        if q.school is not None:
+            sets.append(self._by_school.get(normalize(q.school), set()))
+        ranges = []    # (size, start, end, sorted keys, value by row, low, high)
+        for keys, values, low, high in ((self._prices, self._row_price, q.min_price, q.max_price),
+                                        (self._detected, self._row_detected, q.since, q.until)):
+            if low is not None or high is not None:
+                start, end = _span(keys, low, high)
+                ranges.append((end - start, start, end, keys, values, low, high))
+        if not sets and not ranges:
+            return None
+
+        sets.sort(key=len)
+        ranges.sort(key=lambda r: r[0])
+        if sets and (not ranges or len(sets[0]) <= ranges[0][0]):
+            rows, sets = sets[0], sets[1:]
+        else:
+            _, start, end, keys = ranges[0][:4]
+            rows = [row for _, row in keys[start:end]]
+            ranges = ranges[1:]
+        return {row for row in rows
+                if all(row in other for other in sets)
+                and all((low is None or values[row] >= low) and (high is None or values[row] <= high)
+                        for _, _, _, _, values, low, high in ranges)}
+
+    def _refresh(self) -> None:
+        try:
+            stat = self.path.stat()
+        except FileNotFoundError:
+            if self._stamp is not None:
+                self._clear()
+            return
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        if stamp != self._stamp:
+            self._load()
+            self._stamp = stamp
+
+    def _clear(self) -> None:
+        self.entries: List[Dict[str, Any]] = []
+        self._detected: List[Tuple[float, int]] = []
+        self._prices: List[Tuple[float, int]] = []
+        self._row_detected: List[float] = []    # sort keys by row
+        self._row_price: List[float] = []
+        self._by_city: Dict[str, Set[int]] = {}
+        self._by_zip: Dict[str, Set[int]] = {}
+        self._by_school: Dict[str, Set[int]] = {}
+        self._cache.clear()
+        self._stamp = None
+
+    def _load(self) -> None:
+        self._clear()
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                entries = json.load(f)
+        except (json.JSONDecodeError, IOError) as e:
+            logger.warning(f"Ignoring unreadable matches file {self.path}: {e}")
+            return
+
+        for row, entry in enumerate(entries):
+            self.entries.append(entry)
+            try:
+                detected = datetime.strptime(entry.get("detected_at", ""), "%Y-%m-%d %H:%M:%S").timestamp()
+            except (TypeError, ValueError):
+                detected = 0.0
+            price = entry.get("price") or 0
+            self._detected.append((detected, row))
+            self._prices.append((price, row))
+            self._row_detected.append(detected)
+            self._row_price.append(price)
+
+            m = ADDRESS_TAIL.search(entry.get("address") or "")
+            if m:
+                self._by_city.setdefault(m.group(1).strip().casefold(), set()).add(row)
+                self._by_zip.setdefault(m.group(3), set()).add(row)
+            for names in (entry.get("schools") or {}).values():
+                for name in names or ():
+                    self._by_school.setdefault(normalize(name), set()).add(row)
+
+        self._detected.sort()
+        self._prices.sort()
+        logger.info(f"Indexed {len(self.entries)} matches from {self.path}")
+
+
+def _span(keys: List[Tuple[float, int]], low, high) -> Tuple[int, int]:
+    """[start, end) of the keys within [low, high] (None: unbounded) in a sorted (key, row) list"""
+    start = 0 if low is None else bisect_left(keys, (low, -1))
+    end = len(keys) if high is None else bisect_right(keys, (high, float("inf")))
+    return start, end
+
+
+def _clamped(q: MatchQuery, max_page_size: int) -> MatchQuery:
+    limit = min(max(q.limit, 1), max_page_size)
+    offset = max(q.offset, 0)
+    if limit == q.limit and offset == q.offset:
+        return q
+    return MatchQuery(**{**q.__dict__, "limit": limit, "offset": offset})
@@ -0,0 +1,119 @@
+# src/housewatch/query/server.py
+
+import json
+import logging
+import math
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Optional
+from urllib.parse import parse_qs, urlsplit
+
+from housewatch.query.index import MatchIndex, MatchQuery, QuerySettings
+
+logger = logging.getLogger(__name__)
+
+
+class QueryServer(ThreadingHTTPServer):
+    """
+    Local read-only JSON endpoint over the match index and the listing store:
+        GET /matches?city=Naperville&max_price=900000&days=7&limit=20&offset=0
+            also zip, school, min_price, since/until (epoch seconds),
+            sort=detected_at|price, order=desc|asc
+        GET /listings?city=&zip=&min_price=&max_price=&matched=1&limit=&offset=
+        GET /health
+    """
+
+    daemon_threads = True
+
+    def __init__(self, index: MatchIndex, listings_path: Optional[Path] = None,
+                 settings: Optional[QuerySettings] = None):
+        self.index = index
+        self.listings_path = Path(listings_path) if listings_path else None
+        self.settings = settings or QuerySettings()
+        super().__init__((self.settings.host, self.settings.port), _Handler)
+
+
+class _Handler(BaseHTTPRequestHandler):
+
+    server: QueryServer
+
+    def do_GET(self) -> None:
+        url = urlsplit(self.path)
+        params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        try:
+            if url.path == "/matches":
+                body = self._matches(params)
+            elif url.path == "/listings":
+                body = self._listings(params)
+            elif url.path == "/health":
+                index = self.server.index
+                body = {"matches": len(index), "cache_hits": index.hits, "cache_misses": index.misses}
+            else:
+                self._send(404, {"error": f"unknown path {url.path}"})
+                return
+        except ValueError as e:
+            self._send(400, {"error": str(e)})
+            return
+        self._send(200, body)
+
+    def log_message(self, format: str, *args) -> None:
+        logger.debug(f"{self.address_string()} {format % args}")
+
+    def _matches(self, params: dict) -> dict:
+        since = _number(params, "since")
+        if "days" in params:
+            # Whole minutes, so repeated dashboard requests share a cache entry
+            since = (time.time() - _number(params, "days") * 86400) // 60 * 60
+        query = MatchQuery(
+            city=params.get("city"),
+            zip_code=params.get("zip"),
+            school=params.get("school"),
+            min_price=_number(params, "min_price"),
+            max_price=_number(params, "max_price"),
+            since=since,
+            until=_number(params, "until"),
+            sort=params.get("sort", "detected_at"),
+            descending=params.get("order", "desc") != "asc",
+            offset=int(_number(params, "offset") or 0),
+            limit=int(_number(params, "limit") or self.server.settings.page_size),
+        )
+        return self.server.index.query(query).to_json()
+
+    def _listings(self, params: dict) -> dict:
+        from housewatch.storage.listing_store import ListingStore
+
+        path = self.server.listings_path
+        if path is None or not path.exists():
+            return {"total": 0, "offset": 0, "limit": 0, "items": []}
+        settings = self.server.settings
+        limit = min(max(int(_number(params, "limit") or settings.page_size), 1), settings.max_page_size)
+        offset = max(int(_number(params, "offset") or 0), 0)
+        # One read-only connection per request: sqlite connections stay on
+        # their thread, and a query must never write to the store
+        with ListingStore(path, read_only=True) as store:
+            total, rows = store.search(
+                city=params.get("city"), zip_code=params.get("zip"),
+                min_price=_number(params, "min_price"), max_price=_number(params, "max_price"),
+                matched_only=params.get("matched") in ("1", "true"), offset=offset, limit=limit)
+        return {"total": total, "offset": offset, "limit": limit, "items": rows}
+
+    def _send(self, status: int, body: dict) -> None:
+        data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+def _number(params: dict, key: str) -> Optional[float]:
+    if key not in params:
+        return None
+    try:
+        value = float(params[key])
+    except ValueError:
+        value = math.nan
+    if not math.isfinite(value):
+        raise ValueError(f"{key}: expected a number, got {params[key]!r}")
+    return value
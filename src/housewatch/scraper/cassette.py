@@ -0,0 +1,144 @@
+# src/housewatch/scraper/cassette.py
+
+import json
+import logging
+import threading
+import zipfile
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, Optional
+from urllib.parse import urlsplit
+
+logger = logging.getLogger(__name__)
+
+INDEX_MEMBER = "index.json"
+# Response headers kept in the archive (the scraper reads nothing else)
+KEPT_HEADERS = ("Content-Type", "Retry-After")
+# Left out of request keys: the incremental sort order changes between
+# runs but not which recording a replay should get
+IGNORED_PARAMS = {"ord"}
+
+
+def request_key(url: str, params: Optional[dict] = None) -> str:
+    """Path and sorted params; the host is left out so a cassette recorded
+    through a mirror or stand-in server replays against any SITE_URL"""
+    items = sorted((str(k), str(v)) for k, v in (params or {}).items() if k not in IGNORED_PARAMS)
+    return urlsplit(url).path + "?" + "&".join(f"{k}={v}" for k, v in items)
+
+
+class RecordedResponse:
+    """The parts of a requests.Response the scraper uses, backed by bytes"""
+
+    def __init__(self, url: str, status_code: int, headers: Dict[str, str], content: bytes):
+        self.url = url
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+
+    def iter_content(self, chunk_size: int = 64 * 1024) -> Iterator[bytes]:
+        for start in range(0, len(self.content), chunk_size):
+            yield self.content[start:start + chunk_size]
+
+    def raise_for_status(self) -> None:
+        if self.status_code >= 400:
+            import requests
+            raise requests.HTTPError(f"{self.status_code} for url: {self.url}", response=self)
+
+    def close(self) -> None:
+        pass
+
+    def __enter__(self) -> "RecordedResponse":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        pass
+
+
+class Cassette:
+    """
+    One run's HTTP traffic in a zip archive: a deflated member per response
+    plus an index (request key -> member, status, headers), so any response
+    can be read without unpacking the rest.
+    - record mode: record() stores each response the scraper receives
+    - replay mode: replay() serves the last response recorded for a request;
+      unknown requests get a 404
+    """
+
+    def __init__(self, path: Path, replaying: bool):
+        self.path = Path(path)
+        self.replaying = replaying
+        self.index: Dict[str, dict] = {}
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        if replaying:
+            self._zip = zipfile.ZipFile(self.path, "r")
+            self.index = json.loads(self._zip.read(INDEX_MEMBER))["requests"]
+            logger.info(f"Replaying {len(self.index)} recorded requests from {self.path}")
+        else:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._zip = zipfile.ZipFile(self.path, "w", compression=zipfile.ZIP_DEFLATED)
+            self._count = 0
+
+    @classmethod
+    def record_to(cls, path: Path) -> "Cassette":
+        return cls(path, replaying=False)
+
+    @classmethod
+    def open(cls, path: Path) -> "Cassette":
+        return cls(path, replaying=True)
+
+    def __enter__(self) -> "Cassette":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def record(self, url: str, params: Optional[dict], resp) -> RecordedResponse:
+        """Read and store a live response; returns a replayable copy of it"""
+        with resp:
+            body = resp.content
+        headers = {name: resp.headers[name] for name in KEPT_HEADERS if name in resp.headers}
+        key = request_key(url, params)
+
+        with self._lock:
+            self._count += 1
+            member = f"responses/{self._count:06d}"
+            self._zip.writestr(member, body)
+            self.index[key] = {
+                "member": member,
+                "status": resp.status_code,
+                "headers": headers,
+            }
+        return RecordedResponse(resp.url or url, resp.status_code, headers, body)
+
+    def replay(self, url: str, params: Optional[dict] = None) -> RecordedResponse:
+        entry = self.index.get(request_key(url, params))
+        if entry is None:
+            with self._lock:
+                self.misses += 1
+            logger.warning(f"Not in cassette: {request_key(url, params)}")
+            return RecordedResponse(url, 404, {}, b"")
+
+        with self._lock:
+            body = self._zip.read(entry["member"])
+        return RecordedResponse(url, entry["status"], entry["headers"], body)
+
+    def close(self) -> None:
+        if self._zip is None:
+            return
+        if not self.replaying:
+            with self._lock:
+                self._zip.writestr(INDEX_MEMBER, json.dumps({
+                    "requests": self.index,
+                    "recorded_at": datetime.now().isoformat(),
+                }))
+            logger.info(f"Recorded {len(self.index)} requests into {self.path}")
+        elif self.misses:
+            logger.warning(f"{self.misses} requests were not in the cassette")
+        self._zip.close()
+        self._zip = None
@@ -0,0 +1,261 @@
+# src/housewatch/scraper/detail_parser.py
+
+import logging
+import os
+import re
+from concurrent.futures import Future
+from functools import partial
+from typing import Any, Dict, Iterable, List, Optional
+
+# bs4/lxml are imported inside parse_details: worker processes pay for them
+# once, the parent only when it parses inline
+
+logger = logging.getLogger(__name__)
+
+# Grade range in a school description: K-5, 6-8, 9-12
+GRADE_RANGE = re.compile(r"(K|\d+)\s*-\s*(\d+)")
+
+# Below this many pages the pool start-up costs more than it saves
+INLINE_BELOW = 8
+
+# Page sections (CSS classes) the parser keeps; everything else is skipped
+SCHOOLS_SECTION = "schools-table"
+KEY_DETAILS_SECTION = "keyDetailsList"
+TAX_SECTION = "tax-history"
+REMARKS_SECTION = "remarks"
+
+MILES = re.compile(r"(\d+(?:\.\d+)?)\s*mi\b")
+NUMBER = re.compile(r"\d[\d,]*(?:\.\d+)?")
+DAYS = re.compile(r"(\d+)\s*days?", re.IGNORECASE)
+# Billing period of HOA dues -> months it covers
+DUES_PERIODS = (
+    (re.compile(r"\b(mo|month|monthly)\b", re.IGNORECASE), 1),
+    (re.compile(r"\b(quarter|quarterly|qtr)\b", re.IGNORECASE), 3),
+    (re.compile(r"\b(semi-?annual|semi-?annually|half-?year)\b", re.IGNORECASE), 6),
+    (re.compile(r"\b(yr|year|yearly|annual|annually)\b", re.IGNORECASE), 12),
+)
+
+
+def parse_schools(page: bytes) -> Dict[str, List[str]]:
+    """Assigned schools of a property page, grouped by level"""
+    return parse_details(page)["schools"]
+
+
+def parse_details(page: bytes, fields: Iterable[str] = (), keywords: Iterable[str] = ()) -> Dict[str, Any]:
+    """
+    One parse of a property page: {"schools": by level, "details": {field: value}}
+    for the requested enrichment FIELDS (see below); a field the page does not
+    show is left out. Module-level so it can run in a worker process; takes
+    the raw bytes (lxml detects the encoding) and returns a small dict.
+    """
+    from bs4 import BeautifulSoup, SoupStrainer
+
+    fields = [name for name in fields if name in FIELDS]
+    sections = {SCHOOLS_SECTION} | {FIELDS[name][0] for name in fields}
+
+    # Only build the tree for the sections needed, skip the rest of the page.
+    # The strainer sees the whole class attribute ("schools-table foo"), so
+    # match on any of its tokens
+    def wanted(value: Optional[str]) -> bool:
+        return value is not None and not sections.isdisjoint(value.split())
+
+    soup = BeautifulSoup(page, "lxml", parse_only=SoupStrainer(class_=wanted))
+
+    details = {}
+    for name in fields:
+        value = FIELDS[name][1](soup, tuple(keywords))
+        if value is not None:
+            details[name] = value
+    return {"schools": _schools(soup), "details": details}
+
+
+def _schools(soup) -> Dict[str, List[str]]:
+    schools = {
+        "elementary": [],
+        "middle": [],
+        "high": []
+    }
+
+    for item in soup.select(f".{SCHOOLS_SECTION} .ListItem"):
+        name = item.select_one(".ListItem__heading")
+        desc = item.select_one(".ListItem__description")
+
+        if not name or not desc:
+            continue
+
+        name = name.get_text(strip=True)
+        desc = desc.get_text(strip=True)
+
+        m = GRADE_RANGE.search(desc)
+        if not m:
+            continue
+
+        start, end = m.group(1), int(m.group(2))
+
+        # Elementary
+        if start == "K" and end <= 5:
+            schools["elementary"].append(name)
+
+        # Middle
+        elif start.isdigit() and 6 <= int(start) <= 8:
+            schools["middle"].append(name)
+
+        # High
+        elif end >= 9:
+            schools["high"].append(name)
+
+    return schools
+
+
+# ----------------------------------------------------------------------
+# Enrichment fields: name -> (page section, extractor(soup, keywords))
+# ----------------------------------------------------------------------
+
+def _school_items(soup):
+    for item in soup.select(f".{SCHOOLS_SECTION} .ListItem"):
+        name = item.select_one(".ListItem__heading")
+        if name:
+            yield name.get_text(strip=True), item
+
+
+def _school_ratings(soup, keywords) -> Optional[Dict[str, int]]:
+    ratings = {}
+    for name, item in _school_items(soup):
+        rating = item.select_one("[class*=rating i]")
+        m = rating and NUMBER.search(rating.get_text())
+        if m:
+            ratings[name] = int(float(m.group().replace(",", "")))
+    return ratings or None
+
+
+def _school_distances(soup, keywords) -> Optional[Dict[str, float]]:
+    distances = {}
+    for name, item in _school_items(soup):
+        m = MILES.search(item.get_text(" "))
+        if m:
+            distances[name] = float(m.group(1))
+    return distances or None
+
+
+def _key_detail(soup, *labels: str) -> Optional[str]:
+    """Value text of the first key-details row whose label starts with one of labels"""
+    for row in soup.select(f".{KEY_DETAILS_SECTION} .keyDetails-row"):
+        label = row.select_one(".valueType")
+        value = row.select_one(".valueText")
+        if label and value and label.get_text(strip=True).lower().startswith(labels):
+            return value.get_text(" ", strip=True)
+    return None
+
+
+def _days_on_market(soup, keywords) -> Optional[int]:
+    text = _key_detail(soup, "time on redfin", "days on market")
+    m = text and DAYS.search(text)
+    return int(m.group(1)) if m else None
+
+
+def _hoa_dues(soup, keywords) -> Optional[float]:
+    """Dues per month; None when the page does not say what period they cover"""
+    text = _key_detail(soup, "hoa dues")
+    m = text and NUMBER.search(text)
+    if not m:
+        return None
+    period = text[m.end():]
+    for pattern, months in DUES_PERIODS:
+        if pattern.search(period):
+            return float(m.group().replace(",", "")) / months
+    return None
+
+
+def _tax_history(soup, keywords) -> Optional[List[Dict[str, float]]]:
+    history = []
+    for row in soup.select(f".{TAX_SECTION} tr"):
+        cells = [cell.get_text(strip=True) for cell in row.find_all("td")]
+        if len(cells) >= 2 and cells[0].isdigit():
+            m = NUMBER.search(cells[1])
+            if m:
+                history.append({"year": int(cells[0]), "tax": float(m.group().replace(",", ""))})
+    return history or None
+
+
+def _remarks_keywords(soup, keywords) -> Optional[List[str]]:
+    """Keywords found in the listing remarks ([] if none, None without remarks)"""
+    section = soup.select_one(f".{REMARKS_SECTION}")
+    if section is None:
+        return None
+    text = section.get_text(" ").lower()
+    return [keyword for keyword in keywords if keyword.lower() in text]
+
+
+FIELDS = {
+    "school_ratings": (SCHOOLS_SECTION, _school_ratings),
+    "school_distances": (SCHOOLS_SECTION, _school_distances),
+    "days_on_market": (KEY_DETAILS_SECTION, _days_on_market),
+    "hoa_dues": (KEY_DETAILS_SECTION, _hoa_dues),
+    "tax_history": (TAX_SECTION, _tax_history),
+    "remarks_keywords": (REMARKS_SECTION, _remarks_keywords),
+}
+
+
+def _warm_up() -> int:
+    """Import the parser stack in a worker before real pages arrive"""
+    import bs4  # noqa: F401
+    import lxml  # noqa: F401
+    return os.getpid()
+
+
+class DetailParser:
+    """
+    Parse detail pages off the fetching threads.
+    - processes > 0: a process pool, so parsing is not serialized by the GIL
+    - processes == 0: pages are parsed inline and submit() returns a finished future
+    Use as a context manager; the pool is shut down on exit.
+    """
+
+    def __init__(self, processes: Optional[int] = None, fields: Iterable[str] = (),
+                 keywords: Iterable[str] = ()):
+        if processes is None:
+            processes = os.cpu_count() or 1
+        self.processes = processes
+        self._parse = partial(parse_details, fields=tuple(fields), keywords=tuple(keywords))
+        self._pool = None
+
+        if self.processes > 0:
+            from concurrent.futures import ProcessPoolExecutor
+
+            self._pool = ProcessPoolExecutor(max_workers=self.processes)
+            # Start every worker now, from this thread: forking later from a
+            # fetch thread would copy a process that has other threads running
+            warm_ups = [self._pool.submit(_warm_up) for _ in range(self.processes)]
+            for future in warm_ups:
+                future.result()
+            logger.info(f"Parsing detail pages on {self.processes} processes")
+
+    @classmethod
+    def for_pages(cls, count: int, processes: Optional[int] = None, fields: Iterable[str] = (),
+                  keywords: Iterable[str] = ()) -> "DetailParser":
+        """Pool for a batch of `count` pages, inline when the batch is small"""
+        return cls(processes if count >= INLINE_BELOW else 0, fields, keywords)
+
+    def submit(self, page: bytes) -> Future:
+        """Future of parse_details(page) for the parser's fields"""
+        if self._pool is not None:
+            return self._pool.submit(self._parse, page)
+
+        future = Future()
+        try:
+            future.set_result(self._parse(page))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
@@ -0,0 +1,153 @@
+# src/housewatch/scraper/distributed.py
+
+import logging
+import time
+from dataclasses import dataclass, fields
+from typing import List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from housewatch.models.house import House
+from housewatch.storage.job_queue import JobQueue
+from housewatch.utils.deadline import BudgetExceeded
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class DistributedSettings:
+    """Tuning knobs, loaded from app.distributed"""
+    queue_path: str = "data/jobs.sqlite"   # relative to the project root
+    lease_seconds: float = 300.0           # must cover fetching one batch
+    batch_size: int = 8                    # jobs leased at a time per worker
+    max_attempts: int = 3                  # expired leases before a job fails
+    poll_seconds: float = 2.0
+    wait_timeout_minutes: float = 30.0     # coordinator stops waiting after this
+    idle_exit_seconds: float = 30.0        # `worker --once`: exit after the queue is empty this long
+
+    @classmethod
+    def from_config(cls, cfg: Optional[dict]) -> "DistributedSettings":
+        cfg = cfg or {}
+        known = {f.name for f in fields(cls)}
+        return cls(**{k: v for k, v in cfg.items() if k in known})
+
+
+class QueueDispatcher:
+    """
+    Coordinator side: a drop-in for the scraper's own detail fetcher that
+    puts the houses in the job queue and waits for workers to finish them.
+    Returns the same (details, failed); houses no worker finished before
+    the timeout (or the run's details budget) are in neither list, so they
+    stay unseen for the next run.
+    """
+
+    def __init__(self, queue: JobQueue, settings: Optional[DistributedSettings] = None,
+                 clock=time.monotonic, sleep=time.sleep, budget=None):
+        self.queue = queue
+        self.settings = settings or DistributedSettings()
+        self.budget = budget    # utils.deadline.RunBudget of the coordinator's run
+        self._clock = clock
+        self._sleep = sleep
+
+    def __call__(self, houses) -> Tuple[List[Tuple[House, dict]], List[Tuple[House, str]]]:
+        houses = list(houses)
+        if not houses:
+            return [], []
+
+        run_id = self.queue.start_run(houses)
+        logger.info(f"Queued {len(houses)} detail fetches for workers (run {run_id[:8]})")
+
+        deadline = self._clock() + self.settings.wait_timeout_minutes * 60
+        last_report = None
+        while True:
+            counts = self.queue.counts(run_id)
+            open_jobs = counts["pending"] + counts["leased"]
+            if open_jobs == 0:
+                break
+            if self._clock() >= deadline:
+                logger.warning(f"{open_jobs} detail fetches unfinished after "
+                               f"{self.settings.wait_timeout_minutes:g} min; left for the next run")
+                break
+            if self.budget is not None and self.budget.current.expired():
+                self.budget.exceeded(BudgetExceeded(self.budget.current.stage))
+                logger.warning(f"{open_jobs} detail fetches unfinished; left for the next run")
+                break
+            if counts != last_report:
+                logger.info(f"Workers: {counts['done']} done, {counts['failed']} failed, "
+                            f"{counts['leased']} leased, {counts['pending']} pending")
+                last_report = counts
+            self._sleep(self.settings.poll_seconds)
+
+        results = self.queue.results(run_id)
+        self.queue.finish_run(run_id)
+
+        details, failed = [], []
+        for house in houses:
+            state, result = results.get(str(house.listing_id), (None, None))
+            if state == "done":
+                house.details = result.get("details")
+                details.append((house, result["schools"]))
+            elif state == "failed":
+                failed.append((house, result))
+        return details, failed
+
+
+class Worker:
+    """
+    Worker side: lease a batch, enrich it with the scraper's own detail
+    pipeline (paced by this host's rate controller), write the results
+    back, repeat.
+    """
+
+    def __init__(self, scraper, queue: JobQueue, worker_id: str,
+                 settings: Optional[DistributedSettings] = None, sleep=time.sleep):
+        self.scraper = scraper
+        self.queue = queue
+        self.worker_id = worker_id
+        self.settings = settings or DistributedSettings()
+        self._sleep = sleep
+        self.completed = 0
+        self.failed = 0
+
+    def run(self, once: bool = False) -> None:
+        """Work until interrupted; with once, return when the queue stays empty"""
+        s = self.settings
+        idle_since = None
+        logger.info(f"Worker {self.worker_id} polling {self.queue.path}")
+
+        while True:
+            batch = self.queue.lease(self.worker_id, s.batch_size, s.lease_seconds, s.max_attempts)
+            if not batch:
+                now = time.monotonic()
+                idle_since = idle_since or now
+                if once and self.queue.idle() and now - idle_since >= s.idle_exit_seconds:
+                    logger.info(f"Worker {self.worker_id}: queue empty, "
+                                f"{self.completed} done, {self.failed} failed")
+                    return
+                self._sleep(s.poll_seconds)
+                continue
+
+            idle_since = None
+            self.work(batch)
+
+    def work(self, batch: List[Tuple[int, House]]) -> None:
+        jobs = {id(house): job_id for job_id, house in batch}
+        details, failed = self.scraper.enrich([house for _, house in batch])
+
+        for house, schools in details:
+            result = {"schools": schools, "details": house.details}
+            if self.queue.complete(jobs.pop(id(house)), self.worker_id, result):
+                self.completed += 1
+        for house, reason in failed:
+            if self.queue.fail(jobs.pop(id(house)), self.worker_id, reason):
+                self.failed += 1
+        self.scraper.rate.save()
+
+        # Not attempted: this host's circuit opened. Give the jobs to other
+        # workers and sit out the pause.
+        if jobs:
+            self.queue.release(jobs.values(), self.worker_id)
+            host = urlsplit(batch[0][1].url).hostname
+            pause = self.scraper.rate.paused_for(host)
+            logger.warning(f"Worker {self.worker_id} paused for {pause:.0f}s, "
+                           f"released {len(jobs)} jobs")
+            self._sleep(max(pause, self.settings.poll_seconds))
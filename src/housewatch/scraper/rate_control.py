@@ -0,0 +1,199 @@
+# src/housewatch/scraper/rate_control.py
+
+import json
+import logging
+import random
+import threading
+import time
+from dataclasses import dataclass, fields
+from pathlib import Path
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Responses that mean "slow down": shrink the rate and honour Retry-After
+THROTTLE_STATUSES = {403, 429, 503}
+# Transient server errors: retried with backoff, rate unchanged
+RETRY_STATUSES = THROTTLE_STATUSES | {500, 502, 504}
+
+
+class CircuitOpenError(Exception):
+    """Raised when a host's circuit breaker is open and requests are paused"""
+
+    def __init__(self, host: str, seconds_left: float):
+        super().__init__(f"circuit open for {host}, paused for another {seconds_left:.0f}s")
+        self.host = host
+        self.seconds_left = seconds_left
+
+
+@dataclass
+class RateSettings:
+    """Tuning knobs, loaded from app.rate_limit"""
+    initial_rps: float = 1.0
+    min_rps: float = 0.1
+    max_rps: float = 2.0
+    increase_rps: float = 0.05
+    decrease_factor: float = 0.5
+    max_retries: int = 3
+    backoff_base: float = 2.0
+    backoff_max: float = 60.0
+    breaker_threshold: int = 3
+    breaker_cooldown: float = 1800.0
+
+    @classmethod
+    def from_config(cls, cfg: Optional[dict]) -> "RateSettings":
+        cfg = cfg or {}
+        known = {f.name for f in fields(cls)}
+        return cls(**{k: v for k, v in cfg.items() if k in known})
+
+
+class _HostState:
+    __slots__ = ("rate", "next_slot", "throttled_in_row", "open_until")
+
+    def __init__(self, rate: float):
+        self.rate = rate
+        self.next_slot = 0.0          # monotonic time of the next allowed request
+        self.throttled_in_row = 0
+        self.open_until = 0.0         # wall-clock time, survives restarts
+
+
+class AdaptiveRateController:
+    """
+    Per-host request pacing with AIMD on the request rate:
+    - every success adds `increase_rps`, every throttle multiplies by `decrease_factor`
+    - Retry-After pushes the next allowed request out
+    - `breaker_threshold` throttles in a row open the host's circuit for
+      `breaker_cooldown` seconds; acquire() then raises CircuitOpenError
+    - a Retry-After longer than `backoff_max` opens the circuit for that
+      long instead of blocking a fetch thread
+    Learned rates and open circuits are persisted in `state_path` if given.
+    """
+
+    def __init__(self, settings: Optional[RateSettings] = None, state_path: Optional[Path] = None,
+                 clock=time.monotonic, wall_clock=time.time, sleep=time.sleep):
+        self.settings = settings or RateSettings()
+        self.state_path = Path(state_path) if state_path else None
+        self._clock = clock
+        self._wall_clock = wall_clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._hosts: Dict[str, _HostState] = {}
+        self._load()
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def acquire(self, host: str) -> None:
+        """Block until the next request to host is allowed"""
+        with self._lock:
+            state = self._host(host)
+            seconds_left = state.open_until - self._wall_clock()
+            if seconds_left > 0:
+                raise CircuitOpenError(host, seconds_left)
+
+            now = self._clock()
+            wait = max(0.0, state.next_slot - now)
+            state.next_slot = max(now, state.next_slot) + 1.0 / state.rate
+
+        if wait > 0:
+            self._sleep(wait)
+
+    def on_response(self, host: str, status: int, retry_after: Optional[str] = None) -> float:
+        """
+        Feed a response back; returns the delay to wait before retrying, in
+        seconds (0 if the server asked for none), at most `backoff_max`
+        """
+        delay = parse_retry_after(retry_after, self._wall_clock()) if retry_after else 0.0
+        s = self.settings
+
+        with self._lock:
+            state = self._host(host)
+            if status in RETRY_STATUSES and delay > s.backoff_max:
+                # Longer than a retry should wait: pause the host instead
+                state.open_until = max(state.open_until, self._wall_clock() + delay)
+                logger.warning(f"{host}: asked to retry after {delay:.0f}s, pausing the host")
+                delay = s.backoff_max
+            if status in THROTTLE_STATUSES:
+                state.rate = max(s.min_rps, state.rate * s.decrease_factor)
+                state.throttled_in_row += 1
+                if delay:
+                    state.next_slot = max(state.next_slot, self._clock() + delay)
+                if state.throttled_in_row >= s.breaker_threshold:
+                    pause = max(s.breaker_cooldown, state.open_until - self._wall_clock())
+                    state.open_until = self._wall_clock() + pause
+                    logger.warning(f"{host}: throttled {state.throttled_in_row}x in a row, "
+                                   f"pausing for {pause:.0f}s")
+            elif status < 500:
+                state.rate = min(s.max_rps, state.rate + s.increase_rps)
+                state.throttled_in_row = 0
+
+        return delay
+
+    def backoff(self, attempt: int) -> float:
+        """Jittered exponential delay before retry number `attempt` (1-based)"""
+        cap = min(self.settings.backoff_max, self.settings.backoff_base * 2 ** (attempt - 1))
+        return random.uniform(cap / 2, cap)
+
+    def wait(self, seconds: float) -> None:
+        if seconds > 0:
+            self._sleep(seconds)
+
+    def rate(self, host: str) -> float:
+        with self._lock:
+            return self._host(host).rate
+
+    def paused_for(self, host: str) -> float:
+        """Seconds until host's circuit closes (0 when requests are allowed)"""
+        with self._lock:
+            return max(0.0, self._host(host).open_until - self._wall_clock())
+
+    def save(self) -> None:
+        """Persist learned rates and open circuits"""
+        if self.state_path is None:
+            return
+        with self._lock:
+            data = {host: {"rate": st.rate, "open_until": st.open_until}
+                    for host, st in self._hosts.items()}
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.state_path, "w", encoding="utf-8") as f:
+            json.dump({"hosts": data}, f, indent=2)
+
+    # ------------------------------------------------------------------
+    # Internal helpers
+    # ------------------------------------------------------------------
+
+    def _host(self, host: str) -> _HostState:
+        state = self._hosts.get(host)
+        if state is None:
+            state = self._hosts[host] = _HostState(self.settings.initial_rps)
+        return state
+
+    def _load(self) -> None:
+        if self.state_path is None or not self.state_path.exists():
+            return
+        try:
+            with open(self.state_path, "r", encoding="utf-8") as f:
+                hosts = json.load(f).get("hosts", {})
+        except (json.JSONDecodeError, IOError) as e:
+            logger.warning(f"Ignoring unreadable rate state {self.state_path}: {e}")
+            return
+
+        s = self.settings
+        for host, saved in hosts.items():
+            state = self._host(host)
+            state.rate = min(s.max_rps, max(s.min_rps, float(saved.get("rate", s.initial_rps))))
+            state.open_until = float(saved.get("open_until", 0.0))
+
+
+def parse_retry_after(value: str, now: float) -> float:
+    """Retry-After is either delta-seconds or an HTTP date"""
+    from email.utils import parsedate_to_datetime
+
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - now)
+    except (TypeError, ValueError):
+        return 0.0
@@ -1,18 +1,42 @@
 # src/housewatch/scraper/redfin_scraper.py
 
-import requests
-import re
 import json
 import logging
+import threading
 import time
-from typing import List
-from bs4 import BeautifulSoup
+from contextlib import contextmanager
+from datetime import datetime
+from typing import List, Optional, Tuple
+from urllib.parse import urlsplit
+
+# requests and bs4/lxml (in detail_parser) are imported on first use: a cron run that finds
+# nothing new never parses HTML, and report commands never touch the network
 
 from housewatch.models.house import House
+from housewatch.models.house_batch import HouseBatch
+from housewatch.scraper.detail_parser import DetailParser
+from housewatch.scraper.rate_control import (
+    RETRY_STATUSES,
+    AdaptiveRateController,
+    CircuitOpenError,
+    RateSettings,
+)
+from housewatch.scraper.search_stream import iter_search_homes
 from housewatch.storage.json_storage import HouseStorage
+from housewatch.storage.timeseries import record_search_homes
+from housewatch.utils.deadline import BudgetExceeded, RunBudget
+from housewatch.utils.profiling import NullProfiler
+from housewatch.utils.tracing import NullTracer
 
 logger = logging.getLogger(__name__)
 
+# Read size for streamed response bodies
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# Incremental search: older-than-watermark homes in a row before a region
+# stops being read (a few, in case the sort order is not exact)
+STOP_AFTER_OLD = 3
+
 
 SYSTEM_PARAMS = {
     "al": 1, # Acess/Anonymouse level -- default (no change needed)
@@ -81,7 +105,7 @@ def build_params(app_cfg, criteria_cfg, region_id_override=None):
             params["region_type"] = loc["region_type"]
         # Handle coordinate search
         elif loc.get("latitude"):
-            params.update(_build_bbox)
+            params.update(_build_bbox(loc))
     
     # Schools Logic (Internal API specific)
     if "schools" in active_modules and "schools" in criteria_cfg:
@@ -94,16 +118,71 @@ def build_params(app_cfg, criteria_cfg, region_id_override=None):
 
 
 
+class _ByteCounter:
+    """Pass-through iterator over body chunks that counts bytes read"""
+
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self.total = 0
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> bytes:
+        chunk = next(self._chunks)
+        self.total += len(chunk)
+        return chunk
+
+
 class RedfinScraper:
 
-    BASE_URL = "https://www.redfin.com/stingray/api/gis"
+    SITE_URL = "https://www.redfin.com"
+    BASE_URL = f"{SITE_URL}/stingray/api/gis"
 
-    def __init__(self, config, storage: HouseStorage):
+    def __init__(self, config, storage: Optional[HouseStorage], profiler=None, tracer=None,
+                 rate_controller: AdaptiveRateController = None, priors=None, retry_queue=None,
+                 scheduler=None, detail_fetcher=None, cassette=None, listing_store=None,
+                 ranker=None, budget: RunBudget = None, price_history=None):
         # API Core Parameters
         self.config = config
         self.storage = storage
+        self.profiler = profiler or NullProfiler()
+        self.tracer = tracer or NullTracer()
+        self.priors = priors    # storage.priors.MatchPriors, None: fetch every new house
+        self.retry_queue = retry_queue    # storage.retry_queue.RetryQueue, None: retry every run
+        self.scheduler = scheduler    # scraper.schedule.RegionScheduler, None: poll every region
+        # houses -> (details, failed); scraper.distributed.QueueDispatcher hands
+        # the pages to workers on other hosts. None: fetch them here.
+        self.detail_fetcher = detail_fetcher or self._fetch_all_details
+        # scraper.cassette.Cassette: record every response, or replay them with no network
+        self.cassette = cassette
+        self.listing_store = listing_store    # storage.listing_store.ListingStore, None: not kept
+        self.ranker = ranker    # filters.ranking.Ranker: learns local prices from the search results
+        self.price_history = price_history    # storage.timeseries.PriceHistory, None: not sampled
+        # Stage deadlines: search stops taking regions and the detail stage
+        # stops taking houses once theirs expires. Default: no limits
+        self.budget = budget or RunBudget()
+        self._searched_regions = {}
+        self._deferred_ids = set()    # skipped by the priors this run: unseen, not pending
+        self.rate = rate_controller or AdaptiveRateController(
+            RateSettings.from_config(config.app.get("rate_limit"))
+        )
         self.timeout = config.app.get("timeout", 10)
 
+        details = config.app.get("details", {})
+        self.fetch_workers = details.get("fetch_workers", 4)
+        self.parse_workers = details.get("parse_workers")  # None: one per core
+        # Extra detail-page fields, read in the same parse as the schools:
+        # the ones configured for display plus the ones the criteria need
+        enrichment = config.app.get("enrichment", {})
+        matcher = config.compiled.details
+        self.enrich_fields = tuple(sorted(
+            set(enrichment.get("fields") or ()) | (matcher.fields if matcher is not None else set())))
+        self.enrich_keywords = tuple(dict.fromkeys(
+            tuple(enrichment.get("keywords") or ()) + (matcher.keywords if matcher is not None else ())))
+        # geo.school_zones.SchoolZoneIndex, loaded on first use (False: unavailable)
+        self._school_zones = None
+
         self.headers = {
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
             "Accept": "application/json",
@@ -114,97 +193,335 @@ class RedfinScraper:
     # Public API
     # ------------------------------------------------------------------
 
-    def fetch(self) -> List[House]:
+    def fetch(self) -> HouseBatch:
         """
         Fetch listings and then fetch details for each to get schools/HOA.
         """
         logger.info("Fetching search results from Redfin API")
 
-        raw_data = self._request_search()
-        basic_houses = self._parse_search(raw_data)
+        with self._stage("search"):
+            raw_data = self._request_search()
+        with self._stage("parse"):
+            basic_houses = self._parse_search(raw_data)
 
         logger.info(f"Redfin fetch houses: {len(basic_houses)}")
         
-        new_houses = [h for h in basic_houses if self.storage.is_new(h)]
-
-        full_houses = []
-        count = 0
-        for house in new_houses:
-            count += 1
-            # Visit the detail page to get Schools and HOA
-            logger.info(f"Fetching deep details for ({count}/{len(new_houses)}): "
-                        f"{house.address}, {house.city}, {house.state} {house.zip_code}")
-
-            # Here only for schools
-            schools = self._fetch_details(house.url)
-            
-            # Apply schools filtration
-            if not self._schools_match_criteria(schools):
-                continue
-
-            house.schools = schools
+        new_houses = self.storage.select_new(basic_houses)
+        # An overlapping run may be fetching some of them already
+        new_houses = self.storage.claim(new_houses)
+
+        # Schools from local attendance zones where the answer is certain;
+        # priors drop houses in cells that never match and order the rest
+        # by match likelihood, with due retries ahead of them; those pages
+        # are downloaded on I/O threads and parsed on a process pool
+        with self._stage("details", houses=len(new_houses)):
+            details, to_fetch = self._resolve_schools_offline(new_houses)
+            skipped = []
+            if self.priors is not None:
+                to_fetch, skipped = self.priors.plan(to_fetch)
+            if self.retry_queue is not None:
+                to_fetch = self.retry_queue.plan(to_fetch)
+            fetched, failed = self.detail_fetcher(to_fetch)
+            details += fetched
+            if self.listing_store is not None:
+                self.listing_store.set_schools(
+                    (house, schools) for house, schools in details if any(schools.values()))
+
+        # Only houses evaluated with real detail data are marked seen. Failed
+        # and partial fetches go to the retry queue and stay new; so do houses
+        # skipped by an open circuit, and by the priors: those are planned
+        # again by later runs (and kept in the listing store for reevaluate)
+        self._deferred_ids = {str(house.listing_id) for house in skipped}
+        evaluated = []
+        full_houses = HouseBatch()
+        with self._stage("filter"):
+            for house, schools in details:
+                if not any(schools.values()):
+                    failed.append((house, "no school data on the page"))
+                    continue
+                evaluated.append(house)
+                if self.retry_queue is not None:
+                    self.retry_queue.record_success(house)
+                # Apply schools and detail-field filtration
+                matched = self._schools_match_criteria(schools) and self._details_match_criteria(house)
+                if self.priors is not None:
+                    self.priors.record(house, matched)
+                if not matched:
+                    continue
 
-            full_houses.append(house)
-            time.sleep(1) # Avoid gettinb blocked
+                house.schools = schools
+                full_houses.append(house)
+
+        for house, reason in failed:
+            if self.retry_queue is not None and self.retry_queue.record_failure(house, reason):
+                evaluated.append(house)    # given up on: stop looking at it
+
+        # Mark evaluated houses as "seen"
+        with self._stage("storage"):
+            self.storage.make_multiple_as_seen(evaluated)
+            if self.listing_store is not None:
+                self.listing_store.mark_matched(full_houses)
+            self._update_watermarks(basic_houses)
+            self.storage.save_seen()
+            self.storage.release_claims()
+            self.rate.save()
+            if self.priors is not None:
+                self.priors.save()
+            if self.retry_queue is not None:
+                self.retry_queue.save()
+            if self.scheduler is not None:
+                self.scheduler.save()
+            if self.price_history is not None:
+                self.price_history.flush()
 
-        # Mark all new_houses as "seen"
 
-        self.storage.make_multiple_as_seen(new_houses)
-        self.storage.save_seen()
+        return full_houses
 
 
-        return full_houses
+    def enrich(self, houses) -> Tuple[List[Tuple[House, dict]], List[Tuple[House, str]]]:
+        """
+        Schools of houses outside a normal run (workers, reevaluation): from
+        the school-zone index where it is certain, otherwise from their detail
+        pages fetched here, with enrichment fields in house.details.
+        Returns (details, failed) like the detail stage; houses cut off by an
+        open circuit or the time budget are in neither list.
+        """
+        resolved, to_fetch = self._resolve_schools_offline(houses)
+        fetched, failed = self._fetch_all_details(to_fetch)
+        return resolved + fetched, failed
     
 
     # ------------------------------------------------------------------
     # Internal helpers
     # ------------------------------------------------------------------
 
+    @contextmanager
+    def _stage(self, name: str, **attrs):
+        """Profile and trace one pipeline stage, under its time budget"""
+        with self.profiler.stage(name), self.tracer.span(name, kind="stage", **attrs), self.budget.stage(name):
+            yield
+
+
+    def _get(self, url: str, params: dict = None, timeout: float = None, consume=None):
+        """
+        GET paced by the adaptive rate controller, with jittered exponential
+        retries on throttling/server errors and one trace span per attempt.
+        With `consume`, the body is streamed: consume(chunks) runs inside the
+        span and its result is returned instead of the response.
+        With a cassette, responses are recorded, or replayed unpaced.
+        Timeouts and retry waits are cut to the current stage's time budget.
+        Raises CircuitOpenError when the host is paused, BudgetExceeded when
+        the budget is used up before an attempt, and requests' HTTPError for
+        an error status once retries are used up.
+        """
+        import requests
+
+        host = urlsplit(url).hostname
+        attempts = self.rate.settings.max_retries + 1
+        replaying = self.cassette is not None and self.cassette.replaying
+
+        for attempt in range(1, attempts + 1):
+            if not replaying:
+                self.rate.acquire(host)
+            # After the pacing wait, which may have used up the budget
+            deadline = self.budget.current
+            attempt_timeout = deadline.timeout(timeout or self.timeout)
+            last = attempt == attempts or replaying    # a replay gives the same answer again
+
+            with self.tracer.span("GET", kind="http", host=host,
+                                  path=urlsplit(url).path, attempt=attempt) as span:
+                try:
+                    if replaying:
+                        resp = self.cassette.replay(url, params)
+                    else:
+                        resp = requests.get(
+                            url,
+                            headers=self.headers,
+                            params=params,
+                            timeout=attempt_timeout,
+                            stream=consume is not None
+                        )
+                        if self.cassette is not None:
+                            resp = self.cassette.record(url, params, resp)
+                except (requests.ConnectionError, requests.Timeout):
+                    if deadline.expired():
+                        # Cut short by the budget, not a failure of the host
+                        raise BudgetExceeded(deadline.stage) from None
+                    if last:
+                        raise
+                    span.set(retry=True)
+                    self.rate.wait(min(self.rate.backoff(attempt), deadline.remaining()))
+                    continue
+
+                span.set(status=resp.status_code)
+                delay = self.rate.on_response(host, resp.status_code, resp.headers.get("Retry-After"))
+
+                if resp.status_code in RETRY_STATUSES and not last:
+                    resp.close()
+                    paused = self.rate.paused_for(host)
+                    if paused > 0:
+                        # No point waiting for a retry the breaker will refuse
+                        raise CircuitOpenError(host, paused)
+                    span.set(retry=True)
+                    self.rate.wait(min(max(delay, self.rate.backoff(attempt)), deadline.remaining()))
+                    continue
+
+                if consume is None:
+                    span.set(bytes=len(resp.content))
+                    resp.raise_for_status()
+                    return resp
+
+                with resp:
+                    resp.raise_for_status()
+                    counter = _ByteCounter(resp.iter_content(chunk_size=STREAM_CHUNK_SIZE))
+                    try:
+                        return consume(counter)
+                    finally:
+                        span.set(bytes=counter.total)
+
+
     def _request_search(self) -> dict:
         """
         Perform HTTP request to Redfin API.
+        Regions with a watermark are searched newest-first and read only up
+        to the watermark; a periodic full sweep reads everything again.
         """
-        loc = self.config.criteria.get("location", {})
-        region_ids = loc.get("region_ids", [])
-
-        if not region_ids:
-            single_region_id = loc.get("region_id")
-            if single_region_id:
-                region_ids = [single_region_id]
-            elif not loc.get("latitude"):
-                raise ValueError("No region_ids, region_id, or coordinates provided in criteria")
-        
-        all_homes = []
+        import requests
+
+        compiled = self.config.compiled
+        region_ids = compiled.region_ids
+
+        if region_ids == (None,) and not self.config.criteria.get("location", {}).get("latitude"):
+            raise ValueError("No region_ids, region_id, or coordinates provided in criteria")
         
+        # Only regions whose polling interval has elapsed
+        if self.scheduler is not None:
+            due = set(self.scheduler.due(self._region_key(r) for r in region_ids))
+            region_ids = [r for r in region_ids if self._region_key(r) in due]
+
+        # Deduplicated while streaming: only slimmed homes are kept
+        seen = {}
+        now = time.time()
+        # region key -> ([(listing_id, listed_at)], full sweep?) for regions searched successfully
+        self._searched_regions = {}
+
         for region_id in region_ids:
-            params = build_params(self.config.app, self.config.criteria, region_id_override=region_id)
+            params, stop_before = self._search_plan(region_id, now)
+            listings = []
             try:
-                resp = requests.get(
-                    self.BASE_URL,
-                    headers=self.headers,
-                    params=params,
-                    timeout=self.timeout
-                )
-                #print("request url:\n", resp.url)
-                content = resp.text.replace("{}&&", "", 1) if resp.text.startswith("{}&&") else resp.text
-                data = json.loads(content)
-                homes = data.get("payload", {}).get("homes", [])
-                all_homes.extend(homes)
-            except requests.RequestException as e:
+                with self.tracer.span("region", kind="stage", region_id=region_id,
+                                      mode="full" if stop_before is None else "incremental") as span:
+                    count = self._get(self.BASE_URL, params=params,
+                                      consume=lambda chunks: self._collect_homes(
+                                          chunks, seen, now, listings, stop_before))
+                    span.set(homes=count)
+                    logger.debug(f"region_id={region_id}: {count} homes")
+                self._searched_regions[self._region_key(region_id)] = (listings, stop_before is None)
+                if self.scheduler is not None:
+                    self.scheduler.observe(self._region_key(region_id), (t for _, t in listings))
+            except CircuitOpenError as e:
+                logger.warning(f"Search paused ({e}); skipping remaining regions")
+                break
+            except BudgetExceeded as e:
+                self.budget.exceeded(e)
+                logger.warning("Skipping the remaining regions until the next run")
+                break
+            except (requests.RequestException, ValueError):
                 logger.exception(f"Redfin request failed for region_id={region_id}")
                 continue  # move to next region_id
         
-        # Remove duplications
-        seen = {}
-        for h in all_homes:
+        return {"payload": {"homes": list(seen.values())}}
+
+
+    @staticmethod
+    def _region_key(region_id) -> str:
+        return str(region_id) if region_id is not None else "bbox"
+
+
+    def _search_plan(self, region_id, now: float):
+        """(request params, stop_before) for a region; stop_before is None for a full sweep"""
+        params = self.config.compiled.search_params[region_id]
+        incremental = self.config.app["redfin"].get("incremental") or {}
+        state = self.storage.get_watermark(self._region_key(region_id))
+
+        sweep_due = now - state.get("last_full_sweep", 0) >= incremental.get("full_sweep_hours", 24) * 3600
+        if not incremental.get("enabled") or state.get("newest_listed_at") is None or sweep_due:
+            return params, None
+
+        margin = incremental.get("margin_minutes", 60) * 60
+        params = {**params, "ord": incremental.get("order", "days-on-redfin-asc")}
+        return params, state["newest_listed_at"] - margin
+
+
+    @staticmethod
+    def _collect_homes(chunks, seen: dict, now: float = None, listings: list = None,
+                       stop_before: float = None) -> int:
+        """
+        Decode homes from a streamed search body into `seen` (propertyId -> home),
+        adding listedAt (epoch seconds, from timeOnRedfin) and appending
+        (listing_id, listedAt) to `listings`. With stop_before, reading stops
+        after STOP_AFTER_OLD homes in a row listed before it, unless the
+        response turns out not to be newest-first.
+        """
+        now = now or time.time()
+        count = 0
+        old_in_row = 0
+        previous = None
+        ordered = True
+        for h in iter_search_homes(chunks):
+            count += 1
+            time_on = (h.get("timeOnRedfin") or {}).get("value")
+            listed_at = now - time_on / 1000 if isinstance(time_on, (int, float)) else None
+            h["listedAt"] = listed_at
+
             key = h.get("propertyId") or h.get("listingId")
             if key:
                 seen[key] = h
-        
-        return {"payload": {"homes": list(seen.values())}}
+            if listings is not None:
+                listings.append((str(h.get("listingId", "")), listed_at))
+
+            if stop_before is None or listed_at is None:
+                continue
+            if previous is not None and listed_at > previous + 1:
+                ordered = False    # not newest-first: read the whole region
+            previous = listed_at
+            old_in_row = old_in_row + 1 if listed_at < stop_before else 0
+            if ordered and old_in_row >= STOP_AFTER_OLD:
+                break
+        return count
+
+
+    def _update_watermarks(self, candidates: HouseBatch) -> None:
+        """
+        Move each searched region's watermark to its newest listing, but not
+        past the oldest candidate that is still unseen (failed or skipped
+        detail fetch), so the incremental search keeps returning it. Such
+        a region is also polled again after the minimum interval. Houses the
+        priors skipped do not hold it back: they are found again by the next
+        full sweep.
+        """
+        pending_ids = {
+            str(listing_id) for listing_id in candidates.column("listing_id")
+            if str(listing_id) not in self.storage.seen_houses
+            and str(listing_id) not in self._deferred_ids
+        }
+        now = time.time()
+        for region, (listings, full_sweep) in self._searched_regions.items():
+            times = [listed_at for _, listed_at in listings if listed_at is not None]
+            previous = self.storage.get_watermark(region).get("newest_listed_at")
+            if not times and previous is None:
+                continue
+
+            newest = max(times + ([previous] if previous is not None else []))
+            pending = [listed_at for listing_id, listed_at in listings
+                       if listing_id in pending_ids and listed_at is not None]
+            watermark = min(newest, min(pending) - 1) if pending else newest
+            if pending and self.scheduler is not None:
+                self.scheduler.expedite(region)
+            self.storage.set_watermark(region, watermark, full_sweep_at=now if full_sweep else None)
 
     
-    def _parse_search(self, data: dict) -> List[House]:
+    def _parse_search(self, data: dict) -> HouseBatch:
         """
         Convert Redfin JSON payload into House models.
         """
@@ -212,7 +529,15 @@ class RedfinScraper:
         homes = payload.get("homes", [])
         logger.info(f"Redfin returned {len(homes)} homes (before applying filtration)")
 
-        results: List[House] = []
+        results = HouseBatch()
+        plan = self.config.compiled.plan
+        # Every home in the region, for the listing store and the ranker's
+        # market prices, whether or not it is in criteria or new
+        keep_parsed = self.listing_store is not None or self.ranker is not None
+        parsed = []
+
+        if self.price_history is not None:
+            record_search_homes(self.price_history, homes)
 
 
         for h in homes:
@@ -222,33 +547,29 @@ class RedfinScraper:
             """Homes from request does not apply any filtration. The following will do."""
 
             state = h.get("state", "")
-            if state !=  self.config.criteria["location"].get("state", "IL"):
+            if state != plan.state:
                 continue
 
             if h.get('propertyType') and h.get('propertyType') != 6: # 6 for API House
                  continue
             
-            property_type = self.config.criteria["property"].get("type", "Single Family")
+            property_type = plan.property_type
 
             if "/unit-" in h.get('url', ""):
                 continue
             
             price = h.get("price", {}).get("value", 0)
-            if (price < self.config.criteria["property"].get("min_price", 0) or
-                price > self.config.criteria["property"].get("max_price", 1500000)):
-                continue
-            
             year_built = h.get("yearBuilt", {}).get("value", 0)
-            if year_built < self.config.criteria["property"].get("min_year_built", 1980):
-                continue
-
             hoa = h.get("hoa", {}).get("value", 0.)
-            if (hoa > self.config.criteria["property"].get("hoa_fee", 0.)):
+            # Outside the thresholds: only kept in the listing store, for reevaluation
+            in_criteria = (plan.min_price <= price <= plan.max_price
+                           and year_built >= plan.min_year_built and hoa <= plan.max_hoa)
+            if not in_criteria and not keep_parsed:
                 continue
-            
 
             sqft = h.get("sqFt", {}).get("value", 0)
             lot_size = h.get("lotSize", {}).get("value", 0)
+            lat_long = h.get("latLong", {}).get("value", {})
 
 
             #print("\nhouse full info:\n", h)
@@ -269,8 +590,16 @@ class RedfinScraper:
                     city=h.get("city"),
                     state=state,
                     zip_code=h.get("zip"),
-                    url=f"https://www.redfin.com{h.get('url')}"
+                    url=f"{self.SITE_URL}{h.get('url')}",
+                    neighborhood=h.get("location", {}).get("value"),
+                    listed_date=datetime.fromtimestamp(h["listedAt"]) if h.get("listedAt") else None,
+                    latitude=lat_long.get("latitude"),
+                    longitude=lat_long.get("longitude"),
                 )
+                if keep_parsed:
+                    parsed.append(house)
+                if not in_criteria:
+                    continue
                 # Check if house is new
                 if self.storage.is_new(house):
                     results.append(house)
@@ -283,65 +612,136 @@ class RedfinScraper:
                     h.get("propertyId"),
                 )
 
-        return results
-
-
-    def _fetch_details(self, url: str) -> dict:
-        """Visit property page to find more details, here only for schools"""
-        # Extract Schools
-        schools = {
-            "elementary": [],
-            "middle": [],
-            "high": []
-        }
-
-        try:
-            res = requests.get(url, headers=self.headers, timeout=10)
-            soup = BeautifulSoup(res.text, "lxml")
-
-            for item in soup.select(".schools-table .ListItem"):
-                name = item.select_one(".ListItem__heading")
-                #rating = item.select_one(".rating-num")
-                desc = item.select_one(".ListItem__description")
-
-                if not name or not desc:
-                    continue
-
-                name = name.get_text(strip=True) 
-                desc = desc.get_text(strip=True)
-
-                # Extract grade range: K-5, 6-8, 9-12
-                m = re.search(r"(K|\d+)\s*-\s*(\d+)", desc)
-                if not m:
-                    continue
-
-                start, end = m.group(1), int(m.group(2))
+        if self.listing_store is not None:
+            self.listing_store.upsert(parsed)
+        if self.ranker is not None:
+            self.ranker.observe_market(HouseBatch(parsed))
 
-                # Elementary
-                if start == "K" and end <= 5:
-                    schools["elementary"].append(name)
+        # Geometry constraints over the coordinate columns: rejected homes
+        # never reach the detail stage
+        geometry = self.config.compiled.geometry
+        if geometry is not None and len(results):
+            mask = geometry.mask(results.column("latitude"), results.column("longitude"))
+            kept = results.where(mask)
+            logger.info(f"Geometry filter kept {len(kept)}/{len(results)} homes")
+            results = kept
 
-                # Middle
-                elif start.isdigit() and 6 <= int(start) <= 8:
-                    schools["middle"].append(name)
+        return results
 
-                # High
-                elif end >= 9:
-                    schools["high"].append(name)
 
-        except Exception as e:
-            logger.warning(f"Could not fetch details for {url}: {e}")
-            
-        return schools
+    def _resolve_schools_offline(self, houses) -> Tuple[List[Tuple[House, dict]], List[House]]:
+        """
+        Split houses into (house, schools) resolved from the school-zone
+        index and houses whose detail page still has to be fetched.
+        """
+        houses = list(houses)
+        # Detail criteria need the page anyway
+        if not houses or not self.config.app.get("school_zones") or self.config.compiled.details is not None:
+            return [], houses
+
+        if self._school_zones is None:
+            from housewatch.geo.school_zones import SchoolZoneIndex
+            self._school_zones = SchoolZoneIndex.from_config(self.config.app["school_zones"]) or False
+        if not self._school_zones:
+            return [], houses
+
+        levels = tuple(self.config.compiled.schools.levels)
+        if not levels:
+            # Nothing to resolve: an empty result would count as "no school data"
+            return [], houses
+        resolved, to_fetch = [], []
+        for house in houses:
+            schools = self._school_zones.lookup(house.latitude, house.longitude, levels)
+            if schools is None:
+                to_fetch.append(house)
+            else:
+                resolved.append((house, schools))
+
+        logger.info(f"School zones resolved {len(resolved)}/{len(houses)} houses, "
+                    f"{len(to_fetch)} detail pages to fetch")
+        return resolved, to_fetch
+
+
+    def _fetch_all_details(self, houses) -> Tuple[List[Tuple[House, dict]], List[Tuple[House, str]]]:
+        """
+        Two-stage detail pipeline: `fetch_workers` threads download property
+        pages (paced by the rate controller) and hand the bytes to a
+        DetailParser, which parses them on other cores. Enrichment fields
+        from the same parse go to house.details.
+        Returns (details, failed): (house, schools) in listing order for every
+        page fetched and parsed, and (house, reason) for every failed attempt.
+        Stops submitting once the host's circuit opens or the stage's time
+        budget runs out; houses not attempted are in neither list.
+        """
+        from concurrent.futures import ThreadPoolExecutor
+
+        houses = list(houses)
+        stop = threading.Event()
+        parent = self.tracer.current()
+
+        with DetailParser.for_pages(len(houses), self.parse_workers,
+                                    self.enrich_fields, self.enrich_keywords) as parser:
+
+            def fetch_one(index: int, house: House):
+                if stop.is_set():
+                    return None
+                if self.budget.current.expired():
+                    stop.set()
+                    self.budget.exceeded(BudgetExceeded(self.budget.current.stage))
+                    return None
+                # Visit the detail page to get Schools
+                logger.info(f"Fetching deep details for ({index + 1}/{len(houses)}): "
+                            f"{house.address}, {house.city}, {house.state} {house.zip_code}")
+                try:
+                    page = self._fetch_page(house, parent)
+                except CircuitOpenError as e:
+                    if not stop.is_set():
+                        stop.set()
+                        logger.warning(f"Detail stage paused ({e}); "
+                                       f"remaining houses left for the next run")
+                    return None
+                except BudgetExceeded as e:
+                    stop.set()
+                    self.budget.exceeded(e)
+                    return None
+                except Exception as e:
+                    logger.warning(f"Could not fetch details for {house.url}: {e}")
+                    return f"fetch failed: {e}"
+                return parser.submit(page)
+
+            with ThreadPoolExecutor(max_workers=self.fetch_workers) as io_pool:
+                pending = [io_pool.submit(fetch_one, i, house) for i, house in enumerate(houses)]
+
+                details, failed = [], []
+                for house, fetched in zip(houses, pending):
+                    parsed = fetched.result()
+                    if parsed is None:
+                        continue
+                    if isinstance(parsed, str):
+                        failed.append((house, parsed))
+                        continue
+                    try:
+                        result = parsed.result()
+                        house.details = result["details"] or None
+                        details.append((house, result["schools"]))
+                    except Exception as e:
+                        logger.warning(f"Could not parse details for {house.url}: {e}")
+                        failed.append((house, f"parse failed: {e}"))
+
+        return details, failed
+
+
+    def _fetch_page(self, house: House, parent=None) -> bytes:
+        """Download one property page; errors (CircuitOpenError included) propagate"""
+        with self.tracer.span("detail", kind="stage", parent=parent, listing_id=house.listing_id):
+            return self._get(house.url, timeout=10).content
 
 
     def _schools_match_criteria(self, schools: dict[str, List[str]]) -> bool:
         """Check if house schools match criteria"""
+        return self.config.compiled.schools.matches(schools)
 
-        for level in ("elementary", "middle", "high"):
-            house_schools_set = set(schools.get(level, []))
-            criteria_schools_set = set(self.config.criteria["schools"].get(level, []))
 
-            if not house_schools_set & criteria_schools_set:
-                return False
-        return True
+    def _details_match_criteria(self, house: House) -> bool:
+        matcher = self.config.compiled.details
+        return matcher is None or matcher.matches(house.details)
@@ -0,0 +1,138 @@
+# src/housewatch/scraper/schedule.py
+
+import json
+import logging
+import time
+from dataclasses import dataclass, fields
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Window used to estimate a region's arrival rate on its first poll
+BOOTSTRAP_HOURS = 7 * 24
+# A region is due this early, so cron jitter does not push it a whole cycle
+DUE_SLACK_S = 120
+
+
+@dataclass
+class ScheduleSettings:
+    """Tuning knobs, loaded from app.schedule"""
+    enabled: bool = True
+    min_interval_minutes: float = 30.0
+    max_interval_hours: float = 24.0
+    target_new_per_poll: float = 1.0   # poll about once per this many new listings
+    smoothing: float = 0.3             # EWMA weight of the latest observation
+
+    @classmethod
+    def from_config(cls, cfg: Optional[dict]) -> "ScheduleSettings":
+        cfg = cfg or {}
+        known = {f.name for f in fields(cls)}
+        return cls(**{k: v for k, v in cfg.items() if k in known})
+
+
+class RegionScheduler:
+    """
+    Per-region polling intervals from observed listing velocity.
+    - observe(): new listings since the previous poll (by listing time) feed
+      an EWMA of arrivals per hour
+    - interval = target_new_per_poll / rate, clamped to [min, max]
+    - due(): regions whose interval has elapsed; unknown regions are always due
+    - expedite(): a region with unprocessed listings is due after the minimum interval
+    State is persisted as JSON: region -> rate_per_hour, last_polled, interval_s.
+    """
+
+    def __init__(self, settings: Optional[ScheduleSettings] = None, path: Optional[Path] = None,
+                 clock=time.time):
+        self.settings = settings or ScheduleSettings()
+        self.path = Path(path) if path else None
+        self.regions: Dict[str, dict] = {}
+        self._clock = clock
+        self._load()
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def due(self, regions: Iterable[str]) -> List[str]:
+        regions = list(regions)
+        if not self.settings.enabled:
+            return regions
+
+        now = self._clock()
+        due = [region for region in regions if self._next_poll(region) <= now + DUE_SLACK_S]
+        waiting = len(regions) - len(due)
+        if waiting:
+            next_at = min(self._next_poll(r) for r in regions if r not in due)
+            logger.info(f"Schedule: {len(due)}/{len(regions)} regions due, next in "
+                        f"{(next_at - now) / 60:.0f} min")
+        return due
+
+    def observe(self, region: str, listed_times: Iterable[Optional[float]]) -> None:
+        """Record a successful poll of region given the listing times it returned"""
+        now = self._clock()
+        s = self.settings
+        state = self.regions.get(region)
+        times = [t for t in listed_times if t is not None]
+
+        if state is None:
+            window_h = BOOTSTRAP_HOURS
+            since = now - window_h * 3600
+            rate = sum(1 for t in times if t >= since) / window_h
+        else:
+            window_h = max((now - state["last_polled"]) / 3600, 1e-3)
+            arrived = sum(1 for t in times if t > state["last_polled"])
+            rate = s.smoothing * (arrived / window_h) + (1 - s.smoothing) * state["rate_per_hour"]
+
+        self.regions[region] = {
+            "rate_per_hour": rate,
+            "last_polled": now,
+            "interval_s": self._interval(rate),
+        }
+
+    def expedite(self, region: str) -> None:
+        """Poll region again after min_interval_minutes: listings from it are still unprocessed"""
+        state = self.regions.get(region)
+        if state is not None:
+            state["backlog"] = True
+
+    def save(self) -> None:
+        if self.path is None:
+            return
+        data = {
+            "regions": self.regions,
+            "last_updated": datetime.now().isoformat(),
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+
+    # ------------------------------------------------------------------
+    # Internal helpers
+    # ------------------------------------------------------------------
+
+    def _interval(self, rate_per_hour: float) -> float:
+        s = self.settings
+        low, high = s.min_interval_minutes * 60, s.max_interval_hours * 3600
+        if rate_per_hour <= 0:
+            return high
+        return min(high, max(low, s.target_new_per_poll / rate_per_hour * 3600))
+
+    def _next_poll(self, region: str) -> float:
+        state = self.regions.get(region)
+        if state is None:
+            return 0.0
+        if state.get("backlog"):
+            return state["last_polled"] + self.settings.min_interval_minutes * 60
+        # Bounds may have changed in the config since the interval was stored
+        return state["last_polled"] + self._interval(state["rate_per_hour"])
+
+    def _load(self) -> None:
+        if self.path is None or not self.path.exists():
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                self.regions = json.load(f).get("regions", {})
+        except (json.JSONDecodeError, IOError) as e:
+            logger.warning(f"Ignoring unreadable region schedule {self.path}: {e}")
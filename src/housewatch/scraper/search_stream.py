@@ -0,0 +1,177 @@
+# src/housewatch/scraper/search_stream.py
+
+import codecs
+import json
+import re
+from typing import Iterable, Iterator, Optional, Tuple
+
+# Redfin prefixes JSON responses with this guard against JSON hijacking
+JSON_GUARD = "{}&&"
+
+# Top-level fields of a search home that _parse_search reads
+SEARCH_FIELDS = (
+    "propertyId",
+    "listingId",
+    "state",
+    "propertyType",
+    "url",
+    "price",
+    "yearBuilt",
+    "hoa",
+    "sqFt",
+    "lotSize",
+    "beds",
+    "baths",
+    "streetLine",
+    "city",
+    "zip",
+    "latLong",
+    "location",
+    "timeOnRedfin",
+    "mlsStatus",
+)
+
+_STRUCTURE = re.compile(r'[\[\]{}",]')
+_STRING_BODY = re.compile(r'(?:[^"\\]|\\.)*"', re.S)
+_WHITESPACE = re.compile(r'[\s,]*')
+
+
+def slim_home(home: dict, fields: Tuple[str, ...] = SEARCH_FIELDS) -> dict:
+    """Keep only the fields the parser needs, drop photos, tags, etc."""
+    return {key: home[key] for key in fields if key in home}
+
+
+class HomesStreamDecoder:
+    """
+    Incremental decoder for the `payload.homes` array of a search response.
+    - Strips the `{}&&` guard by starting past it, no copy of the body
+    - Walks the envelope with a tiny structural scanner until it reaches the
+      homes array, then decodes one home at a time with the C JSON decoder
+    - Consumed text is dropped, so memory stays around one chunk plus one home
+    """
+
+    def __init__(self, path: Tuple[str, ...] = ("payload", "homes")):
+        self.path = path
+        self._text = ""
+        self._pos = 0
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+        self._json = json.JSONDecoder()
+        self._guard_checked = False
+
+        # Envelope scanner state: one [kind, last_key] per open container
+        self._stack = []
+        self._expect_key = False
+        self._in_homes = False
+        self.done = False
+
+    def feed(self, chunk: bytes) -> Iterator[dict]:
+        """Add a chunk of the body, yield every home completed by it"""
+        if self.done:
+            return
+        self._text = self._text[self._pos:] + self._utf8.decode(chunk)
+        self._pos = 0
+
+        if not self._guard_checked:
+            if len(self._text) < len(JSON_GUARD) and JSON_GUARD.startswith(self._text):
+                return
+            self._guard_checked = True
+            if self._text.startswith(JSON_GUARD):
+                self._pos = len(JSON_GUARD)
+
+        while not self.done:
+            if self._in_homes:
+                home = self._next_home()
+                if home is None:
+                    return
+                yield home
+            elif not self._scan_envelope():
+                return
+
+    def close(self) -> None:
+        """Check the stream ended cleanly"""
+        self._utf8.decode(b"", final=True)
+        if not self.done and (self._in_homes or self._stack):
+            raise ValueError("Search response ended before the homes array was complete")
+
+    # ------------------------------------------------------------------
+    # Internal helpers
+    # ------------------------------------------------------------------
+
+    def _next_home(self) -> Optional[dict]:
+        text = self._text
+        pos = _WHITESPACE.match(text, self._pos).end()
+        if pos >= len(text):
+            self._pos = pos
+            return None
+
+        if text[pos] == "]":
+            self._pos = pos + 1
+            self._in_homes = False
+            self.done = True
+            return None
+
+        try:
+            home, end = self._json.raw_decode(text, pos)
+        except json.JSONDecodeError:
+            # Element not complete yet: wait for the next chunk
+            self._pos = pos
+            return None
+
+        self._pos = end
+        return home
+
+    def _scan_envelope(self) -> bool:
+        """Advance through the envelope; False when more input is needed"""
+        text = self._text
+        m = _STRUCTURE.search(text, self._pos)
+        if not m:
+            self._pos = len(text)
+            return False
+
+        ch, i = m.group(), m.start()
+        if ch == '"':
+            end = _STRING_BODY.match(text, i + 1)
+            if not end:
+                self._pos = i
+                return False
+            if self._expect_key and self._stack:
+                self._stack[-1][1] = json.loads(text[i:end.end()])
+                self._expect_key = False
+            self._pos = end.end()
+            return True
+
+        self._pos = i + 1
+        if ch == "{":
+            self._stack.append(["{", None])
+            self._expect_key = True
+        elif ch == "[":
+            keys = tuple(entry[1] for entry in self._stack)
+            self._stack.append(["[", None])
+            if keys == self.path and all(entry[0] == "{" for entry in self._stack[:-1]):
+                self._stack.pop()
+                self._in_homes = True
+        elif ch in "]}":
+            if self._stack:
+                self._stack.pop()
+            self._expect_key = False
+            if not self._stack:
+                # Envelope closed without a homes array
+                self.done = True
+        elif ch == ",":
+            self._expect_key = bool(self._stack) and self._stack[-1][0] == "{"
+        return True
+
+
+def iter_search_homes(chunks: Iterable[bytes],
+                      fields: Tuple[str, ...] = SEARCH_FIELDS) -> Iterator[dict]:
+    """
+    Yield slimmed home dicts from a streamed search response body.
+    Stops reading as soon as the homes array is closed.
+    """
+    decoder = HomesStreamDecoder()
+    for chunk in chunks:
+        for home in decoder.feed(chunk):
+            yield slim_home(home, fields)
+        if decoder.done:
+            return
+    decoder.close()
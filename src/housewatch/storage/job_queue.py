@@ -0,0 +1,180 @@
+# src/housewatch/storage/job_queue.py
+
+import json
+import logging
+import sqlite3
+import time
+import uuid
+from contextlib import contextmanager
+from dataclasses import fields
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Tuple
+
+from housewatch.models.house import House
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    run_id        TEXT NOT NULL,
+    listing_id    TEXT NOT NULL,
+    seq           INTEGER NOT NULL,            -- fetch order within the run
+    house         TEXT NOT NULL,               -- House fields as JSON
+    state         TEXT NOT NULL DEFAULT 'pending',
+    owner         TEXT,
+    lease_expires REAL,
+    attempts      INTEGER NOT NULL DEFAULT 0,
+    result        TEXT,                        -- schools/details (done) or error (failed) as JSON
+    PRIMARY KEY (run_id, listing_id)
+);
+CREATE INDEX IF NOT EXISTS jobs_by_state ON jobs (state, seq);
+"""
+
+
+class JobQueue:
+    """
+    Detail-fetch jobs in a SQLite file that several hosts can share (the
+    filesystem must support POSIX locks). The coordinator starts a run with
+    the houses to fetch; workers lease a few jobs at a time and write back
+    the schools or an error. A lease that is not completed in time goes
+    back to pending, up to max_attempts leases per job.
+    Jobs: pending -> leased -> done | failed
+    """
+
+    def __init__(self, path: Path, busy_timeout: float = 30.0, clock=time.time):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._clock = clock
+        # Autocommit; writes take the database lock up front with BEGIN IMMEDIATE
+        self._db = sqlite3.connect(str(self.path), timeout=busy_timeout, isolation_level=None)
+        self._db.executescript(SCHEMA)
+
+    def __enter__(self) -> "JobQueue":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._db.close()
+
+    # ------------------------------------------------------------------
+    # Coordinator
+    # ------------------------------------------------------------------
+
+    def start_run(self, houses: Iterable[House]) -> str:
+        """Replace any earlier run's jobs with one job per house; returns the run id"""
+        run_id = uuid.uuid4().hex
+        rows = [(run_id, str(house.listing_id), seq, json.dumps(_house_to_json(house)))
+                for seq, house in enumerate(houses)]
+        with self._write():
+            abandoned = self._db.execute("DELETE FROM jobs").rowcount
+            self._db.executemany(
+                "INSERT OR IGNORE INTO jobs (run_id, listing_id, seq, house) VALUES (?, ?, ?, ?)", rows)
+        if abandoned:
+            logger.warning(f"Dropped {abandoned} jobs left over from an unfinished run")
+        return run_id
+
+    def counts(self, run_id: str) -> Dict[str, int]:
+        rows = self._db.execute(
+            "SELECT state, COUNT(*) FROM jobs WHERE run_id = ? GROUP BY state", (run_id,))
+        counts = {"pending": 0, "leased": 0, "done": 0, "failed": 0}
+        counts.update(dict(rows))
+        return counts
+
+    def results(self, run_id: str) -> Dict[str, Tuple[str, object]]:
+        """listing_id -> ("done", {"schools", "details"}) or ("failed", reason) for finished jobs"""
+        rows = self._db.execute(
+            "SELECT listing_id, state, result FROM jobs "
+            "WHERE run_id = ? AND state IN ('done', 'failed')", (run_id,))
+        return {listing_id: (state, json.loads(result)) for listing_id, state, result in rows}
+
+    def finish_run(self, run_id: str) -> None:
+        """Drop the run's jobs; late results from workers are then ignored"""
+        with self._write():
+            self._db.execute("DELETE FROM jobs WHERE run_id = ?", (run_id,))
+
+    # ------------------------------------------------------------------
+    # Workers
+    # ------------------------------------------------------------------
+
+    def lease(self, owner: str, limit: int, lease_seconds: float,
+              max_attempts: int = 3) -> List[Tuple[int, House]]:
+        """Up to `limit` jobs in fetch order: pending ones, or leases that expired"""
+        now = self._clock()
+        with self._write():
+            # Jobs whose worker died max_attempts times are not handed out again
+            self._db.execute(
+                "UPDATE jobs SET state = 'failed', owner = NULL, result = ? "
+                "WHERE state = 'leased' AND lease_expires < ? AND attempts >= ?",
+                (json.dumps(f"lease expired {max_attempts} times"), now, max_attempts))
+            rows = self._db.execute(
+                "SELECT rowid, house FROM jobs "
+                "WHERE state = 'pending' OR (state = 'leased' AND lease_expires < ?) "
+                "ORDER BY seq LIMIT ?", (now, limit)).fetchall()
+            self._db.executemany(
+                "UPDATE jobs SET state = 'leased', owner = ?, lease_expires = ?, attempts = attempts + 1 "
+                "WHERE rowid = ?", [(owner, now + lease_seconds, job_id) for job_id, _ in rows])
+        return [(job_id, _house_from_json(json.loads(house))) for job_id, house in rows]
+
+    def complete(self, job_id: int, owner: str, result: dict) -> bool:
+        """Store {"schools", "details"} of a leased job; False if the lease was lost meanwhile"""
+        return self._finish(job_id, owner, "done", result)
+
+    def fail(self, job_id: int, owner: str, reason: str) -> bool:
+        return self._finish(job_id, owner, "failed", reason)
+
+    def release(self, job_ids: Iterable[int], owner: str) -> None:
+        """Hand leased jobs back untried (the attempt does not count)"""
+        with self._write():
+            self._db.executemany(
+                "UPDATE jobs SET state = 'pending', owner = NULL, lease_expires = NULL, "
+                "attempts = attempts - 1 WHERE rowid = ? AND owner = ? AND state = 'leased'",
+                [(job_id, owner) for job_id in job_ids])
+
+    def idle(self) -> bool:
+        """No job is pending or leased"""
+        row = self._db.execute(
+            "SELECT 1 FROM jobs WHERE state IN ('pending', 'leased') LIMIT 1").fetchone()
+        return row is None
+
+    # ------------------------------------------------------------------
+    # Internal helpers
+    # ------------------------------------------------------------------
+
+    def _finish(self, job_id: int, owner: str, state: str, result) -> bool:
+        with self._write():
+            updated = self._db.execute(
+                "UPDATE jobs SET state = ?, result = ?, owner = NULL "
+                "WHERE rowid = ? AND owner = ? AND state = 'leased'",
+                (state, json.dumps(result), job_id, owner)).rowcount
+        return updated == 1
+
+    @contextmanager
+    def _write(self):
+        """BEGIN IMMEDIATE ... COMMIT, rolled back on error"""
+        self._db.execute("BEGIN IMMEDIATE")
+        try:
+            yield
+        except BaseException:
+            self._db.execute("ROLLBACK")
+            raise
+        self._db.execute("COMMIT")
+
+
+def _house_to_json(house: House) -> dict:
+    data = {}
+    for f in fields(House):
+        if f.name in ("schools", "details"):
+            continue
+        value = getattr(house, f.name)
+        data[f.name] = value.isoformat() if isinstance(value, datetime) else value
+    return data
+
+
+def _house_from_json(data: dict) -> House:
+    for key in ("listed_date", "last_update"):
+        if data.get(key):
+            data[key] = datetime.fromisoformat(data[key])
+    return House(**data)
@@ -1,21 +1,38 @@
 # src/housewatch/storage/json_storage.py
 
 import json
+import time
 from pathlib import Path
-from typing import List
+from typing import Iterable
 from datetime import datetime
 from housewatch.models.house import House
+from housewatch.models.house_batch import HouseBatch
+from housewatch.storage.locking import atomic_write_json, file_lock, owner_alive, process_owner
 
 
 class HouseStorage:
-    """Simple JSON-based storage for tracking seen houses"""
+    """
+    Simple JSON-based storage for tracking seen houses.
+    Safe for overlapping runs: writes hold a lock file and merge with what
+    other processes saved meanwhile, and claim() hands each new house to
+    one process only.
+    """
 
     def __init__(self, seen_path: str = "data/seen_houses.json",
-                 matched_path: str = "data/matched_houses.json"):
+                 matched_path: str = "data/matched_houses.json",
+                 claim_ttl: float = 3600.0):
         self.seen_path = Path(seen_path)
         self.matched_path = Path(matched_path)
         self.seen_path.parent.mkdir(parents=True, exist_ok=True)
+        self.lock_path = self.seen_path.with_name(".storage.lock")
+        self.claims_path = self.seen_path.with_name("claims.json")
+        self.claim_ttl = claim_ttl    # claims of a crashed process on another host lapse after this
+        self.owner = process_owner()
         self.seen_houses: dict[str, str] = {} # listing_id -> address
+        # region key -> {"newest_listed_at": ts, "last_full_sweep": ts}
+        self.region_watermarks: dict[str, dict] = {}
+        self._updated_regions = set()    # watermarks set by this process
+        self._claimed = set()
         self.load_seen()
     
 
@@ -26,6 +43,7 @@ class HouseStorage:
                 with open(self.seen_path, 'r', encoding='utf-8') as f:
                     data = json.load(f)
                     self.seen_houses = data.get("seen_houses", {})
+                    self.region_watermarks = data.get("region_watermarks", {})
                 
             except (json.JSONDecodeError, IOError) as e:
                 print(f"Warning: could not read {self.seen_path}")
@@ -33,13 +51,62 @@ class HouseStorage:
     
 
     def save_seen(self) -> None:
-        """Save seen houses to file"""
-        data = {
-            "seen_houses": self.seen_houses,
-            "last_updated": datetime.now().isoformat()
-        }
-        with open(self.seen_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        """Save seen houses to file, merged with what other runs saved since loading"""
+        with file_lock(self.lock_path):
+            self._merge_seen_from_disk()
+            data = {
+                "seen_houses": self.seen_houses,
+                "region_watermarks": self.region_watermarks,
+                "last_updated": datetime.now().isoformat()
+            }
+            atomic_write_json(self.seen_path, data)
+
+
+    def claim(self, houses: HouseBatch) -> HouseBatch:
+        """
+        Rows this process may evaluate: not seen by any run (the file is
+        re-read) and not claimed by another live process. They stay claimed
+        for this process until release_claims().
+        """
+        if not len(houses):
+            return houses
+
+        now = time.time()
+        with file_lock(self.lock_path):
+            self._merge_seen_from_disk()
+            claims = self._read_claims()
+            mask = []
+            for listing_id in houses.column("listing_id"):
+                key = str(listing_id)
+                holder = claims.get(key)
+                free = key not in self.seen_houses and (
+                    holder is None or holder["owner"] == self.owner
+                    or holder["expires"] < now or not owner_alive(holder["owner"])
+                )
+                if free:
+                    claims[key] = {"owner": self.owner, "expires": now + self.claim_ttl}
+                    self._claimed.add(key)
+                mask.append(free)
+            atomic_write_json(self.claims_path, claims)
+
+        claimed = houses.where(mask)
+        if len(claimed) < len(houses):
+            print(f"Skipping {len(houses) - len(claimed)} houses handled by another run")
+        return claimed
+
+
+    def release_claims(self) -> None:
+        """Drop this process's claims (and lapsed ones)"""
+        if not self._claimed:
+            return
+        now = time.time()
+        with file_lock(self.lock_path):
+            claims = {
+                key: holder for key, holder in self._read_claims().items()
+                if holder["owner"] != self.owner and holder["expires"] >= now
+            }
+            atomic_write_json(self.claims_path, claims)
+        self._claimed.clear()
     
 
     def is_new(self, house: House) -> bool:
@@ -49,23 +116,62 @@ class HouseStorage:
         return str(house.listing_id) not in self.seen_houses
     
 
+    def select_new(self, houses: HouseBatch) -> HouseBatch:
+        """Rows of a batch that haven't been seen before (reads the id column only)"""
+        seen = self.seen_houses
+        return houses.where(
+            bool(listing_id) and str(listing_id) not in seen
+            for listing_id in houses.column("listing_id")
+        )
+
+
+    def get_watermark(self, region: str) -> dict:
+        """Incremental search state of a region ({} before its first run)"""
+        return self.region_watermarks.get(region, {})
+
+
+    def set_watermark(self, region: str, newest_listed_at: float, full_sweep_at: float = None) -> None:
+        """Everything listed after newest_listed_at in this region has been handled"""
+        state = self.region_watermarks.setdefault(region, {})
+        self._updated_regions.add(region)
+        state["newest_listed_at"] = newest_listed_at
+        if full_sweep_at is not None:
+            state["last_full_sweep"] = full_sweep_at
+
+
     def mark_as_seen(self, house: House) -> None:
         """Mark a house as seen and save"""
         if house.listing_id and self.is_new(house):
             self.seen_houses[str(house.listing_id)] = f"{house.address}, {house.city}, {house.state} {house.zip_code}"
             
 
-    def make_multiple_as_seen(self, houses: List[House]) -> None:
+    def make_multiple_as_seen(self, houses: Iterable[House]) -> None:
         """Mark multiple houses as seen at once"""
+        if isinstance(houses, HouseBatch):
+            columns = [houses.column(name) for name in ("listing_id", "address", "city", "state", "zip_code")]
+            for listing_id, address, city, state, zip_code in zip(*columns):
+                if listing_id and str(listing_id) not in self.seen_houses:
+                    self.seen_houses[str(listing_id)] = f"{address}, {city}, {state} {zip_code}"
+            return
+
         for house in houses:
             if house.listing_id and self.is_new(house):
                 self.seen_houses[str(house.listing_id)] = f"{house.address}, {house.city}, {house.state} {house.zip_code}"
     
 
-    def save_matched(self, houses: List[House]) -> None:
+    def save_matched(self, houses: Iterable[House]) -> None:
         if not houses:
             return
-        
+
+        with file_lock(self.lock_path):
+            self._append_matched(houses)
+
+
+    # ------------------------------------------------------------------
+    # Internal helpers (call with the lock held)
+    # ------------------------------------------------------------------
+
+    def _append_matched(self, houses: Iterable[House]) -> None:
         existing_matches = []
         if self.matched_path.exists():
             try:
@@ -73,9 +179,13 @@ class HouseStorage:
                     existing_matches = json.load(f)
             except (json.JSONDecodeError, IOError):
                 existing_matches = []
-        
+        # Another run may have recorded some of them already
+        recorded = {str(entry.get("listing_id")) for entry in existing_matches}
+
         new_entries = []
         for house in houses:
+            if str(house.listing_id) in recorded:
+                continue
             house_dict = {
                 "listing_id": house.listing_id,
                 "address": f"{house.address}, {house.city}, {house.state} {house.zip_code}",
@@ -89,6 +199,33 @@ class HouseStorage:
         
         existing_matches.extend(new_entries)
 
-        with open(self.matched_path, 'w', encoding='utf-8') as f:
-            json.dump(existing_matches, f, indent=2, ensure_ascii=False)
+        atomic_write_json(self.matched_path, existing_matches)
         print(f"Write {len(new_entries)} new houses into {self.matched_path}" )
+
+
+    def _merge_seen_from_disk(self) -> None:
+        """Union with the saved seen houses; saved watermarks win unless this process set one"""
+        if not self.seen_path.exists():
+            return
+        try:
+            with open(self.seen_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (json.JSONDecodeError, IOError):
+            print(f"Warning: could not read {self.seen_path}, overwriting it")
+            return
+
+        for listing_id, address in data.get("seen_houses", {}).items():
+            self.seen_houses.setdefault(listing_id, address)
+        for region, state in data.get("region_watermarks", {}).items():
+            if region not in self._updated_regions:
+                self.region_watermarks[region] = state
+
+
+    def _read_claims(self) -> dict:
+        if not self.claims_path.exists():
+            return {}
+        try:
+            with open(self.claims_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (json.JSONDecodeError, IOError):
+            return {}
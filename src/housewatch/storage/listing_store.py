@@ -0,0 +1,200 @@
+# src/housewatch/storage/listing_store.py
+
+import json
+import logging
+import sqlite3
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from housewatch.models.house import House
+
+logger = logging.getLogger(__name__)
+
+# Listings missing from the search results for longer than this are taken to
+# be off the market; a full sweep refreshes every listing still on it daily
+MAX_AGE_DAYS = 2
+
+# Search fields stored per listing, in table order
+COLUMNS = (
+    "listing_id", "address", "city", "state", "zip_code", "price", "year_built",
+    "property_type", "hoa_fee", "beds", "baths", "sqft", "lot_size", "url",
+    "neighborhood", "latitude", "longitude", "listed_date",
+)
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS listings (
+    {COLUMNS[0]} TEXT PRIMARY KEY,
+    {", ".join(COLUMNS[1:])},
+    schools    TEXT,      -- JSON, NULL until the detail page was read
+    details    TEXT,      -- enrichment fields from the same page, JSON
+    first_seen REAL NOT NULL,
+    last_seen  REAL NOT NULL,
+    matched_at REAL       -- set once the listing was reported as a match
+);
+CREATE INDEX IF NOT EXISTS listings_price ON listings (price);
+CREATE INDEX IF NOT EXISTS listings_year ON listings (year_built);
+CREATE INDEX IF NOT EXISTS listings_hoa ON listings (hoa_fee);
+CREATE INDEX IF NOT EXISTS listings_city ON listings (city COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS listings_zip ON listings (zip_code);
+"""
+
+
+class ListingStore:
+    """
+    Every parsed search listing, its schools once fetched, and whether it
+    was reported, in a local SQLite file. Lets changed criteria be run over
+    everything seen so far (see candidates()) instead of re-scraping.
+    With read_only, an existing file is opened for search() and the like
+    only: no schema is created and any write fails.
+    """
+
+    def __init__(self, path: Path, clock=time.time, read_only: bool = False):
+        self.path = Path(path)
+        self._clock = clock
+        if read_only:
+            self._db = sqlite3.connect(f"{self.path.resolve().as_uri()}?mode=ro", uri=True)
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(str(self.path))
+        self._db.executescript(SCHEMA)
+        # Stores created before enrichment fields existed
+        columns = {row[1] for row in self._db.execute("PRAGMA table_info(listings)")}
+        if "details" not in columns:
+            self._db.execute("ALTER TABLE listings ADD COLUMN details TEXT")
+
+    def __enter__(self) -> "ListingStore":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self._db.execute("SELECT COUNT(*) FROM listings").fetchone()[0]
+
+    def close(self) -> None:
+        self._db.close()
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def upsert(self, houses: Iterable[House]) -> None:
+        """Insert or refresh search fields; stored schools and match state are kept"""
+        now = self._clock()
+        placeholders = ", ".join("?" for _ in COLUMNS)
+        updates = ", ".join(f"{c} = excluded.{c}" for c in COLUMNS[1:])
+        with self._db:
+            self._db.executemany(
+                f"INSERT INTO listings ({', '.join(COLUMNS)}, first_seen, last_seen) "
+                f"VALUES ({placeholders}, ?, ?) "
+                f"ON CONFLICT(listing_id) DO UPDATE SET {updates}, last_seen = excluded.last_seen",
+                [_row(house) + (now, now) for house in houses if house.listing_id])
+
+    def set_schools(self, details: Iterable[Tuple[House, dict]]) -> None:
+        """Store (house, schools) pairs, with each house's enrichment fields"""
+        with self._db:
+            self._db.executemany(
+                "UPDATE listings SET schools = ?, details = ? WHERE listing_id = ?",
+                [(json.dumps(schools), json.dumps(house.details) if house.details else None,
+                  str(house.listing_id)) for house, schools in details])
+
+    def mark_matched(self, houses: Iterable[House]) -> None:
+        now = self._clock()
+        with self._db:
+            self._db.executemany(
+                "UPDATE listings SET matched_at = ? WHERE listing_id = ? AND matched_at IS NULL",
+                [(now, str(house.listing_id)) for house in houses])
+
+    def candidates(self, plan, include_matched: bool = False, max_age_days: Optional[float] = None,
+                   levels: Iterable[str] = ()) -> List[Tuple[House, Optional[Dict]]]:
+        """
+        (house, schools or None) for stored listings inside the search-stage
+        thresholds of a CriteriaPlan; price, year and HOA are indexed ranges.
+        Stored enrichment fields are set on house.details.
+        Listings already reported are left out unless include_matched, and
+        listings last seen more than max_age_days ago when it is given.
+        Schools missing one of levels (resolved offline for other criteria)
+        are returned as None, to be read again.
+        """
+        sql = (f"SELECT {', '.join(COLUMNS)}, schools, details FROM listings "
+               "WHERE state = ? AND price BETWEEN ? AND ? AND year_built >= ? AND hoa_fee <= ?")
+        params = [plan.state, plan.min_price, plan.max_price, plan.min_year_built, plan.max_hoa]
+        if not include_matched:
+            sql += " AND matched_at IS NULL"
+        if max_age_days is not None:
+            sql += " AND last_seen >= ?"
+            params.append(self._clock() - max_age_days * 86400)
+        rows = self._db.execute(sql + " ORDER BY listed_date DESC", params)
+
+        levels = tuple(levels)
+        results = []
+        for row in rows:
+            house = _house(row[:len(COLUMNS)])
+            house.property_type = plan.property_type
+            schools, details = row[len(COLUMNS):]
+            if details:
+                house.details = json.loads(details)
+            schools = json.loads(schools) if schools else None
+            if schools is not None and not all(level in schools for level in levels):
+                schools = None
+            results.append((house, schools))
+        return results
+
+    def search(self, city: Optional[str] = None, zip_code: Optional[str] = None,
+               min_price: Optional[int] = None, max_price: Optional[int] = None,
+               matched_only: bool = False, offset: int = 0, limit: int = 50) -> Tuple[int, List[dict]]:
+        """(total, one page of rows newest first) of stored listings; None filters are not applied"""
+        where, args = [], []
+        if city is not None:
+            where.append("city = ? COLLATE NOCASE")
+            args.append(city)
+        if zip_code is not None:
+            where.append("zip_code = ?")
+            args.append(str(zip_code))
+        if min_price is not None:
+            where.append("price >= ?")
+            args.append(min_price)
+        if max_price is not None:
+            where.append("price <= ?")
+            args.append(max_price)
+        if matched_only:
+            where.append("matched_at IS NOT NULL")
+        clause = f" WHERE {' AND '.join(where)}" if where else ""
+
+        total = self._db.execute(f"SELECT COUNT(*) FROM listings{clause}", args).fetchone()[0]
+        cursor = self._db.execute(
+            f"SELECT {', '.join(COLUMNS)}, schools, first_seen, last_seen, matched_at FROM listings"
+            f"{clause} ORDER BY last_seen DESC, listing_id LIMIT ? OFFSET ?", args + [limit, offset])
+        names = [column[0] for column in cursor.description]
+        rows = []
+        for values in cursor:
+            row = dict(zip(names, values))
+            row["schools"] = json.loads(row["schools"]) if row["schools"] else None
+            rows.append(row)
+        return total, rows
+
+    def by_property_id(self) -> Dict[int, Tuple[str, str]]:
+        """Redfin property id (the /home/<id> end of the URL) -> (address, url)"""
+        names = {}
+        for address, city, url in self._db.execute("SELECT address, city, url FROM listings"):
+            _, _, tail = (url or "").rpartition("/home/")
+            if tail.isdigit():
+                names[int(tail)] = (f"{address}, {city}", url)
+        return names
+
+
+def _row(house: House) -> tuple:
+    values = [getattr(house, column) for column in COLUMNS]
+    listed = house.listed_date
+    values[-1] = listed.timestamp() if isinstance(listed, datetime) else None
+    values[0] = str(house.listing_id)
+    return tuple(values)
+
+
+def _house(row: tuple) -> House:
+    data = dict(zip(COLUMNS, row))
+    if data["listed_date"] is not None:
+        data["listed_date"] = datetime.fromtimestamp(data["listed_date"])
+    return House(**data)
@@ -0,0 +1,57 @@
+# src/housewatch/storage/locking.py
+
+import json
+import os
+import socket
+from contextlib import contextmanager
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:    # Windows: no advisory locks, runs must not overlap there
+    fcntl = None
+
+
+@contextmanager
+def file_lock(path: Path):
+    """Exclusive advisory lock on `path` (created if missing) for the with block"""
+    if fcntl is None:
+        yield
+        return
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a") as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def atomic_write_json(path: Path, data) -> None:
+    """Write through a temporary file, so readers never see half a file"""
+    path = Path(path)
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+def process_owner() -> str:
+    """host:pid of this process, used to tag claims"""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def owner_alive(owner: str) -> bool:
+    """False only when the owner ran on this host and its process is gone"""
+    host, _, pid = owner.rpartition(":")
+    if host != socket.gethostname() or not pid.isdigit():
+        return True
+    try:
+        os.kill(int(pid), 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
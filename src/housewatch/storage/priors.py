@@ -0,0 +1,167 @@
+# src/housewatch/storage/priors.py
+
+import hashlib
+import json
+import logging
+import math
+import random
+from dataclasses import dataclass, fields
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+from housewatch.models.house import House
+
+logger = logging.getLogger(__name__)
+
+
+def criteria_key(criteria: dict) -> str:
+    """Hash of the criteria the priors were learned under"""
+    # Config sections are read-only mappings: hashed as dicts, key order aside
+    text = json.dumps(criteria, sort_keys=True,
+                      default=lambda obj: dict(obj) if isinstance(obj, Mapping) else str(obj))
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+
+
+@dataclass
+class PriorSettings:
+    """Tuning knobs, loaded from app.priors"""
+    enabled: bool = True
+    confidence: float = 0.95       # confidence for "this cell never matches"
+    max_match_rate: float = 0.02   # skip a cell when its match rate is surely below this
+    explore_rate: float = 0.05     # share of skippable houses fetched anyway
+    grid_cell_deg: float = 0.01    # ~1 km grid cells
+
+    @classmethod
+    def from_config(cls, cfg: Optional[dict]) -> "PriorSettings":
+        cfg = cfg or {}
+        known = {f.name for f in fields(cls)}
+        return cls(**{k: v for k, v in cfg.items() if k in known})
+
+
+class MatchPriors:
+    """
+    Per-cell match statistics learned from evaluated houses. Cells are the
+    zip code, the neighborhood and a lat/lng grid square of each house.
+    - score(): smoothed match rate, used to fetch likely matches first
+    - should_skip(): every cell of the house has zero matches and enough
+      evaluations that its match rate is below max_match_rate with the
+      configured confidence (0 successes in n trials: 1 - (1 - c)^(1/n))
+    Counts only hold for the criteria they were learned under: saved priors
+    carry the criteria key and are rebuilt when it changes.
+    """
+
+    def __init__(self, settings: Optional[PriorSettings] = None, path: Optional[Path] = None,
+                 rng: Optional[random.Random] = None, key: str = ""):
+        self.settings = settings or PriorSettings()
+        self.path = Path(path) if path else None
+        self.key = key
+        self.cells: Dict[str, List[int]] = {}     # cell -> [evaluated, matched]
+        self.fetches_avoided = 0
+        self._rng = rng or random.Random()
+
+        # Fewest zero-match evaluations for a cell to count as "never matches"
+        s = self.settings
+        self.min_evidence = math.ceil(math.log(1 - s.confidence) / math.log(1 - s.max_match_rate))
+
+    @classmethod
+    def load(cls, path: Path, settings: Optional[PriorSettings] = None, key: str = "",
+             history: Iterable[Tuple[House, bool]] = ()) -> "MatchPriors":
+        """
+        Load saved priors learned under the same criteria key, or bootstrap
+        them from history: (house, matched) for houses whose details were read
+        """
+        priors = cls(settings, path, key=key)
+        if priors.path.exists():
+            try:
+                with open(priors.path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                if data.get("criteria") == key:
+                    priors.cells = {cell: list(counts) for cell, counts in data.get("cells", {}).items()}
+                    priors.fetches_avoided = data.get("fetches_avoided", 0)
+                    return priors
+                logger.info(f"Criteria changed since {priors.path} was saved: rebuilding match priors")
+            except (json.JSONDecodeError, IOError) as e:
+                logger.warning(f"Rebuilding unreadable priors {priors.path}: {e}")
+
+        priors.bootstrap(history)
+        return priors
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def bootstrap(self, history: Iterable[Tuple[House, bool]]) -> None:
+        """Seed the cells from houses evaluated before, matched or not"""
+        count = 0
+        for house, matched in history:
+            self.record(house, matched)
+            count += 1
+        if count:
+            logger.info(f"Bootstrapped match priors for {len(self.cells)} cells from {count} stored listings")
+
+    def cells_of(self, house: House) -> List[str]:
+        cells = []
+        if house.zip_code:
+            cells.append(f"zip:{house.zip_code}")
+        if house.neighborhood:
+            cells.append(f"hood:{house.neighborhood.lower()}")
+        if house.latitude is not None and house.longitude is not None:
+            size = self.settings.grid_cell_deg
+            cells.append(f"grid:{math.floor(house.latitude / size)}:{math.floor(house.longitude / size)}")
+        return cells
+
+    def record(self, house: House, matched: bool) -> None:
+        for cell in self.cells_of(house):
+            counts = self.cells.setdefault(cell, [0, 0])
+            counts[0] += 1
+            counts[1] += bool(matched)
+
+    def score(self, house: House) -> float:
+        """Best smoothed match rate over the house's cells (unknown cells score 0.5)"""
+        best = None
+        for cell in self.cells_of(house):
+            counts = self.cells.get(cell)
+            if counts:
+                rate = (counts[1] + 1) / (counts[0] + 2)
+                best = rate if best is None else max(best, rate)
+        return 0.5 if best is None else best
+
+    def should_skip(self, house: House) -> bool:
+        known = [self.cells.get(cell) for cell in self.cells_of(house)]
+        known = [counts for counts in known if counts]
+        if not known or any(matched for _, matched in known):
+            return False
+        if max(evaluated for evaluated, _ in known) < self.min_evidence:
+            return False
+        return self._rng.random() >= self.settings.explore_rate
+
+    def plan(self, houses: Iterable[House]) -> Tuple[List[House], List[House]]:
+        """(houses to fetch, most likely matches first; houses skipped)"""
+        houses = list(houses)
+        if not self.settings.enabled:
+            return houses, []
+
+        to_fetch, skipped = [], []
+        for house in houses:
+            (skipped if self.should_skip(house) else to_fetch).append(house)
+        to_fetch.sort(key=self.score, reverse=True)
+
+        self.fetches_avoided += len(skipped)
+        if skipped:
+            logger.info(f"Priors: skipped {len(skipped)}/{len(houses)} detail fetches in zero-match cells "
+                        f"({self.fetches_avoided} avoided in total)")
+        return to_fetch, skipped
+
+    def save(self) -> None:
+        if self.path is None:
+            return
+        data = {
+            "criteria": self.key,
+            "cells": self.cells,
+            "fetches_avoided": self.fetches_avoided,
+            "last_updated": datetime.now().isoformat(),
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
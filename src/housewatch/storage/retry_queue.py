@@ -0,0 +1,134 @@
+# src/housewatch/storage/retry_queue.py
+
+import json
+import logging
+import time
+from dataclasses import dataclass, fields
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from housewatch.models.house import House
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class RetrySettings:
+    """Tuning knobs, loaded from app.retry"""
+    max_attempts: int = 5
+    base_delay_hours: float = 1.0   # doubles after every failed attempt
+    per_run_budget: int = 20        # retries per run, the rest goes to new houses
+    expire_days: float = 14.0       # forget entries whose listing stopped showing up
+
+    @classmethod
+    def from_config(cls, cfg: Optional[dict]) -> "RetrySettings":
+        cfg = cfg or {}
+        known = {f.name for f in fields(cls)}
+        return cls(**{k: v for k, v in cfg.items() if k in known})
+
+
+class RetryQueue:
+    """
+    Houses whose detail fetch failed or came back without school data.
+    They stay unseen; each failure pushes the next attempt out exponentially,
+    and after max_attempts the house is given up on (and then marked seen).
+    Persisted as JSON: listing_id -> attempts, next_eligible, last_error, ...
+    """
+
+    def __init__(self, settings: Optional[RetrySettings] = None, path: Optional[Path] = None,
+                 clock=time.time):
+        self.settings = settings or RetrySettings()
+        self.path = Path(path) if path else None
+        self.entries: Dict[str, dict] = {}
+        self._clock = clock
+        self._load()
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __contains__(self, listing_id) -> bool:
+        return str(listing_id) in self.entries
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def plan(self, houses: List[House]) -> List[House]:
+        """
+        Houses to fetch this run: eligible retries first (up to the per-run
+        budget), then never-tried houses in their given order. Retries that
+        are not due yet or over budget wait for a later run.
+        """
+        now = self._clock()
+        retries, fresh, waiting = [], [], 0
+        for house in houses:
+            entry = self.entries.get(str(house.listing_id))
+            if entry is None:
+                fresh.append(house)
+            elif entry["next_eligible"] <= now and len(retries) < self.settings.per_run_budget:
+                entry["last_seen"] = now
+                retries.append(house)
+            else:
+                entry["last_seen"] = now
+                waiting += 1
+
+        if retries or waiting:
+            logger.info(f"Retry queue: {len(retries)} retries this run, {waiting} waiting")
+        return retries + fresh
+
+    def record_failure(self, house: House, reason: str) -> bool:
+        """Count a failed attempt; True when the house is given up on"""
+        now = self._clock()
+        entry = self.entries.setdefault(str(house.listing_id), {
+            "attempts": 0,
+            "first_failed": now,
+            "url": house.url,
+        })
+        entry["attempts"] += 1
+        entry["last_error"] = reason
+        entry["last_seen"] = now
+
+        if entry["attempts"] >= self.settings.max_attempts:
+            logger.warning(f"Giving up on {house.url} after {entry['attempts']} attempts: {reason}")
+            del self.entries[str(house.listing_id)]
+            return True
+
+        delay = self.settings.base_delay_hours * 3600 * 2 ** (entry["attempts"] - 1)
+        entry["next_eligible"] = now + delay
+        return False
+
+    def record_success(self, house: House) -> None:
+        self.entries.pop(str(house.listing_id), None)
+
+    def save(self) -> None:
+        if self.path is None:
+            return
+        self._expire()
+        data = {
+            "entries": self.entries,
+            "last_updated": datetime.now().isoformat(),
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+
+    # ------------------------------------------------------------------
+    # Internal helpers
+    # ------------------------------------------------------------------
+
+    def _expire(self) -> None:
+        cutoff = self._clock() - self.settings.expire_days * 86400
+        stale = [listing_id for listing_id, entry in self.entries.items()
+                 if entry.get("last_seen", entry["first_failed"]) < cutoff]
+        for listing_id in stale:
+            del self.entries[listing_id]
+
+    def _load(self) -> None:
+        if self.path is None or not self.path.exists():
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                self.entries = json.load(f).get("entries", {})
+        except (json.JSONDecodeError, IOError) as e:
+            logger.warning(f"Ignoring unreadable retry queue {self.path}: {e}")
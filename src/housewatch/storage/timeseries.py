@@ -0,0 +1,315 @@
+# src/housewatch/storage/timeseries.py
+
+import logging
+import mmap
+import os
+import struct
+import time
+from array import array
+from bisect import bisect_left
+from dataclasses import dataclass, fields
+from itertools import accumulate
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from housewatch.storage.locking import file_lock
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"HWTS"
+VERSION = 1
+# magic, version, base timestamp, samples, properties
+HEADER = struct.Struct("<4sH2xqII")
+
+# Listing status (the search payload's mlsStatus) stored as one byte; 0: unknown
+STATUS_CODES = {"Active": 1, "Coming Soon": 2, "Contingent": 3, "Pending": 4, "Sold": 5, "Off Market": 6}
+STATUS_NAMES = {code: name for name, code in STATUS_CODES.items()}
+
+# (property_id, timestamp, price, status code)
+Sample = Tuple[int, int, int, int]
+
+
+@dataclass
+class PriceHistorySettings:
+    """Tuning knobs, loaded from app.price_history"""
+    enabled: bool = True
+    path: str = "price_history"         # segment directory, inside the data directory
+    max_segments: int = 8               # more than this are merged into one
+
+    @classmethod
+    def from_config(cls, cfg: Optional[dict]) -> "PriceHistorySettings":
+        cfg = cfg or {}
+        known = {f.name for f in fields(cls)}
+        return cls(**{k: v for k, v in cfg.items() if k in known})
+
+
+@dataclass(frozen=True)
+class PriceDrop:
+    property_id: int
+    peak_price: int       # highest price in the window (or in effect when it started)
+    price: int            # latest price
+    drop_pct: float
+    changed_at: int       # timestamp of the latest sample
+
+
+class Segment:
+    """
+    One sealed, immutable file of samples sorted by (property, time), read
+    through a read-only memory map. After the header, each column is a
+    packed array in native byte order:
+        property_ids q[P]   sorted
+        offsets      I[P+1] first row of each property
+        base_price   q[P]   first price of each property in the segment
+        last_price   q[P]
+        ts_delta     I[N]   seconds since the segment's base timestamp
+        price_delta  i[N]   change from the property's previous row (0 for the first)
+        status       B[N]
+    so a sample takes 9 bytes, and a property's rows are a bisect away.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.base_ts, samples, properties = HEADER.unpack_from(self._mmap)
+        if magic != MAGIC or version != VERSION:
+            self._mmap.close()
+            raise ValueError(f"{self.path}: not a version {VERSION} price history segment")
+
+        self._view = view = memoryview(self._mmap)
+        offset = HEADER.size
+        columns = []
+        for code, count in (("q", properties), ("I", properties + 1), ("q", properties),
+                            ("q", properties), ("I", samples), ("i", samples), ("B", samples)):
+            size = struct.calcsize(code) * count
+            columns.append(view[offset:offset + size].cast(code))
+            offset += size
+        (self.property_ids, self.offsets, self.base_price, self.last_price,
+         self.ts_delta, self.price_delta, self.status) = columns
+
+    def __len__(self) -> int:
+        return len(self.ts_delta)
+
+    def close(self) -> None:
+        for column in (self.property_ids, self.offsets, self.base_price, self.last_price,
+                       self.ts_delta, self.price_delta, self.status):
+            column.release()
+        self._view.release()
+        self._mmap.close()
+
+    def find(self, property_id: int) -> Optional[int]:
+        """Index of property_id in the property table, None if it has no samples here"""
+        i = bisect_left(self.property_ids, property_id)
+        if i < len(self.property_ids) and self.property_ids[i] == property_id:
+            return i
+        return None
+
+    def samples(self, i: int) -> List[Tuple[int, int, int]]:
+        """(timestamp, price, status code) rows of the i-th property, oldest first"""
+        start, end = self.offsets[i], self.offsets[i + 1]
+        base = self.base_ts
+        prices = accumulate(self.price_delta[start:end], initial=self.base_price[i])
+        next(prices)
+        return [(base + t, p, s) for t, p, s in
+                zip(self.ts_delta[start:end], prices, self.status[start:end])]
+
+    @staticmethod
+    def write(path: Path, samples: List[Sample]) -> None:
+        """Write samples (any order) as a new segment, atomically"""
+        samples = sorted(samples)
+        base_ts = min((s[1] for s in samples), default=0)
+
+        property_ids, offsets, base_price, last_price = array("q"), array("I"), array("q"), array("q")
+        ts_delta, price_delta, status = array("I"), array("i"), array("B")
+        previous = None
+        for row, (property_id, ts, price, code) in enumerate(samples):
+            if property_id != previous:
+                if previous is not None:
+                    last_price.append(prev_price)
+                property_ids.append(property_id)
+                offsets.append(row)
+                base_price.append(price)
+                prev_price, previous = price, property_id
+            ts_delta.append(ts - base_ts)
+            price_delta.append(price - prev_price)
+            status.append(code)
+            prev_price = price
+        if previous is not None:
+            last_price.append(prev_price)
+        offsets.append(len(samples))
+
+        path = Path(path)
+        tmp_path = path.with_name(path.name + ".tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(HEADER.pack(MAGIC, VERSION, base_ts, len(samples), len(property_ids)))
+            for column in (property_ids, offsets, base_price, last_price, ts_delta, price_delta, status):
+                column.tofile(f)
+        os.replace(tmp_path, path)
+
+
+class PriceHistory:
+    """
+    Append-only (property, time, price, status) samples taken from every
+    search payload, in memory-mapped segment files under one directory.
+    record() keeps a sample only when the property's price or status
+    changed since its latest one; flush() writes a run's samples as a new
+    segment and merges the segments once there are more than max_segments.
+    """
+
+    def __init__(self, path: Path, settings: Optional[PriceHistorySettings] = None, clock=time.time):
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.settings = settings or PriceHistorySettings()
+        self._clock = clock
+        self._lock_path = self.path / ".lock"
+        self.segments: List[Segment] = []
+        self._pending: List[Sample] = []
+        self._latest: Dict[int, Tuple[int, int]] = {}    # property -> (price, status code)
+        self._open_segments()
+
+    def __enter__(self) -> "PriceHistory":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return sum(len(segment) for segment in self.segments) + len(self._pending)
+
+    def close(self) -> None:
+        for segment in self.segments:
+            segment.close()
+        self.segments = []
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def record(self, property_id, price, status: Optional[str] = None, ts: Optional[float] = None) -> bool:
+        """Queue a sample if it differs from the property's latest; True if queued"""
+        try:
+            property_id, price = int(property_id), int(price)
+        except (TypeError, ValueError):
+            return False
+        code = STATUS_CODES.get(status, 0)
+        if self._latest.get(property_id) == (price, code):
+            return False
+        self._latest[property_id] = (price, code)
+        self._pending.append((property_id, int(ts if ts is not None else self._clock()), price, code))
+        return True
+
+    def flush(self) -> None:
+        """Write queued samples as a new segment, merging segments when there are too many"""
+        if not self._pending:
+            return
+        with file_lock(self._lock_path):
+            Segment.write(self._next_path(), self._pending)
+            self._pending = []
+            self.close()
+            self._open_segments()
+            if len(self.segments) > self.settings.max_segments:
+                self._compact()
+        logger.info(f"Price history: {len(self)} samples of {len(self._latest)} properties "
+                    f"in {len(self.segments)} segments")
+
+    def history(self, property_id: int) -> List[Tuple[int, int, str]]:
+        """(timestamp, price, status) of one property, oldest first"""
+        property_id = int(property_id)
+        rows = []
+        for segment in self.segments:
+            i = segment.find(property_id)
+            if i is not None:
+                rows.extend(segment.samples(i))
+        rows.extend((ts, price, code) for pid, ts, price, code in self._pending if pid == property_id)
+        return [(ts, price, STATUS_NAMES.get(code, "")) for ts, price, code in sorted(rows)]
+
+    def price_drops(self, min_drop_pct: float, days: float, now: Optional[float] = None) -> List[PriceDrop]:
+        """
+        Properties whose latest price is at least min_drop_pct below their
+        highest price of the last `days` days (including the price in effect
+        when that window started), largest drop first.
+        """
+        now = self._clock() if now is None else now
+        since = now - days * 86400
+        current: Dict[int, int] = {}      # property -> latest price so far
+        peak: Dict[int, int] = {}         # property -> highest price in the window
+        changed: Dict[int, int] = {}
+
+        # One pass down each segment's columns. Segments are in write order,
+        # so a property's rows are visited oldest first
+        for segment in self.segments:
+            start_cut = since - segment.base_ts
+            property_ids, offsets, base_price = segment.property_ids, segment.offsets, segment.base_price
+            i, end, property_id, price = -1, 0, 0, 0
+            for row, (ts, delta) in enumerate(zip(segment.ts_delta, segment.price_delta)):
+                if row == end:
+                    # First row of the next property: starts from its base price
+                    i += 1
+                    property_id, end = property_ids[i], offsets[i + 1]
+                    in_effect = current.get(property_id)
+                    price = base_price[i]
+                else:
+                    in_effect = price
+                    price += delta
+                if ts >= start_cut:
+                    # The first row in the window also counts the price in effect before it
+                    top = peak.get(property_id, in_effect)
+                    peak[property_id] = price if top is None or price > top else top
+            for i, property_id in enumerate(property_ids):
+                current[property_id] = segment.last_price[i]
+                changed[property_id] = segment.base_ts + segment.ts_delta[offsets[i + 1] - 1]
+
+        drops = []
+        for property_id, top in peak.items():
+            price = current[property_id]
+            if top > 0 and price < top:
+                drop_pct = (top - price) / top * 100
+                if drop_pct >= min_drop_pct:
+                    drops.append(PriceDrop(property_id, top, price, drop_pct, changed[property_id]))
+        drops.sort(key=lambda drop: drop.drop_pct, reverse=True)
+        return drops
+
+    # ------------------------------------------------------------------
+    # Internal helpers
+    # ------------------------------------------------------------------
+
+    def _open_segments(self) -> None:
+        for path in sorted(self.path.glob("segment-*.bin")):
+            try:
+                self.segments.append(Segment(path))
+            except (OSError, ValueError, struct.error) as e:
+                logger.warning(f"Ignoring unreadable price history segment {path}: {e}")
+        self._latest = {}
+        for segment in self.segments:
+            status, offsets = segment.status, segment.offsets
+            for i, property_id in enumerate(segment.property_ids):
+                self._latest[property_id] = (segment.last_price[i], status[offsets[i + 1] - 1])
+
+    def _next_path(self) -> Path:
+        numbers = [int(p.stem.split("-")[1]) for p in self.path.glob("segment-*.bin")]
+        return self.path / f"segment-{max(numbers, default=0) + 1:08d}.bin"
+
+    def _compact(self) -> None:
+        """Merge every segment into one (called under the lock)"""
+        samples: List[Sample] = []
+        for segment in self.segments:
+            for i, property_id in enumerate(segment.property_ids):
+                samples.extend((property_id, ts, price, code) for ts, price, code in segment.samples(i))
+        old = [segment.path for segment in self.segments]
+        merged = self._next_path()
+        Segment.write(merged, samples)
+        self.close()
+        for path in old:
+            path.unlink()
+        self._open_segments()
+        logger.info(f"Price history: merged {len(old)} segments into {merged.name}")
+
+
+def record_search_homes(history: PriceHistory, homes: Iterable[dict], ts: Optional[float] = None) -> int:
+    """Sample every search home with a property id and a price; returns samples queued"""
+    queued = 0
+    for home in homes:
+        price = (home.get("price") or {}).get("value")
+        if home.get("propertyId") is not None and price:
+            queued += history.record(home["propertyId"], price, home.get("mlsStatus"), ts)
+    return queued
@@ -0,0 +1,108 @@
+# src/housewatch/utils/deadline.py
+
+import logging
+import math
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, fields
+from typing import Optional, Set
+
+logger = logging.getLogger(__name__)
+
+
+class BudgetExceeded(Exception):
+    """Raised when the current stage's time budget (or the run's) has run out"""
+
+    def __init__(self, stage: str):
+        super().__init__(f"{stage} time budget used up")
+        self.stage = stage
+
+
+@dataclass
+class BudgetSettings:
+    """Time limits, loaded from app.budget; None: no limit"""
+    run_minutes: Optional[float] = None        # whole run, notify included
+    search_minutes: Optional[float] = None
+    details_minutes: Optional[float] = None
+    notify_minutes: Optional[float] = None     # kept free at the end of the run
+
+    @classmethod
+    def from_config(cls, cfg: Optional[dict]) -> "BudgetSettings":
+        cfg = cfg or {}
+        known = {f.name for f in fields(cls)}
+        return cls(**{k: v for k, v in cfg.items() if k in known})
+
+
+class Deadline:
+    """Monotonic point in time by which a stage must stop; at=None never expires"""
+
+    __slots__ = ("stage", "at", "_clock")
+
+    def __init__(self, stage: str, at: Optional[float] = None, clock=time.monotonic):
+        self.stage = stage
+        self.at = at
+        self._clock = clock
+
+    def remaining(self) -> float:
+        if self.at is None:
+            return math.inf
+        return max(0.0, self.at - self._clock())
+
+    def expired(self) -> bool:
+        return self.at is not None and self._clock() >= self.at
+
+    def timeout(self, seconds: float) -> float:
+        """seconds, cut to the time left; raises BudgetExceeded when none is left"""
+        if self.expired():
+            raise BudgetExceeded(self.stage)
+        return min(seconds, self.remaining())
+
+
+class RunBudget:
+    """
+    Deadlines for one run. stage() makes a stage's deadline current (its own
+    budget, capped by the run deadline minus the time kept for notify);
+    HTTP requests and the detail workers check budget.current and stop
+    when it expires. Without settings nothing ever expires.
+    """
+
+    def __init__(self, settings: Optional[BudgetSettings] = None, clock=time.monotonic):
+        self.settings = settings or BudgetSettings()
+        self._clock = clock
+        self.started = clock()
+        self.current = Deadline("run", self._work_end(), clock)
+        self.exhausted: Set[str] = set()    # stages cut short, for the run summary
+
+    @contextmanager
+    def stage(self, name: str):
+        previous = self.current
+        self.current = Deadline(name, self._stage_end(name), self._clock)
+        try:
+            yield self.current
+        finally:
+            self.current = previous
+
+    def exceeded(self, error: BudgetExceeded) -> None:
+        """Record a stage cut short; logged once per stage"""
+        if error.stage not in self.exhausted:
+            self.exhausted.add(error.stage)
+            logger.warning(f"{error.stage.capitalize()} time budget used up after "
+                           f"{self.elapsed():.0f}s into the run")
+
+    def elapsed(self) -> float:
+        return self._clock() - self.started
+
+    def _work_end(self) -> Optional[float]:
+        s = self.settings
+        if s.run_minutes is None:
+            return None
+        return self.started + (s.run_minutes - (s.notify_minutes or 0)) * 60
+
+    def _stage_end(self, name: str) -> Optional[float]:
+        minutes = getattr(self.settings, f"{name}_minutes", None)
+        own = self._clock() + minutes * 60 if minutes is not None else None
+        if name == "notify":
+            # Matches found so far are sent even when the run ran over
+            return own
+        ends = [end for end in (own, self._work_end()) if end is not None]
+        return min(ends) if ends else None
@@ -2,34 +2,63 @@
 
 import os
 import re
-import yaml
 from pathlib import Path
 from typing import Dict
-from dotenv import load_dotenv
 
-# Auto search and load env variables defined in .env
-# override=False # Ensure same environment variable not be overrided by .env
 root_dir = Path(__file__).resolve().parent.parent.parent.parent
 env_path = root_dir / ".env"
-load_dotenv(dotenv_path=env_path)
 
+# Search ${VAR_NAME}
+ENV_PATTERN = re.compile(r'\$\{(\w+)\}')
 
-def load_config(path: str) -> Dict:
+_env_loaded = False
+
+
+def load_env() -> None:
     """
-    YAML loader
-    - Auto path (Path.resolve)
-    - Auto load env variables (${VAR_NAME})
+    Auto search and load env variables defined in .env (once per process)
+    override=False # Ensure same environment variable not be overrided by .env
     """
-    path_obj = Path(path).expanduser().resolve()
+    global _env_loaded
+    if _env_loaded:
+        return
+
+    from dotenv import load_dotenv
+    load_dotenv(dotenv_path=env_path)
+    _env_loaded = True
+
+
+def read_yaml(path: Path) -> Dict:
+    """YAML loader without env substitution (placeholders are kept as text)"""
+    import yaml
+
+    with open(path, "r", encoding="utf-8") as f:
+        return yaml.safe_load(f) or {}
+
 
-    if not path_obj.exists():
-        raise FileNotFoundError(f"Cannot find: {path_obj}")
+def env_placeholders(obj) -> set:
+    """Names of all ${VAR_NAME} placeholders used in a parsed YAML tree"""
+    if isinstance(obj, dict):
+        return set().union(*(env_placeholders(v) for v in obj.values()))
+    if isinstance(obj, list):
+        return set().union(*(env_placeholders(v) for v in obj))
+    if isinstance(obj, str):
+        return set(ENV_PATTERN.findall(obj))
+    return set()
 
-    with open(path_obj, "r", encoding="utf-8") as f:
-        content = f.read()
-    
-    # Search ${VAR_NAME}
-    pattern = re.compile(r'\$\{(\w+)\}')
+
+def substitute_env(obj):
+    """
+    Replace ${VAR_NAME} in string values of a parsed YAML tree.
+    A value that is exactly one placeholder gets int/float/bool coercion,
+    so `smtp_port: ${SMTP_PORT}` still loads as a number.
+    """
+    if isinstance(obj, dict):
+        return {k: substitute_env(v) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [substitute_env(v) for v in obj]
+    if not isinstance(obj, str) or "${" not in obj:
+        return obj
 
     def replacer(match):
         env_var = match.group(1)
@@ -38,10 +67,25 @@ def load_config(path: str) -> Dict:
         if value is None:
             print(f"Warning: environment variable '${env_var}' not found!")
             return match.group(0)
-        
+
         return value
-    
-    substituted_content = pattern.sub(replacer, content)
 
-    return yaml.safe_load(substituted_content)
-    
+    whole = ENV_PATTERN.fullmatch(obj)
+    substituted = ENV_PATTERN.sub(replacer, obj)
+    if whole and substituted != obj:
+        return _coerce_scalar(substituted)
+    return substituted
+
+
+def _coerce_scalar(value: str):
+    lowered = value.strip().lower()
+    if lowered in ("true", "yes", "on"):
+        return True
+    if lowered in ("false", "no", "off"):
+        return False
+    for cast in (int, float):
+        try:
+            return cast(value)
+        except ValueError:
+            pass
+    return value
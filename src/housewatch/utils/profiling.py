@@ -0,0 +1,232 @@
+# src/housewatch/utils/profiling.py
+
+import logging
+import time
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List
+
+# cProfile, pstats and tracemalloc are only imported by StageProfiler, so the
+# NullProfiler used on normal runs adds no import cost
+
+logger = logging.getLogger(__name__)
+
+# Pipeline stages in the order they run
+STAGES = ("search", "parse", "details", "filter", "storage", "rank", "notify")
+
+# Stages whose work runs on other threads or processes, which the stage's
+# profile (main thread only) does not see: their CPU profile is mostly waiting
+OFF_THREAD = {
+    "details": "pages are fetched on worker threads and parsed in worker processes",
+}
+
+# Call paths kept per function in the collapsed stacks
+MAX_PATHS = 32
+
+
+class NullProfiler:
+    """Profiler used when profiling is off: every stage is a shared no-op context"""
+
+    enabled = False
+    _null_stage = nullcontext()
+
+    def stage(self, name: str):
+        return self._null_stage
+
+    def finish(self):
+        return None
+
+
+class StageProfiler:
+    """
+    Record one CPU profile per pipeline stage plus a tracemalloc snapshot.
+    - Nested stages pause the outer stage, so time is charged to one stage only
+    - Only the main thread is profiled: stages in OFF_THREAD show its waits
+    - Output: <output_root>/<timestamp>/<stage>.pstats and <stage>.collapsed
+    """
+
+    enabled = True
+
+    def __init__(self, output_root: Path, top_n: int = 25, frames: int = 10):
+        import tracemalloc
+
+        self.output_dir = Path(output_root) / datetime.now().strftime("%Y%m%d-%H%M%S")
+        self.top_n = top_n
+        self.profiles: Dict[str, "cProfile.Profile"] = {}
+        self.wall_times: Dict[str, float] = {}
+        self._stack: List["cProfile.Profile"] = []
+
+        tracemalloc.start(frames)
+
+    @contextmanager
+    def stage(self, name: str):
+        import cProfile
+
+        # process_time: charge CPU only, so network waits don't hide hot code
+        profile = self.profiles.setdefault(name, cProfile.Profile(time.process_time))
+
+        if self._stack:
+            self._stack[-1].disable()
+        self._stack.append(profile)
+
+        start = time.perf_counter()
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+            self.wall_times[name] = self.wall_times.get(name, 0.0) + time.perf_counter() - start
+            self._stack.pop()
+            if self._stack:
+                self._stack[-1].enable()
+
+    def finish(self) -> Path:
+        """Write all profiles and the memory snapshot, return the output directory"""
+        import pstats
+        import tracemalloc
+
+        snapshot = tracemalloc.take_snapshot()
+        tracemalloc.stop()
+
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+
+        summary = []
+        for name in sorted(self.profiles, key=_stage_order):
+            stats = pstats.Stats(self.profiles[name])
+            stats.dump_stats(self.output_dir / f"{name}.pstats")
+
+            with open(self.output_dir / f"{name}.collapsed", "w", encoding="utf-8") as f:
+                for stack, micros in collapse_stats(stats, root=name):
+                    f.write(f"{stack} {micros}\n")
+
+            line = f"{name:<10} wall {self.wall_times.get(name, 0.0):9.3f}s   cpu {stats.total_tt:9.3f}s"
+            if name in OFF_THREAD:
+                line += f"   (main thread only: {OFF_THREAD[name]})"
+            summary.append(line)
+
+        with open(self.output_dir / "summary.txt", "w", encoding="utf-8") as f:
+            f.write("\n".join(summary) + "\n")
+
+        snapshot = snapshot.filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+        ])
+        with open(self.output_dir / "memory.txt", "w", encoding="utf-8") as f:
+            f.write(f"Top {self.top_n} allocation sites (tracemalloc, by size)\n\n")
+            for stat in snapshot.statistics("traceback")[:self.top_n]:
+                f.write(f"{stat.size / 1024:10.1f} KiB  {stat.count:8d} blocks\n")
+                for line in stat.traceback.format(most_recent_first=True):
+                    f.write(f"    {line}\n")
+                f.write("\n")
+
+        logger.info(f"Profile written to {self.output_dir}")
+        return self.output_dir
+
+
+def _stage_order(name: str) -> int:
+    return STAGES.index(name) if name in STAGES else len(STAGES)
+
+
+def _frame_label(func: tuple) -> str:
+    filename, line, funcname = func
+    if filename == "~":
+        label = funcname
+    else:
+        label = f"{funcname} ({Path(filename).name}:{line})"
+    # ';' separates frames in collapsed format
+    return label.replace(";", ":")
+
+
+def collapse_stats(stats: "pstats.Stats", root: str = "", max_depth: int = 64,
+                   max_paths: int = MAX_PATHS):
+    """
+    Convert a pstats call graph into collapsed stacks ("a;b;c <microseconds>").
+    cProfile only keeps caller->callee edges, so a function's self time is split
+    across its call paths in proportion to the time each incoming edge carried.
+    Functions are visited once, callers first, each extending its callers'
+    paths by one frame; recursive edges are dropped. A function keeps its
+    max_paths heaviest paths and folds the rest into one "[other callers]"
+    path, and stacks deeper than max_depth lose their middle frames, so the
+    cost is linear in the edges however many paths the graph has.
+    """
+    raw = stats.stats  # func -> (cc, nc, tt, ct, callers)
+
+    callees: Dict[tuple, Dict[tuple, float]] = {}
+    for func, (_, _, _, _, callers) in raw.items():
+        for caller, edge in callers.items():
+            if caller in raw and raw[func][3] > 0:
+                callees.setdefault(caller, {})[func] = edge[3]
+
+    order, recursive = _callers_first(raw, callees)
+    head = (root,) if root else ()
+    paths: Dict[tuple, Dict[tuple, float]] = {}    # func -> {stack: share of its time}
+    folded: Dict[str, float] = {}
+
+    for func in order:
+        label = _frame_label(func)
+        incoming: Dict[tuple, float] = {}
+        for caller, edge in raw[func][4].items():
+            if caller not in paths or (caller, func) in recursive:
+                continue
+            share = min(1.0, edge[3] / raw[func][3])
+            for stack, weight in paths[caller].items():
+                stack = _capped(stack + (label,), len(head), max_depth)
+                incoming[stack] = incoming.get(stack, 0.0) + weight * share
+        if not incoming:
+            incoming = {head + (label,): 1.0}
+        paths[func] = incoming = _heaviest(incoming, len(head), label, max_paths)
+
+        tt = raw[func][2]
+        for stack, weight in incoming.items():
+            key = ";".join(stack)
+            folded[key] = folded.get(key, 0.0) + tt * weight
+
+    for key, seconds in sorted(folded.items()):
+        micros = int(seconds * 1_000_000)
+        if micros > 0:
+            yield key, micros
+
+
+def _callers_first(raw: dict, callees: Dict[tuple, Dict[tuple, float]]):
+    """(functions with every caller before its callees, recursive edges), by iterative DFS"""
+    order, recursive, active, done = [], set(), set(), set()
+    starts = [func for func, entry in raw.items() if not any(c in raw for c in entry[4])]
+    for start in starts + list(raw):
+        if start in done:
+            continue
+        active.add(start)
+        todo = [(start, iter(callees.get(start, ())))]
+        while todo:
+            func, children = todo[-1]
+            for child in children:
+                if child in active:
+                    recursive.add((func, child))
+                elif child not in done:
+                    active.add(child)
+                    todo.append((child, iter(callees.get(child, ()))))
+                    break
+            else:
+                todo.pop()
+                active.discard(func)
+                done.add(func)
+                order.append(func)
+    order.reverse()
+    return order, recursive
+
+
+def _capped(stack: tuple, head: int, max_depth: int) -> tuple:
+    if len(stack) <= max_depth:
+        return stack
+    # Keep the stage root and the innermost frames
+    return stack[:head] + ("...",) + stack[len(stack) - (max_depth - head - 1):]
+
+
+def _heaviest(paths: Dict[tuple, float], head: int, label: str, max_paths: int) -> Dict[tuple, float]:
+    if len(paths) <= max_paths:
+        return paths
+    ranked = sorted(paths.items(), key=lambda item: item[1], reverse=True)
+    kept = dict(ranked[:max_paths - 1])
+    other = ranked[0][0][:head] + ("[other callers]", label)
+    kept[other] = kept.get(other, 0.0) + sum(weight for _, weight in ranked[max_paths - 1:])
+    return kept
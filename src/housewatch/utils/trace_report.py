@@ -0,0 +1,118 @@
+# src/housewatch/utils/trace_report.py
+
+import json
+import math
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+def latest_trace(trace_dir: Path) -> Optional[Path]:
+    """Return the most recent trace file in trace_dir, if any"""
+    files = sorted(Path(trace_dir).glob("*.jsonl"))
+    return files[-1] if files else None
+
+
+def load_spans(path: Path) -> List[dict]:
+    spans = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                spans.append(json.loads(line))
+    return spans
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def render_waterfall(spans: List[dict], width: int = 50, limit: Optional[int] = None) -> str:
+    """
+    Render spans as an indented timeline, children under their parent:
+        offset  duration  |   ████      |  name  details
+    """
+    if not spans:
+        return "(no spans)"
+
+    t0 = min(s["start"] for s in spans)
+    t1 = max(s["start"] + s["duration_ms"] / 1000 for s in spans)
+    total = max(t1 - t0, 1e-9)
+
+    children: Dict[Optional[str], List[dict]] = {}
+    ids = {s["span_id"] for s in spans}
+    for s in spans:
+        parent = s["parent_id"] if s["parent_id"] in ids else None
+        children.setdefault(parent, []).append(s)
+    for group in children.values():
+        group.sort(key=lambda s: s["start"])
+
+    lines = [f"{'offset':>9} {'duration':>10}  {'':{width}}  span"]
+
+    def walk(parent_id, depth):
+        for s in children.get(parent_id, []):
+            if limit is not None and len(lines) > limit:
+                return
+            begin = int((s["start"] - t0) / total * width)
+            length = max(1, int(s["duration_ms"] / 1000 / total * width))
+            bar = (" " * begin + "█" * length)[:width].ljust(width)
+
+            attrs = s.get("attrs", {})
+            details = []
+            if s["kind"] == "http":
+                details.append(f"{attrs.get('host', '')} {attrs.get('status', '-')}")
+                if "bytes" in attrs:
+                    details.append(f"{attrs['bytes'] / 1024:.1f}KiB")
+                if attrs.get("attempt", 1) > 1:
+                    details.append(f"attempt {attrs['attempt']}")
+            if s.get("error"):
+                details.append(f"ERROR {s['error']}")
+
+            lines.append(
+                f"{(s['start'] - t0) * 1000:8.0f}ms {s['duration_ms']:8.1f}ms  |{bar}|  "
+                f"{'  ' * depth}{s['name']}  {' '.join(details)}".rstrip()
+            )
+            walk(s["span_id"], depth + 1)
+
+    walk(None, 0)
+    if limit is not None and len(spans) > limit:
+        lines.append(f"... {len(spans) - limit} more spans not shown")
+    return "\n".join(lines)
+
+
+def render_host_table(spans: List[dict]) -> str:
+    """Per-host latency percentiles over HTTP spans"""
+    by_host: Dict[str, List[dict]] = {}
+    for s in spans:
+        if s["kind"] == "http":
+            by_host.setdefault(s.get("attrs", {}).get("host", "?"), []).append(s)
+
+    if not by_host:
+        return "(no HTTP spans)"
+
+    header = (f"{'host':<28} {'reqs':>5} {'errors':>6} {'p50 ms':>9} {'p95 ms':>9} "
+              f"{'p99 ms':>9} {'avg KiB':>8}")
+    lines = [header, "-" * len(header)]
+    for host, group in sorted(by_host.items()):
+        durations = sorted(s["duration_ms"] for s in group)
+        errors = sum(1 for s in group
+                     if s.get("error") or s.get("attrs", {}).get("status", 200) >= 400)
+        sizes = [s["attrs"]["bytes"] for s in group if "bytes" in s.get("attrs", {})]
+        avg_kib = sum(sizes) / len(sizes) / 1024 if sizes else 0.0
+        lines.append(
+            f"{host:<28} {len(group):>5} {errors:>6} {percentile(durations, 50):>9.1f} "
+            f"{percentile(durations, 95):>9.1f} {percentile(durations, 99):>9.1f} {avg_kib:>8.1f}"
+        )
+    return "\n".join(lines)
+
+
+def render_report(path: Path, limit: Optional[int] = 200) -> str:
+    spans = load_spans(path)
+    return "\n\n".join([
+        f"Trace: {path} ({len(spans)} spans)",
+        render_waterfall(spans, limit=limit),
+        render_host_table(spans),
+    ])
@@ -0,0 +1,147 @@
+# src/housewatch/utils/tracing.py
+
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+class Span:
+    """One timed unit of work (run, stage or HTTP request)"""
+
+    __slots__ = ("trace_id", "span_id", "parent_id", "name", "kind", "start", "attrs")
+
+    def __init__(self, trace_id: str, span_id: str, parent_id: Optional[str],
+                 name: str, kind: str, attrs: dict):
+        self.trace_id = trace_id
+        self.span_id = span_id
+        self.parent_id = parent_id
+        self.name = name
+        self.kind = kind
+        self.start = time.time()
+        self.attrs = attrs
+
+    def set(self, **attrs) -> None:
+        """Attach attributes (status code, bytes, attempt, ...) to the span"""
+        self.attrs.update(attrs)
+
+
+class _NullSpan:
+    """Span handed out when tracing is off: accepts and drops everything"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def set(self, **attrs) -> None:
+        pass
+
+
+class NullTracer:
+    """Tracer used when tracing is off"""
+
+    enabled = False
+    _null_span = _NullSpan()
+
+    def span(self, name: str, kind: str = "stage", parent=None, **attrs):
+        return self._null_span
+
+    def current(self):
+        return None
+
+    def close(self) -> None:
+        pass
+
+
+class Tracer:
+    """
+    Minimal span tracer writing one JSON object per finished span.
+    - Parent links follow the per-thread span stack, or an explicit parent
+      for work handed off to other threads
+    - Output: <output_root>/<run_id>.jsonl
+    """
+
+    enabled = True
+
+    def __init__(self, output_root: Path, run_id: Optional[str] = None):
+        self.run_id = run_id or datetime.now().strftime("%Y%m%d-%H%M%S")
+        self.path = Path(output_root) / f"{self.run_id}.jsonl"
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._file = open(self.path, "a", encoding="utf-8")
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._ids = 0
+
+    def _stack(self) -> list:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _next_id(self) -> str:
+        with self._lock:
+            self._ids += 1
+            return f"{os.getpid():x}-{self._ids:x}"
+
+    def current(self) -> Optional[Span]:
+        stack = self._stack()
+        return stack[-1] if stack else None
+
+    @contextmanager
+    def span(self, name: str, kind: str = "stage", parent: Optional[Span] = None, **attrs):
+        stack = self._stack()
+        parent = parent or (stack[-1] if stack else None)
+
+        span = Span(
+            trace_id=self.run_id,
+            span_id=self._next_id(),
+            parent_id=parent.span_id if parent else None,
+            name=name,
+            kind=kind,
+            attrs=attrs,
+        )
+        stack.append(span)
+        started = time.perf_counter()
+        error = None
+        try:
+            yield span
+        except BaseException as e:
+            error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            duration_ms = (time.perf_counter() - started) * 1000
+            stack.pop()
+            self._write(span, duration_ms, error)
+
+    def _write(self, span: Span, duration_ms: float, error: Optional[str]) -> None:
+        record = {
+            "trace_id": span.trace_id,
+            "span_id": span.span_id,
+            "parent_id": span.parent_id,
+            "name": span.name,
+            "kind": span.kind,
+            "start": span.start,
+            "duration_ms": round(duration_ms, 3),
+            "error": error,
+            "attrs": span.attrs,
+        }
+        line = json.dumps(record, ensure_ascii=False, default=str)
+        with self._lock:
+            self._file.write(line + "\n")
+
+    def close(self) -> None:
+        with self._lock:
+            self._file.close()
+        logger.info(f"Trace written to {self.path}")
@@ -0,0 +1,38 @@
+# tests/conftest.py
+"""Shared fixtures: configs built from the shipped YAML files with overrides"""
+
+import copy
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+root_dir = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(root_dir / "src"))
+
+from housewatch.config import compile_config, freeze, validate
+from housewatch.utils.load_config import read_yaml
+
+
+@pytest.fixture
+def make_config():
+    """
+    make_config(app={...}, criteria={...}) -> object shaped like ProjectConfig,
+    with the given top-level sections replacing the shipped ones
+    """
+    base = {key: read_yaml(root_dir / "configs" / f"{key}.yaml")[key] for key in ("email", "criteria", "app")}
+
+    def make(app: dict = None, criteria: dict = None):
+        data = copy.deepcopy(base)
+        data["app"].update(app or {})
+        data["criteria"].update(criteria or {})
+        validate(data)
+        return SimpleNamespace(
+            email=freeze(data["email"]),
+            criteria=freeze(data["criteria"]),
+            app=freeze(data["app"]),
+            compiled=compile_config(data["app"], data["criteria"]),
+        )
+
+    return make
@@ -0,0 +1,108 @@
+# tests/test_cassette.py
+"""
+HTTP cassettes: request keys, recording into the zip archive, replaying
+(including misses), and the scraper's record and replay paths
+"""
+
+import sys
+import zipfile
+from pathlib import Path
+
+import pytest
+
+root_dir = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(root_dir / "src"))
+
+from housewatch.scraper.cassette import INDEX_MEMBER, Cassette, RecordedResponse, request_key
+from housewatch.scraper.redfin_scraper import RedfinScraper
+
+
+class LiveResponse:
+    def __init__(self, url: str, status: int, content: bytes, headers: dict = None):
+        self.url = url
+        self.status_code = status
+        self.content = content
+        self.headers = headers or {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        pass
+
+
+def test_request_key_ignores_host_param_order_and_sort():
+    a = request_key("https://www.redfin.com/stingray/api/gis", {"b": 2, "a": 1, "ord": "x"})
+    b = request_key("http://127.0.0.1:8000/stingray/api/gis", {"a": "1", "b": "2"})
+    assert a == b == "/stingray/api/gis?a=1&b=2"
+    assert request_key("https://www.redfin.com/home/1") == "/home/1?"
+
+
+def test_recorded_responses_replay(tmp_path):
+    path = tmp_path / "run.zip"
+    with Cassette.record_to(path) as cassette:
+        copy = cassette.record("https://www.redfin.com/home/1", None, LiveResponse(
+            "https://www.redfin.com/home/1", 429, b"slow down",
+            {"Retry-After": "5", "Content-Type": "text/html", "Set-Cookie": "x"}))
+        cassette.record("https://www.redfin.com/home/1", None,
+                        LiveResponse("https://www.redfin.com/home/1", 200, b"<html>1</html>"))
+    assert copy.status_code == 429 and copy.content == b"slow down"
+
+    with zipfile.ZipFile(path) as archive:
+        assert INDEX_MEMBER in archive.namelist()
+
+    with Cassette.open(path) as cassette:
+        # The last response recorded for a request wins
+        resp = cassette.replay("https://mirror.example/home/1")
+        assert (resp.status_code, resp.content) == (200, b"<html>1</html>")
+        assert len(cassette.index) == 1
+
+
+def test_only_kept_headers_are_recorded(tmp_path):
+    with Cassette.record_to(tmp_path / "run.zip") as cassette:
+        cassette.record("https://www.redfin.com/a", None, LiveResponse(
+            "https://www.redfin.com/a", 200, b"", {"Content-Type": "text/html", "Set-Cookie": "x"}))
+        assert cassette.index["/a?"]["headers"] == {"Content-Type": "text/html"}
+
+
+def test_unknown_request_is_a_counted_404(tmp_path):
+    path = tmp_path / "run.zip"
+    Cassette.record_to(path).close()
+    with Cassette.open(path) as cassette:
+        resp = cassette.replay("https://www.redfin.com/home/2")
+        assert resp.status_code == 404
+        assert cassette.misses == 1
+
+
+def test_recorded_response_behaves_like_requests():
+    import requests
+
+    resp = RecordedResponse("https://www.redfin.com/x", 500, {}, b"abcdefg")
+    assert list(resp.iter_content(chunk_size=3)) == [b"abc", b"def", b"g"]
+    with pytest.raises(requests.HTTPError):
+        resp.raise_for_status()
+
+
+def test_scraper_records_then_replays_without_network(make_config, tmp_path, monkeypatch):
+    import requests
+
+    url = "https://www.redfin.com/stingray/api/gis"
+    body = b'{}&&{"payload": {"homes": []}}'
+    monkeypatch.setattr(requests, "get", lambda url, **kwargs: LiveResponse(url, 200, body))
+    path = tmp_path / "run.zip"
+    with Cassette.record_to(path) as cassette:
+        scraper = RedfinScraper(make_config(), storage=None, cassette=cassette)
+        assert scraper._get(url, params={"al": 1}).content == body
+
+    def offline(*args, **kwargs):
+        raise AssertionError("replay must not touch the network")
+
+    monkeypatch.setattr(requests, "get", offline)
+    with Cassette.open(path) as cassette:
+        scraper = RedfinScraper(make_config(), storage=None, cassette=cassette)
+        streamed = scraper._get(url, params={"al": 1}, consume=lambda chunks: b"".join(chunks))
+        assert streamed == body
+        # A replayed error status is not retried
+        with pytest.raises(requests.HTTPError):
+            scraper._get(url, params={"al": 2})
+        assert cassette.misses == 1
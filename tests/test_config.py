@@ -0,0 +1,140 @@
+# tests/test_config.py
+"""
+Config snapshot: validation, read-only views, the mtime/env keyed memo and
+on-disk cache, and ${VAR} substitution
+"""
+
+import os
+import shutil
+import sys
+from pathlib import Path
+
+import pytest
+
+root_dir = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(root_dir / "src"))
+
+from housewatch.config import ConfigError, ProjectConfig, freeze, load_snapshot, validate
+from housewatch.utils.load_config import _coerce_scalar, env_placeholders, read_yaml, substitute_env
+
+
+@pytest.fixture
+def config_dir(tmp_path):
+    target = tmp_path / "configs"
+    shutil.copytree(root_dir / "configs", target, ignore=shutil.ignore_patterns("*.local.yaml"))
+    return target
+
+
+def _touch(path: Path, text: str) -> None:
+    """Rewrite a file and move its mtime forward, so the change is always seen"""
+    stat = path.stat()
+    path.write_text(text, encoding="utf-8")
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def _data(config_dir: Path) -> dict:
+    return {key: read_yaml(config_dir / f"{key}.yaml")[key] for key in ("email", "criteria", "app")}
+
+
+def test_snapshot_is_read_only(config_dir, tmp_path):
+    config = ProjectConfig(config_dir, cache_path=tmp_path / "cache.pickle")
+    assert config.app["redfin"]["num_homes"] == 350
+    with pytest.raises(TypeError):
+        config.app["timeout"] = 1
+    assert isinstance(config.criteria["active_modules"], tuple)
+    assert config.compiled.plan.max_price == 1000000
+    assert config.compiled.region_ids == ("29501", "11188", "29522")
+
+
+def test_snapshot_is_reused_until_a_file_changes(config_dir, tmp_path):
+    cache = tmp_path / "cache.pickle"
+    first = load_snapshot(config_dir, cache)
+    assert load_snapshot(config_dir, cache) is first
+    assert cache.exists()
+
+    app = config_dir / "app.yaml"
+    _touch(app, app.read_text().replace("timeout: 15", "timeout: 30"))
+    second = load_snapshot(config_dir, cache)
+    assert second is not first
+    assert second.app["timeout"] == 30
+
+
+def test_local_file_replaces_the_base_file(config_dir, tmp_path):
+    local = config_dir / "app.local.yaml"
+    local.write_text((config_dir / "app.yaml").read_text().replace("num_homes: 350", "num_homes: 10"))
+    snapshot = load_snapshot(config_dir, tmp_path / "cache.pickle")
+    assert snapshot.app["redfin"]["num_homes"] == 10
+    assert local in snapshot.sources
+
+
+def test_disk_cache_keeps_placeholders_not_secrets(config_dir, tmp_path, monkeypatch):
+    monkeypatch.setenv("EMAIL_PASSWORD", "hunter2")
+    cache = tmp_path / "cache.pickle"
+    snapshot = load_snapshot(config_dir, cache)
+    assert snapshot.email["sender_password"] == "hunter2"
+    assert b"hunter2" not in cache.read_bytes()
+
+
+def test_environment_change_is_picked_up(config_dir, tmp_path, monkeypatch):
+    cache = tmp_path / "cache.pickle"
+    monkeypatch.setenv("SENDER_EMAIL", "a@example.com")
+    assert load_snapshot(config_dir, cache).email["sender_email"] == "a@example.com"
+    monkeypatch.setenv("SENDER_EMAIL", "b@example.com")
+    assert load_snapshot(config_dir, cache).email["sender_email"] == "b@example.com"
+
+
+def test_corrupt_cache_is_ignored(config_dir, tmp_path):
+    cache = tmp_path / "cache.pickle"
+    cache.write_bytes(b"not a pickle")
+    assert load_snapshot(config_dir, cache).app["timeout"] == 15
+
+
+def test_missing_file_is_a_config_error(config_dir, tmp_path):
+    (config_dir / "email.yaml").unlink()
+    with pytest.raises(ConfigError, match="Cannot find"):
+        load_snapshot(config_dir, tmp_path / "cache.pickle")
+
+
+def test_validate_reports_every_problem(config_dir):
+    data = _data(config_dir)
+    data["app"]["redfin"]["num_homes"] = 1000
+    data["criteria"]["property"]["min_price"] = 2_000_000
+    data["criteria"]["active_modules"] = ["property", "bogus"]
+    with pytest.raises(ConfigError) as error:
+        validate(data)
+    message = str(error.value)
+    assert "app.redfin.num_homes" in message
+    assert "min_price is greater than max_price" in message
+    assert "unknown module 'bogus'" in message
+
+
+def test_shipped_config_is_valid(config_dir):
+    validate(_data(config_dir))
+
+
+def test_freeze_is_recursive():
+    frozen = freeze({"a": [1, {"b": 2}]})
+    assert frozen["a"] == (1, freeze({"b": 2}))
+    with pytest.raises(TypeError):
+        frozen["a"][1]["b"] = 3
+
+
+def test_env_placeholders_and_substitution(monkeypatch):
+    monkeypatch.setenv("HW_TEST_PORT", "587")
+    monkeypatch.setenv("HW_TEST_USER", "me")
+    tree = {"smtp_port": "${HW_TEST_PORT}", "login": ["user ${HW_TEST_USER}", 3]}
+    assert env_placeholders(tree) == {"HW_TEST_PORT", "HW_TEST_USER"}
+    # A value that is exactly one placeholder is coerced, embedded ones stay text
+    assert substitute_env(tree) == {"smtp_port": 587, "login": ["user me", 3]}
+
+
+def test_missing_placeholder_is_kept(monkeypatch):
+    monkeypatch.delenv("HW_TEST_MISSING", raising=False)
+    assert substitute_env("${HW_TEST_MISSING}") == "${HW_TEST_MISSING}"
+
+
+def test_coerce_scalar():
+    assert _coerce_scalar("yes") is True
+    assert _coerce_scalar("Off") is False
+    assert _coerce_scalar("1.5") == 1.5
+    assert _coerce_scalar("abc") == "abc"
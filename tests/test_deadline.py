@@ -0,0 +1,164 @@
+# tests/test_deadline.py
+"""
+Run time budgets: deadlines, stage limits under the run deadline, the time
+kept for notify, and how requests and the detail stage stop when they expire
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+root_dir = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(root_dir / "src"))
+
+from housewatch.config import ConfigError
+from housewatch.models.house import House
+from housewatch.scraper.rate_control import AdaptiveRateController, RateSettings
+from housewatch.scraper.redfin_scraper import RedfinScraper
+from housewatch.utils.deadline import BudgetExceeded, BudgetSettings, Deadline, RunBudget
+
+MINUTE = 60
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_deadline():
+    clock = Clock()
+    deadline = Deadline("search", clock.now + 10, clock)
+    assert deadline.timeout(30) == 10 and not deadline.expired()
+    clock.now += 10
+    assert deadline.expired() and deadline.remaining() == 0
+    with pytest.raises(BudgetExceeded, match="search time budget used up"):
+        deadline.timeout(30)
+
+
+def test_deadline_without_a_limit_never_expires():
+    deadline = Deadline("run")
+    assert deadline.remaining() == float("inf")
+    assert deadline.timeout(30) == 30
+
+
+def test_stage_is_capped_by_the_run_minus_notify():
+    clock = Clock()
+    budget = RunBudget(BudgetSettings(run_minutes=10, search_minutes=30, details_minutes=2,
+                                      notify_minutes=1), clock)
+    with budget.stage("search") as deadline:
+        assert budget.current is deadline
+        assert deadline.at == clock.now + 9 * MINUTE
+    assert budget.current.stage == "run"
+
+    clock.now += 8 * MINUTE
+    with budget.stage("details") as deadline:
+        assert deadline.remaining() == 1 * MINUTE
+
+
+def test_notify_keeps_its_own_budget_after_the_run_deadline():
+    clock = Clock()
+    budget = RunBudget(BudgetSettings(run_minutes=10, notify_minutes=1), clock)
+    clock.now += 20 * MINUTE
+    with budget.stage("notify") as deadline:
+        assert deadline.remaining() == 1 * MINUTE
+    with budget.stage("storage") as deadline:
+        assert deadline.expired()
+
+
+def test_no_settings_no_limits():
+    budget = RunBudget()
+    with budget.stage("details") as deadline:
+        assert deadline.at is None
+
+
+def test_exceeded_is_recorded_once_per_stage(caplog):
+    budget = RunBudget()
+    budget.exceeded(BudgetExceeded("search"))
+    budget.exceeded(BudgetExceeded("search"))
+    assert budget.exhausted == {"search"}
+    assert len([r for r in caplog.records if "budget used up" in r.message]) == 1
+
+
+def test_budget_settings_are_validated(make_config):
+    with pytest.raises(ConfigError, match="notify_minutes leaves no time"):
+        make_config(app={"budget": {"run_minutes": 5, "notify_minutes": 5}})
+    with pytest.raises(ConfigError, match="app.budget.search_minutes"):
+        make_config(app={"budget": {"search_minutes": -1}})
+
+
+class Page:
+    status_code = 200
+    headers = {}
+    content = b"<html></html>"
+
+    def raise_for_status(self):
+        pass
+
+
+def _house(i) -> House:
+    return House(listing_id=str(i), address=f"{i} Main St", city="Naperville", state="IL",
+                 zip_code="60540", price=600000, url=f"https://www.redfin.com/home/{i}")
+
+
+def test_request_is_not_sent_once_the_budget_is_used_up(make_config):
+    clock = Clock()
+    budget = RunBudget(BudgetSettings(details_minutes=1), clock)
+    scraper = RedfinScraper(make_config(), storage=None, budget=budget)
+    with budget.stage("details"):
+        clock.now += MINUTE
+        with pytest.raises(BudgetExceeded):
+            scraper._get("https://www.redfin.com/home/1")
+
+
+def test_pacing_wait_counts_against_the_budget(make_config, monkeypatch):
+    import requests
+
+    clock = Clock()
+    budget = RunBudget(BudgetSettings(details_minutes=1), clock)
+
+    def sleep(seconds):
+        clock.now += seconds
+
+    # One request every 50s: the second may only go out after 50s of the 60s budget
+    paced = AdaptiveRateController(RateSettings(initial_rps=0.02, min_rps=0.01), clock=clock,
+                                   wall_clock=clock, sleep=sleep)
+    scraper = RedfinScraper(make_config(), storage=None, rate_controller=paced, budget=budget)
+    timeouts = []
+
+    def get(url, timeout=None, **kwargs):
+        timeouts.append(timeout)
+        return Page()
+
+    monkeypatch.setattr(requests, "get", get)
+    with budget.stage("details"):
+        scraper._get("https://www.redfin.com/home/1", timeout=30)
+        scraper._get("https://www.redfin.com/home/2", timeout=30)
+        assert timeouts == [30, 10]
+        with pytest.raises(BudgetExceeded):
+            scraper._get("https://www.redfin.com/home/3", timeout=30)
+    assert len(timeouts) == 2
+
+
+def test_detail_stage_leaves_the_rest_for_the_next_run(make_config, monkeypatch):
+    import requests
+
+    clock = Clock()
+    budget = RunBudget(BudgetSettings(details_minutes=1), clock)
+    unpaced = AdaptiveRateController(RateSettings(initial_rps=1000.0, max_rps=1000.0))
+    scraper = RedfinScraper(make_config(), storage=None, rate_controller=unpaced, budget=budget)
+    scraper.fetch_workers, scraper.parse_workers = 1, 0
+
+    def get(url, **kwargs):
+        clock.now += 40    # each page takes 40s of the 60s budget
+        return Page()
+
+    monkeypatch.setattr(requests, "get", get)
+    with budget.stage("details"):
+        details, failed = scraper._fetch_all_details([_house(i) for i in range(5)])
+    assert [house.listing_id for house, _ in details] == ["0", "1"]
+    assert failed == []
+    assert budget.exhausted == {"details"}
@@ -0,0 +1,79 @@
+# tests/test_detail_parser.py
+"""
+Property-page parsing: school levels from grade ranges, sections with
+several CSS classes, and the inline/process-pool DetailParser
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+root_dir = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(root_dir / "src"))
+
+from housewatch.scraper.detail_parser import INLINE_BELOW, DetailParser, parse_details, parse_schools
+
+
+def _school(name: str, grades: str, extra: str = "") -> str:
+    return (f'<div class="ListItem"><div class="ListItem__heading">{name}</div>'
+            f'<div class="ListItem__description">Public, {grades} {extra}</div></div>')
+
+
+def _page(schools_class: str = "schools-table") -> bytes:
+    items = "".join([
+        _school("Highlands Elementary School", "K-5"),
+        _school("Kennedy Junior High School", "6-8"),
+        _school("Naperville North High School", "9-12"),
+        _school("Preschool Center", "Pre"),
+    ])
+    return (f'<html><body><div class="ListItem"><div class="ListItem__heading">Nearby</div>'
+            f'<div class="ListItem__description">K-5</div></div>'
+            f'<section class="{schools_class}">{items}</section></body></html>').encode()
+
+
+EXPECTED = {
+    "elementary": ["Highlands Elementary School"],
+    "middle": ["Kennedy Junior High School"],
+    "high": ["Naperville North High School"],
+}
+
+
+def test_schools_are_grouped_by_grade_range():
+    assert parse_schools(_page()) == EXPECTED
+
+
+def test_schools_section_with_several_classes():
+    # Regression: a strainer on the whole class attribute dropped this section
+    assert parse_schools(_page("schools-table SchoolsSection expanded")) == EXPECTED
+    assert parse_schools(_page("card schools-table")) == EXPECTED
+
+
+def test_page_without_schools():
+    assert parse_details(b"<html><body><p>nothing</p></body></html>") == {
+        "schools": {"elementary": [], "middle": [], "high": []}, "details": {}}
+
+
+def test_unknown_fields_are_ignored():
+    assert parse_details(_page(), fields=("no_such_field",))["details"] == {}
+
+
+def test_small_batches_parse_inline():
+    with DetailParser.for_pages(INLINE_BELOW - 1, processes=4) as parser:
+        assert parser.processes == 0
+        future = parser.submit(_page())
+        assert future.done()
+        assert future.result()["schools"] == EXPECTED
+
+
+def test_process_pool_gives_the_same_result():
+    with DetailParser(processes=2) as parser:
+        futures = [parser.submit(_page("x schools-table")) for _ in range(4)]
+        assert all(f.result()["schools"] == EXPECTED for f in futures)
+
+
+def test_inline_parse_errors_are_kept_in_the_future():
+    with DetailParser(processes=0) as parser:
+        future = parser.submit(None)
+        with pytest.raises(Exception):
+            future.result()
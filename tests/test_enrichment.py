@@ -0,0 +1,118 @@
+# tests/test_enrichment.py
+"""
+Enrichment fields from the property page: extraction, HOA dues periods,
+the criteria.details matcher and the email rows
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+root_dir = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(root_dir / "src"))
+
+from housewatch.filters.detail_filter import DetailMatcher
+from housewatch.notifier.email_notifier import EmailNotifier
+from housewatch.scraper.detail_parser import FIELDS, parse_details
+
+
+def _school(name: str, grades: str, rating: int, miles: float) -> str:
+    return (f'<div class="ListItem"><div class="ListItem__heading">{name}</div>'
+            f'<div class="ListItem__description">Public, {grades} • {miles} mi</div>'
+            f'<div class="SchoolsListItem__rating">{rating}/10</div></div>')
+
+
+def _key_details(**rows) -> str:
+    return "".join(f'<div class="keyDetails-row"><span class="valueType">{label}</span>'
+                   f'<span class="valueText">{value}</span></div>' for label, value in rows.items())
+
+
+def _page(dues: str = "$150/mo") -> bytes:
+    return (
+        '<html><body>'
+        '<section class="schools-table">'
+        + _school("Highlands Elementary School", "K-5", 9, 0.4)
+        + _school("Naperville North High School", "9-12", 7, 1.8)
+        + '</section>'
+        '<div class="keyDetailsList">'
+        + _key_details(**{"Time on Redfin": "12 days", "HOA Dues": dues})
+        + '</div>'
+        '<table class="tax-history"><tr><td>2022</td><td>$9,800</td></tr>'
+        '<tr><td>2023</td><td>$10,250</td></tr><tr><td>Year</td><td>Tax</td></tr></table>'
+        '<div class="remarks">Lovingly maintained, sold AS-IS. Finished basement.</div>'
+        '</body></html>'
+    ).encode()
+
+
+def test_every_field_is_extracted():
+    details = parse_details(_page(), FIELDS, keywords=("as-is", "pool"))["details"]
+    assert details == {
+        "school_ratings": {"Highlands Elementary School": 9, "Naperville North High School": 7},
+        "school_distances": {"Highlands Elementary School": 0.4, "Naperville North High School": 1.8},
+        "days_on_market": 12,
+        "hoa_dues": 150.0,
+        "tax_history": [{"year": 2022, "tax": 9800.0}, {"year": 2023, "tax": 10250.0}],
+        "remarks_keywords": ["as-is"],
+    }
+
+
+@pytest.mark.parametrize("text, monthly", [
+    ("$150/mo", 150.0),
+    ("$150 monthly", 150.0),
+    ("$600/quarter", 200.0),
+    ("$1,200 semi-annually", 200.0),
+    ("$2,400/year", 200.0),
+    ("$2,400 / yr", 200.0),
+    ("$2,400", None),
+    ("None", None),
+])
+def test_hoa_dues_are_per_month(text, monthly):
+    details = parse_details(_page(dues=text), ["hoa_dues"])["details"]
+    assert details.get("hoa_dues") == monthly
+
+
+def test_only_requested_fields_are_extracted():
+    assert parse_details(_page(), ["days_on_market"])["details"] == {"days_on_market": 12}
+
+
+def test_matcher_fields_follow_the_limits():
+    matcher = DetailMatcher.from_config({"min_school_rating": 8, "max_hoa_dues": 100,
+                                         "exclude_keywords": ["as-is"]})
+    assert matcher.fields == {"school_ratings", "hoa_dues", "remarks_keywords"}
+    assert matcher.keywords == ("as-is",)
+
+
+def test_matcher_rejects_only_values_that_break_a_limit():
+    matcher = DetailMatcher(min_school_rating=8, max_school_distance_mi=2.0,
+                            max_days_on_market=30, max_hoa_dues=100)
+    assert matcher.matches(None)
+    assert matcher.matches({"school_ratings": {"a": 9}, "school_distances": {"a": 1.0},
+                            "days_on_market": 30, "hoa_dues": 100.0})
+    assert not matcher.matches({"school_ratings": {"a": 9, "b": 7}})
+    assert not matcher.matches({"school_distances": {"a": 2.5}})
+    assert not matcher.matches({"days_on_market": 31})
+    assert not matcher.matches({"hoa_dues": 150.0})
+
+
+def test_matcher_keywords():
+    matcher = DetailMatcher(exclude_keywords=("as-is",), require_keywords=("basement",))
+    assert matcher.matches({"remarks_keywords": ["Basement"]})
+    assert not matcher.matches({"remarks_keywords": ["basement", "as-is"]})
+    assert not matcher.matches({"remarks_keywords": []})
+    # No remarks on the page: nothing to hold against the house
+    assert matcher.matches({})
+
+
+def test_email_rows_for_the_fields_a_house_has():
+    rows = EmailNotifier._details_rows({
+        "school_ratings": {"Highlands": 9},
+        "hoa_dues": 200.0,
+        "tax_history": [{"year": 2022, "tax": 9800.0}, {"year": 2023, "tax": 10250.0}],
+        "remarks_keywords": [],
+    })
+    assert "Highlands: 9/10" in rows
+    assert "$200/month" in rows
+    assert "$10,250 (2023)" in rows
+    assert "Remarks" not in rows and "Days on Market" not in rows
+    assert EmailNotifier._details_rows(None) == ""
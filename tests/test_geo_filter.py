@@ -0,0 +1,94 @@
+# tests/test_geo_filter.py
+"""
+Geometry criteria: circles, inline polygons and GeoJSON areas, include and
+exclude rules, validation, and filtering of parsed search results
+"""
+
+import json
+import math
+import sys
+from pathlib import Path
+
+import pytest
+
+root_dir = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(root_dir / "src"))
+
+from housewatch.config import ConfigError
+from housewatch.filters.geo_filter import Circle, GeoFilter
+from housewatch.scraper.redfin_scraper import RedfinScraper
+from housewatch.storage.json_storage import HouseStorage
+
+CENTER = [41.75, -88.15]
+# Inline polygons are [lat, lng] points
+EXCLUDED_BLOCK = [[41.76, -88.16], [41.76, -88.14], [41.74, -88.14], [41.74, -88.16]]
+
+
+def test_circle_uses_great_circle_distance():
+    circle = Circle(41.75, -88.15, 1000)
+    assert circle.contains(-88.15, 41.758)          # ~890 m north
+    assert not circle.contains(-88.15, 41.76)       # ~1110 m north
+    assert not circle.contains(-88.139, 41.758)     # inside the box, outside the circle
+
+
+def test_include_and_exclude():
+    geo = GeoFilter.from_config({
+        "include": [{"center": CENTER, "radius_km": 5}],
+        "exclude": [{"polygon": EXCLUDED_BLOCK}],
+    })
+    assert geo.matches(41.77, -88.15)               # in the circle, north of the block
+    assert not geo.matches(41.75, -88.15)           # in the excluded block
+    assert not geo.matches(41.90, -88.15)           # outside every include area
+
+
+def test_without_include_areas_everything_not_excluded_passes():
+    geo = GeoFilter.from_config({"exclude": [{"polygon": EXCLUDED_BLOCK}]})
+    assert geo.matches(10.0, 10.0)
+    assert not geo.matches(41.75, -88.15)
+
+
+def test_houses_without_coordinates():
+    assert not GeoFilter.from_config({}).matches(None, -88.15)
+    assert GeoFilter.from_config({"keep_unlocated": True}).matches(math.nan, math.nan)
+
+
+def test_geojson_area(tmp_path):
+    path = tmp_path / "commute.geojson"
+    ring = [[lng, lat] for lat, lng in EXCLUDED_BLOCK] + [[EXCLUDED_BLOCK[0][1], EXCLUDED_BLOCK[0][0]]]
+    path.write_text(json.dumps({"type": "Polygon", "coordinates": [ring]}))
+    geometry = {"include": [{"geojson": str(path)}]}
+    geo = GeoFilter.from_config(geometry)
+    assert GeoFilter.files(geometry) == [path]
+    assert geo.mask([41.75, 41.80, math.nan], [-88.15, -88.15, math.nan]) == [True, False, False]
+
+
+def test_invalid_areas_are_reported(make_config):
+    with pytest.raises(ConfigError) as error:
+        make_config(criteria={
+            "active_modules": ["property", "location", "geometry"],
+            "geometry": {"include": [{"center": [41.7], "radius_km": 5}, {"polygon": [[1, 2]]}, {"name": "x"}]},
+        })
+    message = str(error.value)
+    assert "include[0]: center" in message
+    assert "include[1]: polygon" in message
+    assert "include[2]: needs radius_km/center" in message
+
+
+def _home(i, lat, lng):
+    return {"propertyId": i, "listingId": i, "state": "IL", "url": f"/IL/Naperville/home/{i}",
+            "price": {"value": 600000}, "yearBuilt": {"value": 1995}, "hoa": {"value": 0},
+            "streetLine": {"value": f"{i} Main St"}, "city": "Naperville", "zip": "60540",
+            "latLong": {"value": {"latitude": lat, "longitude": lng}}}
+
+
+def test_search_results_outside_the_area_never_reach_the_detail_stage(make_config, tmp_path):
+    config = make_config(criteria={
+        "active_modules": ["property", "location", "geometry"],
+        "geometry": {"include": [{"center": CENTER, "radius_km": 2}]},
+    })
+    storage = HouseStorage(tmp_path / "seen.json", tmp_path / "matched.json")
+    scraper = RedfinScraper(config, storage)
+    homes = [_home(1, 41.75, -88.15), _home(2, 41.90, -88.15), _home(3, None, None)]
+
+    batch = scraper._parse_search({"payload": {"homes": homes}})
+    assert [h.listing_id for h in batch] == ["1"]
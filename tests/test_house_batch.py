@@ -0,0 +1,80 @@
+# tests/test_house_batch.py
+"""
+Slotted House and the columnar HouseBatch: round trips, nulls, selection
+and the batch paths of storage and filtering
+"""
+
+import pickle
+import sys
+from pathlib import Path
+
+import pytest
+
+root_dir = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(root_dir / "src"))
+
+from housewatch.models.house import EMPTY_SCHOOLS, House
+from housewatch.models.house_batch import HouseBatch
+from housewatch.storage.json_storage import HouseStorage
+
+
+def _house(i: int, **kwargs) -> House:
+    values = dict(listing_id=str(i), address=f"{i} Main St", city="Naperville", state="IL",
+                  zip_code="60540", price=500000 + i, year_built=1990, beds=4, baths=2.5)
+    values.update(kwargs)
+    return House(**values)
+
+
+def test_house_has_slots_and_shares_empty_schools():
+    a, b = _house(1), _house(2)
+    assert not hasattr(a, "__dict__")
+    assert a.schools is EMPTY_SCHOOLS and b.schools is EMPTY_SCHOOLS
+    with pytest.raises(TypeError):
+        a.schools["high"] = ["X"]
+    assert pickle.loads(pickle.dumps(a)).schools is EMPTY_SCHOOLS
+
+
+def test_batch_round_trips_houses():
+    houses = [
+        _house(1),
+        _house(2, year_built=None, baths=None, latitude=41.7, schools={"high": ["Naperville North"]}),
+        _house(3, hoa_fee=25.0, details={"days_on_market": 4}),
+    ]
+    batch = HouseBatch(houses)
+    assert len(batch) == 3
+    assert list(batch) == houses
+    assert batch[-1] == houses[2]
+    with pytest.raises(IndexError):
+        batch[3]
+
+
+def test_batch_stores_nulls_in_typed_columns():
+    batch = HouseBatch([_house(1, year_built=None, latitude=None)])
+    assert batch.column("year_built").typecode == "q"
+    assert batch[0].year_built is None
+    assert batch[0].latitude is None
+
+
+def test_select_and_where_keep_sparse_rows_aligned():
+    houses = [_house(i, schools={"high": [f"School {i}"]} if i % 2 else None) for i in range(6)]
+    batch = HouseBatch(houses)
+    picked = batch.select([5, 0, 3])
+    assert [h.listing_id for h in picked] == ["5", "0", "3"]
+    assert picked[0].schools == {"high": ["School 5"]}
+    assert picked[1].schools is EMPTY_SCHOOLS
+
+    odd = batch.where(i % 2 == 1 for i in range(6))
+    assert [h.schools["high"][0] for h in odd] == ["School 1", "School 3", "School 5"]
+
+
+def test_storage_selects_and_marks_batches(tmp_path):
+    storage = HouseStorage(tmp_path / "seen.json", tmp_path / "matched.json")
+    batch = HouseBatch([_house(1), _house(2), _house(3, listing_id="")])
+    storage.mark_as_seen(batch[0])
+
+    new = storage.select_new(batch)
+    assert [h.listing_id for h in new] == ["2"]
+
+    storage.make_multiple_as_seen(batch)
+    assert storage.seen_houses["2"] == "2 Main St, Naperville, IL 60540"
+    assert "" not in storage.seen_houses
@@ -0,0 +1,105 @@
+# tests/test_incremental_search.py
+"""
+Incremental region search: request plans from the watermark, early stop
+on newest-first responses, and watermark updates that keep unseen
+candidates searchable
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+root_dir = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(root_dir / "src"))
+
+from housewatch.models.house import House
+from housewatch.models.house_batch import HouseBatch
+from housewatch.scraper.redfin_scraper import STOP_AFTER_OLD, RedfinScraper
+from housewatch.storage.json_storage import HouseStorage
+
+NOW = 1_700_000_000.0
+HOUR = 3600
+
+
+@pytest.fixture
+def storage(tmp_path):
+    return HouseStorage(tmp_path / "seen.json", tmp_path / "matched.json")
+
+
+@pytest.fixture
+def scraper(make_config, storage):
+    return RedfinScraper(make_config(), storage)
+
+
+def _body(ages_hours) -> list:
+    """Search body, one home per age (hours on Redfin), as one chunk"""
+    homes = [{"propertyId": i, "listingId": i, "timeOnRedfin": {"value": age * HOUR * 1000}}
+             for i, age in enumerate(ages_hours, 1)]
+    return [("{}&&" + json.dumps({"payload": {"homes": homes}})).encode()]
+
+
+def test_first_search_of_a_region_is_a_full_sweep(scraper):
+    params, stop_before = scraper._search_plan("29501", NOW)
+    assert stop_before is None
+    assert "ord" not in params
+
+
+def test_region_with_a_watermark_is_searched_newest_first(scraper, storage):
+    storage.set_watermark("29501", NOW - 10 * HOUR, full_sweep_at=NOW - HOUR)
+    params, stop_before = scraper._search_plan("29501", NOW)
+    assert params["ord"] == "days-on-redfin-asc"
+    assert params["region_id"] == "29501"
+    assert stop_before == NOW - 10 * HOUR - 60 * 60      # minus margin_minutes
+
+
+def test_full_sweep_is_repeated_after_full_sweep_hours(scraper, storage):
+    storage.set_watermark("29501", NOW - 10 * HOUR, full_sweep_at=NOW - 25 * HOUR)
+    assert scraper._search_plan("29501", NOW)[1] is None
+
+
+def test_disabled_incremental_search_always_sweeps(make_config, storage):
+    scraper = RedfinScraper(make_config(app={"redfin": {"num_homes": 350}}), storage)
+    storage.set_watermark("29501", NOW - 10 * HOUR, full_sweep_at=NOW - HOUR)
+    assert scraper._search_plan("29501", NOW)[1] is None
+
+
+def test_reading_stops_after_old_homes_in_a_row():
+    seen, listings = {}, []
+    ages = [1, 2, 3, 30, 31, 32, 33, 34]
+    count = RedfinScraper._collect_homes(_body(ages), seen, NOW, listings, stop_before=NOW - 10 * HOUR)
+    assert count == 3 + STOP_AFTER_OLD
+    assert listings[0] == ("1", NOW - HOUR)
+    assert seen[1]["listedAt"] == NOW - HOUR
+
+
+def test_response_that_is_not_newest_first_is_read_in_full():
+    ages = [1, 30, 2, 31, 32, 33, 34]
+    count = RedfinScraper._collect_homes(_body(ages), {}, NOW, [], stop_before=NOW - 10 * HOUR)
+    assert count == len(ages)
+
+
+def _candidate(listing_id) -> House:
+    return House(listing_id=listing_id, address="1 Main St", city="Naperville", state="IL",
+                 zip_code="60540", price=600000)
+
+
+def test_watermark_stops_before_the_oldest_unseen_candidate(scraper, storage):
+    scraper._searched_regions = {
+        "29501": ([("1", NOW - HOUR), ("2", NOW - 5 * HOUR), ("3", NOW - 9 * HOUR)], True),
+        "11188": ([("4", NOW - 2 * HOUR)], False),
+    }
+    storage.seen_houses.update({"1": "x", "3": "x", "4": "x"})
+    scraper._update_watermarks(HouseBatch([_candidate(str(i)) for i in (1, 2, 3, 4)]))
+
+    assert storage.get_watermark("29501")["newest_listed_at"] == NOW - 5 * HOUR - 1
+    assert storage.get_watermark("29501")["last_full_sweep"] > NOW
+    assert storage.get_watermark("11188") == {"newest_listed_at": NOW - 2 * HOUR}
+
+
+def test_watermarks_are_saved_with_the_seen_houses(storage, tmp_path):
+    storage.set_watermark("29501", NOW, full_sweep_at=NOW)
+    storage.save_seen()
+    reloaded = HouseStorage(tmp_path / "seen.json", tmp_path / "matched.json")
+    assert reloaded.get_watermark("29501") == {"newest_listed_at": NOW, "last_full_sweep": NOW}
@@ -0,0 +1,167 @@
+# tests/test_job_queue.py
+"""
+SQLite lease queue for distributed detail fetches: leasing order, expired
+leases, lost leases, releases, and the coordinator/worker round trip
+"""
+
+import sys
+import threading
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+root_dir = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(root_dir / "src"))
+
+from housewatch.models.house import House
+from housewatch.scraper.distributed import DistributedSettings, QueueDispatcher, Worker
+from housewatch.storage.job_queue import JobQueue
+
+SCHOOLS = {"elementary": ["A"], "middle": ["B"], "high": ["C"]}
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1_700_000_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _house(i) -> House:
+    return House(listing_id=str(i), address=f"{i} Main St", city="Naperville", state="IL",
+                 zip_code="60540", price=600000 + i, url=f"https://www.redfin.com/home/{i}",
+                 listed_date=datetime(2024, 5, 1, 12, 30))
+
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+@pytest.fixture
+def queue(tmp_path, clock):
+    with JobQueue(tmp_path / "jobs.sqlite", clock=clock) as queue:
+        yield queue
+
+
+def test_jobs_are_leased_in_fetch_order_and_round_trip_houses(queue):
+    run_id = queue.start_run([_house(i) for i in (3, 1, 2)])
+    batch = queue.lease("w1", limit=2, lease_seconds=60)
+    assert [house.listing_id for _, house in batch] == ["3", "1"]
+    assert batch[0][1] == _house(3)
+    assert queue.counts(run_id) == {"pending": 1, "leased": 2, "done": 0, "failed": 0}
+
+
+def test_expired_lease_is_handed_to_another_worker(queue, clock):
+    queue.start_run([_house(1)])
+    [(job_id, _)] = queue.lease("w1", 1, lease_seconds=60)
+    assert queue.lease("w2", 1, 60) == []
+    clock.now += 61
+    [(again, _)] = queue.lease("w2", 1, 60)
+    assert again == job_id
+    # The first worker lost the lease: its late result is ignored
+    assert not queue.complete(job_id, "w1", {"schools": SCHOOLS, "details": None})
+    assert queue.complete(job_id, "w2", {"schools": SCHOOLS, "details": None})
+
+
+def test_job_fails_after_max_attempts_expired_leases(queue, clock):
+    run_id = queue.start_run([_house(1)])
+    for _ in range(2):
+        assert queue.lease("w", 1, 60, max_attempts=2)
+        clock.now += 61
+    assert queue.lease("w", 1, 60, max_attempts=2) == []
+    assert queue.results(run_id) == {"1": ("failed", "lease expired 2 times")}
+    assert queue.idle()
+
+
+def test_released_jobs_do_not_count_as_attempts(queue):
+    run_id = queue.start_run([_house(1)])
+    [(job_id, _)] = queue.lease("w1", 1, 60, max_attempts=1)
+    queue.release([job_id], "w1")
+    assert queue.counts(run_id)["pending"] == 1
+    assert queue.lease("w2", 1, 60, max_attempts=1)
+
+
+def test_new_run_replaces_an_unfinished_one(queue):
+    old = queue.start_run([_house(1)])
+    new = queue.start_run([_house(2)])
+    assert sum(queue.counts(old).values()) == 0
+    queue.finish_run(new)
+    assert queue.idle()
+
+
+def test_concurrent_workers_never_share_a_job(tmp_path):
+    path = tmp_path / "jobs.sqlite"
+    with JobQueue(path) as coordinator:
+        coordinator.start_run([_house(i) for i in range(200)])
+
+    leased = []
+    def work(name):
+        with JobQueue(path) as queue:
+            while True:
+                batch = queue.lease(name, 5, 60)
+                if not batch:
+                    return
+                leased.extend(house.listing_id for _, house in batch)
+
+    threads = [threading.Thread(target=work, args=(f"w{i}",)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert sorted(leased, key=int) == [str(i) for i in range(200)]
+
+
+class FakeRate:
+    def __init__(self, paused: float = 0.0):
+        self.paused = paused
+
+    def save(self) -> None:
+        pass
+
+    def paused_for(self, host: str) -> float:
+        return self.paused
+
+
+class FakeScraper:
+    """Enriches even listing ids, fails 1, leaves the rest untried (circuit open)"""
+
+    def __init__(self):
+        self.rate = FakeRate(paused=5.0)
+
+    def enrich(self, houses):
+        details, failed = [], []
+        for house in houses:
+            if int(house.listing_id) % 2 == 0:
+                house.details = {"days_on_market": 3}
+                details.append((house, SCHOOLS))
+            elif house.listing_id == "1":
+                failed.append((house, "fetch failed: 404"))
+        return details, failed
+
+
+def test_coordinator_collects_what_workers_finish(queue, clock):
+    settings = DistributedSettings(batch_size=10, poll_seconds=1, wait_timeout_minutes=1)
+    slept = []
+    worker = Worker(FakeScraper(), queue, "w1", settings, sleep=slept.append)
+
+    def poll(seconds):
+        # Each coordinator poll lets the worker take one batch
+        clock.now += seconds
+        batch = queue.lease("w1", settings.batch_size, settings.lease_seconds)
+        if batch:
+            worker.work(batch)
+
+    dispatcher = QueueDispatcher(queue, settings, clock=clock, sleep=poll)
+    houses = [_house(i) for i in range(1, 6)]
+    details, failed = dispatcher(houses)
+
+    assert [(h.listing_id, s) for h, s in details] == [("2", SCHOOLS), ("4", SCHOOLS)]
+    assert details[0][0].details == {"days_on_market": 3}
+    assert [(h.listing_id, reason) for h, reason in failed] == [("1", "fetch failed: 404")]
+    # Untried jobs were released and the worker sat out the pause each time
+    assert worker.completed == 2 and worker.failed == 1
+    assert slept and all(seconds == 5.0 for seconds in slept)
+    assert queue.idle()
@@ -0,0 +1,32 @@
+# tests/test_lazy_imports.py
+"""
+Start-up cost: importing the entry point must not load the network, HTML,
+mail or YAML libraries; they are imported on first use
+"""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+root_dir = Path(__file__).resolve().parent.parent
+
+HEAVY = ("requests", "bs4", "lxml", "smtplib", "email.mime", "yaml", "dotenv", "cProfile", "tracemalloc")
+
+
+def _modules_after(statement: str) -> set:
+    code = (f"import sys, json; sys.path.insert(0, {str(root_dir / 'src')!r}); {statement}; "
+            f"print(json.dumps(sorted(sys.modules)))")
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    return set(json.loads(out.stdout.splitlines()[-1]))
+
+
+def test_main_import_loads_no_heavy_modules():
+    loaded = _modules_after("import housewatch.main")
+    assert not loaded & set(HEAVY)
+
+
+def test_scraper_and_notifier_imports_stay_light():
+    loaded = _modules_after("import housewatch.scraper.redfin_scraper, housewatch.notifier.email_notifier")
+    assert not loaded & {"requests", "bs4", "lxml", "smtplib", "email.mime"}
+
@@ -0,0 +1,143 @@
+# tests/test_listing_store.py
+"""
+SQLite listing store: upserts that keep schools and match state, candidates
+for reevaluation (on the market, schools known per level), the search used
+by the query server, and how a scraper run fills it
+"""
+
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+root_dir = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(root_dir / "src"))
+
+from housewatch.config import CriteriaPlan
+from housewatch.models.house import House
+from housewatch.scraper.redfin_scraper import RedfinScraper
+from housewatch.storage.json_storage import HouseStorage
+from housewatch.storage.listing_store import ListingStore
+
+SCHOOLS = {"elementary": ["Highlands Elementary School"], "middle": ["Kennedy Junior High School"],
+           "high": ["Naperville North High School"]}
+PLAN = CriteriaPlan(state="IL", property_type="House", min_price=500000, max_price=800000,
+                    min_year_built=1990, max_hoa=100)
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1_700_000_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _house(i, price=600000, city="Naperville", **fields) -> House:
+    fields = {"year_built": 1995, "hoa_fee": 0,
+              "url": f"https://www.redfin.com/IL/{city}/{i}-Main-St/home/{1000 + i}", **fields}
+    return House(listing_id=str(i), address=f"{i} Main St", city=city, state="IL",
+                 zip_code="60540", price=price, **fields)
+
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+@pytest.fixture
+def store(tmp_path, clock):
+    with ListingStore(tmp_path / "listings.sqlite", clock=clock) as store:
+        yield store
+
+
+def test_upsert_refreshes_search_fields_and_keeps_schools(store, clock):
+    house = _house(1, listed_date=datetime(2024, 5, 1, 12, 30))
+    store.upsert([house])
+    house.details = {"days_on_market": 4}
+    store.set_schools([(house, SCHOOLS)])
+
+    clock.now += 60
+    store.upsert([_house(1, price=650000), House(listing_id="", address="x", city="y",
+                                                 state="IL", zip_code="1", price=1)])
+    assert len(store) == 1
+    [(stored, schools)] = store.candidates(PLAN)
+    assert stored.price == 650000
+    assert schools == SCHOOLS
+    assert stored.details == {"days_on_market": 4}
+    assert stored.property_type == "House"
+
+
+def test_candidates_apply_the_search_thresholds(store):
+    store.upsert([_house(1), _house(2, price=900000), _house(3, hoa_fee=200),
+                  _house(4, year_built=1980)])
+    assert [(h.listing_id, s) for h, s in store.candidates(PLAN)] == [("1", None)]
+
+
+def test_matched_listings_are_left_out_unless_asked(store, clock):
+    store.upsert([_house(1), _house(2)])
+    store.mark_matched([_house(1)])
+    assert [h.listing_id for h, _ in store.candidates(PLAN)] == ["2"]
+    assert len(store.candidates(PLAN, include_matched=True)) == 2
+
+
+def test_listings_gone_from_the_search_are_left_out(store, clock):
+    store.upsert([_house(1), _house(2)])
+    clock.now += 3 * 86400
+    store.upsert([_house(2)])
+    assert [h.listing_id for h, _ in store.candidates(PLAN, max_age_days=2)] == ["2"]
+    assert len(store.candidates(PLAN)) == 2
+
+
+def test_schools_missing_a_level_are_unknown(store):
+    store.upsert([_house(1), _house(2)])
+    # Resolved offline when only the high school was asked for
+    store.set_schools([(_house(1), {"high": ["Naperville North High School"]}), (_house(2), SCHOOLS)])
+    levels = ("elementary", "high")
+    assert [(h.listing_id, s is None) for h, s in store.candidates(PLAN, levels=levels)] == [
+        ("1", True), ("2", False)]
+    assert store.candidates(PLAN, levels=("high",))[0][1] == {"high": ["Naperville North High School"]}
+
+
+def test_search_filters_and_pages(store, clock):
+    for i in range(5):
+        clock.now += 1
+        store.upsert([_house(i, price=500000 + i * 100000, city="Naperville" if i % 2 else "Lisle")])
+    store.mark_matched([_house(3)])
+
+    total, rows = store.search(city="naperville")
+    assert total == 2 and [row["listing_id"] for row in rows] == ["3", "1"]
+    total, rows = store.search(min_price=600000, max_price=800000, offset=1, limit=1)
+    assert total == 3 and [row["listing_id"] for row in rows] == ["2"]
+    total, rows = store.search(matched_only=True)
+    assert total == 1 and rows[0]["matched_at"] == pytest.approx(clock.now)
+    assert rows[0]["schools"] is None
+
+
+def test_by_property_id(store):
+    store.upsert([_house(1), _house(2, url="https://www.redfin.com/IL/Lisle/2-Main-St/unit")])
+    assert store.by_property_id() == {1001: ("1 Main St, Naperville", _house(1).url)}
+
+
+def _home(i, price=600000):
+    return {"propertyId": i, "listingId": i, "state": "IL", "url": f"/IL/Naperville/home/{i}",
+            "price": {"value": price}, "yearBuilt": {"value": 1995}, "hoa": {"value": 0},
+            "streetLine": {"value": f"{i} Main St"}, "city": "Naperville", "zip": "60540"}
+
+
+def test_run_keeps_every_parsed_listing(make_config, tmp_path):
+    storage = HouseStorage(tmp_path / "seen.json", tmp_path / "matched.json")
+    store = ListingStore(tmp_path / "listings.sqlite")
+    config = make_config(app={"redfin": {"num_homes": 350}})
+    fetch_details = lambda houses: ([(house, SCHOOLS) for house in houses], [])
+    scraper = RedfinScraper(config, storage, detail_fetcher=fetch_details, listing_store=store)
+    scraper._request_search = lambda: {"payload": {"homes": [_home(1), _home(2, price=99_000_000)]}}
+
+    matches = scraper.fetch()
+    assert [h.listing_id for h in matches] == ["1"]
+    # The out-of-criteria home is stored for a later reevaluation
+    assert len(store) == 2
+    [row] = store.search(matched_only=True)[1]
+    assert row["listing_id"] == "1" and row["schools"] == SCHOOLS
+    store.close()
@@ -0,0 +1,124 @@
+# tests/test_locking.py
+"""
+Overlapping runs: the storage lock, atomic writes, claim owners, and
+HouseStorage's claims and merge-on-write
+"""
+
+import json
+import socket
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+root_dir = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(root_dir / "src"))
+
+from housewatch.models.house import House
+from housewatch.models.house_batch import HouseBatch
+from housewatch.storage import locking
+from housewatch.storage.json_storage import HouseStorage
+from housewatch.storage.locking import atomic_write_json, file_lock, owner_alive, process_owner
+
+
+def _house(i) -> House:
+    return House(listing_id=str(i), address=f"{i} Main St", city="Naperville", state="IL",
+                 zip_code="60540", price=600000)
+
+
+def _storage(tmp_path, owner=None) -> HouseStorage:
+    storage = HouseStorage(tmp_path / "seen.json", tmp_path / "matched.json")
+    if owner is not None:
+        storage.owner = owner
+    return storage
+
+
+@pytest.mark.skipif(locking.fcntl is None, reason="no advisory locks on this platform")
+def test_file_lock_is_exclusive(tmp_path):
+    path = tmp_path / ".lock"
+    events = []
+
+    def other():
+        with file_lock(path):
+            events.append("other")
+
+    with file_lock(path):
+        thread = threading.Thread(target=other)
+        thread.start()
+        time.sleep(0.1)
+        events.append("first")
+    thread.join()
+    assert events == ["first", "other"]
+
+
+def test_atomic_write_json_replaces_the_file(tmp_path):
+    path = tmp_path / "data.json"
+    path.write_text("old")
+    atomic_write_json(path, {"a": "é"})
+    assert json.loads(path.read_text(encoding="utf-8")) == {"a": "é"}
+    assert [p.name for p in tmp_path.iterdir()] == ["data.json"]
+
+
+def test_owner_alive():
+    assert owner_alive(process_owner())
+    assert owner_alive("other-host:1")
+    proc = subprocess.Popen([sys.executable, "-c", "pass"])
+    proc.wait()
+    assert not owner_alive(f"{socket.gethostname()}:{proc.pid}")
+
+
+def test_claims_split_new_houses_between_live_runs(tmp_path):
+    first = _storage(tmp_path)
+    second = _storage(tmp_path, owner="other-host:1")
+    houses = HouseBatch([_house(i) for i in (1, 2, 3)])
+
+    assert [h.listing_id for h in first.claim(HouseBatch([_house(1), _house(2)]))] == ["1", "2"]
+    assert [h.listing_id for h in second.claim(houses)] == ["3"]
+
+    first.release_claims()
+    assert [h.listing_id for h in second.claim(houses)] == ["1", "2", "3"]
+
+
+def test_claims_of_a_dead_process_or_lapsed_ones_are_taken_over(tmp_path):
+    proc = subprocess.Popen([sys.executable, "-c", "pass"])
+    proc.wait()
+    crashed = _storage(tmp_path, owner=f"{socket.gethostname()}:{proc.pid}")
+    crashed.claim(HouseBatch([_house(1)]))
+    remote = _storage(tmp_path, owner="other-host:1")
+    remote.claim_ttl = -1
+    remote.claim(HouseBatch([_house(2)]))
+
+    assert len(_storage(tmp_path).claim(HouseBatch([_house(1), _house(2)]))) == 2
+
+
+def test_houses_seen_by_another_run_are_not_claimed(tmp_path):
+    first, second = _storage(tmp_path), _storage(tmp_path)
+    first.make_multiple_as_seen([_house(1)])
+    first.save_seen()
+    assert len(second.claim(HouseBatch([_house(1)]))) == 0
+
+
+def test_saves_merge_with_what_other_runs_saved(tmp_path):
+    first, second = _storage(tmp_path), _storage(tmp_path)
+    first.make_multiple_as_seen([_house(1)])
+    first.set_watermark("a", 10.0)
+    second.make_multiple_as_seen([_house(2)])
+    second.set_watermark("b", 20.0)
+    first.save_seen()
+    second.save_seen()
+
+    reloaded = _storage(tmp_path)
+    assert set(reloaded.seen_houses) == {"1", "2"}
+    assert reloaded.region_watermarks == {"a": {"newest_listed_at": 10.0},
+                                          "b": {"newest_listed_at": 20.0}}
+
+
+def test_matched_houses_are_recorded_once(tmp_path):
+    first, second = _storage(tmp_path), _storage(tmp_path)
+    first.save_matched([_house(1)])
+    second.save_matched([_house(1), _house(2)])
+    entries = json.loads((tmp_path / "matched.json").read_text())
+    assert [entry["listing_id"] for entry in entries] == ["1", "2"]
@@ -0,0 +1,141 @@
+# tests/test_priors.py
+"""
+Per-cell match priors: cell keys, smoothed scores, the zero-match skip
+rule with exploration, persistence keyed by the criteria, bootstrapping
+from evaluated history, and houses the scraper skips
+"""
+
+import json
+import random
+import sys
+from pathlib import Path
+
+root_dir = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(root_dir / "src"))
+
+from housewatch.models.house import House
+from housewatch.models.house_batch import HouseBatch
+from housewatch.scraper.redfin_scraper import RedfinScraper
+from housewatch.storage.json_storage import HouseStorage
+from housewatch.storage.priors import MatchPriors, PriorSettings, criteria_key
+
+
+def _house(i, zip_code="60540", hood=None, lat=41.755, lng=-88.155):
+    return House(listing_id=str(i), address=f"{i} Main St", city="Naperville", state="IL",
+                 zip_code=zip_code, price=600000, neighborhood=hood, latitude=lat, longitude=lng)
+
+
+def _priors(explore_rate=0.0, **kwargs) -> MatchPriors:
+    return MatchPriors(PriorSettings(explore_rate=explore_rate, **kwargs), rng=random.Random(1))
+
+
+def test_min_evidence_follows_the_confidence_bound():
+    # 0 matches in n: rate < 2% with 95% confidence needs n >= 149
+    assert _priors().min_evidence == 149
+    assert _priors(confidence=0.9, max_match_rate=0.1).min_evidence == 22
+
+
+def test_cells_of_a_house():
+    priors = _priors()
+    assert priors.cells_of(_house(1, hood="Ashbury")) == ["zip:60540", "hood:ashbury", "grid:4175:-8816"]
+    assert priors.cells_of(_house(2, zip_code="", lat=None)) == []
+
+
+def test_likely_matches_are_fetched_first():
+    priors = _priors()
+    for i in range(10):
+        priors.record(_house(i, zip_code="60540", lat=None), matched=i < 5)
+        priors.record(_house(i, zip_code="60565", lat=None), matched=False)
+    fetch, skipped = priors.plan([_house(1, "60565", lat=None), _house(2, "60540", lat=None),
+                                  _house(3, "99999", lat=None)])
+    assert [h.zip_code for h in fetch] == ["60540", "99999", "60565"]
+    assert skipped == []
+
+
+def test_zero_match_cells_are_skipped_once_the_evidence_suffices():
+    priors = _priors()
+    for i in range(priors.min_evidence - 1):
+        priors.record(_house(i), matched=False)
+    assert not priors.should_skip(_house(1000))
+    priors.record(_house(999), matched=False)
+    assert priors.should_skip(_house(1000))
+
+    # One match anywhere among the house's cells keeps it
+    priors.record(_house(1001, hood="Ashbury"), matched=True)
+    assert not priors.should_skip(_house(1002, hood="Ashbury"))
+
+
+def test_exploration_still_fetches_some_skippable_houses():
+    priors = _priors(explore_rate=0.25)
+    for i in range(priors.min_evidence):
+        priors.record(_house(i), matched=False)
+    fetch, skipped = priors.plan([_house(1000 + i) for i in range(400)])
+    assert 60 < len(fetch) < 140
+    assert priors.fetches_avoided == len(skipped)
+
+
+def test_disabled_priors_fetch_everything():
+    priors = MatchPriors(PriorSettings(enabled=False, explore_rate=0.0))
+    for i in range(priors.min_evidence):
+        priors.record(_house(i), matched=False)
+    fetch, skipped = priors.plan([_house(1000)])
+    assert len(fetch) == 1 and skipped == []
+
+
+def test_save_and_load(tmp_path):
+    path = tmp_path / "priors.json"
+    priors = MatchPriors(PriorSettings(), path, key="abc")
+    priors.record(_house(1), matched=True)
+    priors.save()
+    loaded = MatchPriors.load(path, key="abc")
+    assert loaded.cells == priors.cells
+
+
+def test_changed_criteria_rebuild_the_priors(tmp_path):
+    path = tmp_path / "priors.json"
+    priors = MatchPriors(PriorSettings(), path, key=criteria_key({"max_price": 700000}))
+    priors.record(_house(1), matched=False)
+    priors.save()
+
+    key = criteria_key({"max_price": 900000})
+    loaded = MatchPriors.load(path, key=key, history=[(_house(2, lat=None), True)])
+    assert loaded.cells == {"zip:60540": [1, 1]}
+    loaded.save()
+    assert json.loads(path.read_text())["criteria"] == key
+
+
+def test_criteria_key_ignores_key_order_of_frozen_config():
+    from types import MappingProxyType
+
+    frozen = MappingProxyType({"property": MappingProxyType({"max_price": 1, "min_price": 0})})
+    assert criteria_key(frozen) == criteria_key({"property": {"min_price": 0, "max_price": 1}})
+    assert criteria_key(frozen) != criteria_key({"property": {"min_price": 0, "max_price": 2}})
+
+
+def test_bootstrap_from_evaluated_history(tmp_path):
+    history = [(_house(1, lat=None), False), (_house(2, lat=None), True),
+               (_house(3, zip_code="60532", hood="Green Trails", lat=None), False)]
+    priors = MatchPriors.load(tmp_path / "priors.json", history=history)
+    assert priors.cells == {"zip:60540": [2, 1], "zip:60532": [1, 0], "hood:green trails": [1, 0]}
+
+
+def _home(i):
+    return {"propertyId": i, "listingId": i, "state": "IL", "url": f"/IL/Naperville/home/{i}",
+            "price": {"value": 600000}, "yearBuilt": {"value": 1995}, "hoa": {"value": 0},
+            "sqFt": {"value": 2000}, "streetLine": {"value": f"{i} Main St"},
+            "city": "Naperville", "zip": "60540"}
+
+
+def test_skipped_houses_are_not_marked_seen(make_config, tmp_path):
+    priors = _priors()
+    for i in range(priors.min_evidence):
+        priors.record(_house(1000 + i, lat=None), matched=False)
+    storage = HouseStorage(tmp_path / "seen.json", tmp_path / "matched.json")
+    fetched = []
+    scraper = RedfinScraper(make_config(app={"redfin": {"num_homes": 350}}), storage, priors=priors,
+                            detail_fetcher=lambda houses: (fetched.extend(houses) or [], []))
+    scraper._request_search = lambda: {"payload": {"homes": [_home(1), _home(2)]}}
+
+    scraper.fetch()
+    assert fetched == [] and priors.fetches_avoided == 2
+    assert storage.select_new(HouseBatch([_house(1), _house(2)])).column("listing_id") == ["1", "2"]
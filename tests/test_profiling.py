@@ -0,0 +1,117 @@
+# tests/test_profiling.py
+"""
+Per-stage profiler: no-op profiler, nested stage accounting, output files
+and the collapsed-stack conversion
+"""
+
+import pstats
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+root_dir = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(root_dir / "src"))
+
+from housewatch.utils.profiling import NullProfiler, StageProfiler, collapse_stats, _stage_order
+
+
+def _busy(seconds: float) -> None:
+    end = time.process_time() + seconds
+    while time.process_time() < end:
+        pass
+
+
+def test_null_profiler_is_a_shared_noop():
+    profiler = NullProfiler()
+    assert not profiler.enabled
+    assert profiler.stage("search") is profiler.stage("details")
+    with profiler.stage("search"):
+        pass
+    assert profiler.finish() is None
+
+
+def test_stage_profiler_writes_one_profile_per_stage(tmp_path):
+    profiler = StageProfiler(tmp_path, top_n=5)
+    with profiler.stage("search"):
+        _busy(0.02)
+        with profiler.stage("parse"):
+            _busy(0.02)
+    with profiler.stage("search"):
+        _busy(0.01)
+    out = profiler.finish()
+
+    assert out.parent == tmp_path
+    for name in ("search", "parse"):
+        assert (out / f"{name}.pstats").exists()
+        assert (out / f"{name}.collapsed").exists()
+    assert (out / "memory.txt").read_text().startswith("Top 5 allocation sites")
+
+    # Stages are listed in pipeline order, not the order they were entered
+    summary = (out / "summary.txt").read_text().splitlines()
+    assert [line.split()[0] for line in summary] == ["search", "parse"]
+    # The nested stage's wall time is also part of the outer one
+    assert profiler.wall_times["search"] >= profiler.wall_times["parse"]
+
+
+def test_collapse_stats_roots_stacks_at_the_stage(tmp_path):
+    profiler = StageProfiler(tmp_path)
+    with profiler.stage("filter"):
+        _busy(0.03)
+    profiler.finish()
+
+    stacks = dict(collapse_stats(pstats.Stats(profiler.profiles["filter"]), root="filter"))
+    assert stacks
+    assert all(stack.startswith("filter;") for stack in stacks)
+    assert all(micros > 0 for micros in stacks.values())
+    assert any("_busy" in stack for stack in stacks)
+
+
+def test_unknown_stages_sort_last():
+    assert _stage_order("search") < _stage_order("notify") < _stage_order("custom")
+
+
+def _diamond(layers: int, width: int):
+    """pstats-like graph where every function calls every function of the next layer"""
+    funcs = [[("mod.py", layer * 100 + i, f"f{layer}_{i}") for i in range(width)]
+             for layer in range(layers)]
+    raw = {("~", 0, "main"): (1, 1, 0.01, 1.0, {})}
+    for layer, row in enumerate(funcs):
+        callers = list(raw) if layer == 0 else funcs[layer - 1]
+        for func in row:
+            ct = 1.0 / width
+            raw[func] = (1, 1, 0.01, ct, {c: (1, 1, 0.0, ct / len(callers)) for c in callers})
+
+    class Stats:
+        stats = raw
+    return Stats(), sum(entry[2] for entry in raw.values())
+
+
+def test_collapse_stats_is_fast_on_wide_diamond_graphs():
+    # 12 layers of 12: 12**12 distinct call paths to the last layer
+    stats, total = _diamond(layers=12, width=12)
+    start = time.perf_counter()
+    stacks = dict(collapse_stats(stats, root="details"))
+    assert time.perf_counter() - start < 2.0
+    # Every function's self time is still accounted for
+    assert sum(stacks.values()) == pytest.approx(total * 1_000_000, rel=0.01)
+    assert max(len(stack.split(";")) for stack in stacks) <= 64
+
+
+def test_collapse_stats_drops_recursive_edges():
+    a, b = ("m.py", 1, "a"), ("m.py", 2, "b")
+    raw = {a: (2, 2, 0.5, 1.0, {b: (1, 1, 0.1, 0.5)}), b: (1, 1, 0.5, 0.5, {a: (1, 1, 0.5, 0.5)})}
+
+    class Stats:
+        stats = raw
+    stacks = dict(collapse_stats(Stats()))
+    assert stacks == {"a (m.py:1)": 500000, "a (m.py:1);b (m.py:2)": 500000}
+
+
+def test_summary_notes_off_thread_stages(tmp_path):
+    profiler = StageProfiler(tmp_path)
+    with profiler.stage("details"):
+        pass
+    summary = (profiler.finish() / "summary.txt").read_text()
+    assert "main thread only" in summary
@@ -0,0 +1,151 @@
+# tests/test_query.py
+"""
+Match queries: index filters, ordering, pagination, the result cache and
+reloads, and the local JSON server over the index and the listing store
+"""
+
+import json
+import sqlite3
+import sys
+import threading
+from pathlib import Path
+from urllib.error import HTTPError
+from urllib.request import urlopen
+
+import pytest
+
+root_dir = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(root_dir / "src"))
+
+from housewatch.models.house import House
+from housewatch.query.index import MatchIndex, MatchQuery, QuerySettings
+from housewatch.query.server import QueryServer
+from housewatch.storage.listing_store import ListingStore
+
+ENTRIES = [
+    {"listing_id": "1", "address": "1 Main St, Naperville, IL 60540", "price": 600000,
+     "schools": {"elementary": ["Highlands Elementary School"]}, "detected_at": "2024-05-01 08:00:00"},
+    {"listing_id": "2", "address": "2 Oak Ave, Lisle, IL 60532-1234", "price": 500000,
+     "schools": {"elementary": ["Meadow Glens Elementary"]}, "detected_at": "2024-05-03 08:00:00"},
+    {"listing_id": "3", "address": "3 Elm Ct, Naperville, IL 60565", "price": 900000,
+     "schools": {"high": ["Naperville North High School"]}, "detected_at": "2024-05-02 08:00:00"},
+]
+
+
+@pytest.fixture
+def matches_path(tmp_path):
+    path = tmp_path / "matched.json"
+    path.write_text(json.dumps(ENTRIES))
+    return path
+
+
+def _ids(result) -> list:
+    return [entry["listing_id"] for entry in result.items]
+
+
+def test_no_filters_newest_first(matches_path):
+    result = MatchIndex(matches_path).query(MatchQuery())
+    assert result.total == 3 and _ids(result) == ["2", "3", "1"]
+
+
+def test_filters_combine(matches_path):
+    index = MatchIndex(matches_path)
+    assert _ids(index.query(MatchQuery(city="naperville"))) == ["3", "1"]
+    assert _ids(index.query(MatchQuery(zip_code="60532"))) == ["2"]
+    assert _ids(index.query(MatchQuery(school="Highlands Elem"))) == ["1"]
+    assert _ids(index.query(MatchQuery(city="Naperville", max_price=700000))) == ["1"]
+    assert _ids(index.query(MatchQuery(min_price=550000, sort="price", descending=False))) == ["1", "3"]
+    assert index.query(MatchQuery(city="Chicago")).total == 0
+
+
+def test_pages_are_clamped(matches_path):
+    index = MatchIndex(matches_path, QuerySettings(max_page_size=2))
+    result = index.query(MatchQuery(sort="price", limit=10))
+    assert (result.limit, _ids(result)) == (2, ["3", "1"])
+    result = index.query(MatchQuery(sort="price", offset=2, limit=0))
+    assert (result.total, result.limit, _ids(result)) == (3, 1, ["2"])
+
+
+def test_unknown_sort_is_rejected(matches_path):
+    with pytest.raises(ValueError, match="sort must be one of"):
+        MatchIndex(matches_path).query(MatchQuery(sort="city"))
+
+
+def test_results_are_cached_until_the_file_changes(matches_path):
+    index = MatchIndex(matches_path)
+    index.query(MatchQuery())
+    index.query(MatchQuery())
+    assert (index.hits, index.misses) == (1, 1)
+
+    matches_path.write_text(json.dumps(ENTRIES + [dict(ENTRIES[0], listing_id="4")]))
+    assert index.query(MatchQuery()).total == 4
+    assert index.misses == 2
+
+    matches_path.unlink()
+    assert len(index) == 0
+
+
+def test_entries_without_a_readable_date_sort_last(tmp_path):
+    path = tmp_path / "matched.json"
+    path.write_text(json.dumps(ENTRIES + [dict(ENTRIES[0], listing_id="4", detected_at=None),
+                                          dict(ENTRIES[0], listing_id="5", detected_at=20240501)]))
+    result = MatchIndex(path).query(MatchQuery())
+    assert result.total == 5 and _ids(result)[:3] == ["2", "3", "1"]
+
+
+@pytest.fixture
+def server(matches_path, tmp_path):
+    listings_path = tmp_path / "listings.sqlite"
+    server = QueryServer(MatchIndex(matches_path), listings_path, QuerySettings(port=0))
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _get(server, path: str):
+    url = f"http://127.0.0.1:{server.server_address[1]}{path}"
+    try:
+        with urlopen(url, timeout=5) as resp:
+            return resp.status, json.loads(resp.read())
+    except HTTPError as e:
+        return e.code, json.loads(e.read())
+
+
+def test_server_answers_match_queries(server):
+    status, body = _get(server, "/matches?city=Naperville&max_price=700000")
+    assert status == 200 and [item["listing_id"] for item in body["items"]] == ["1"]
+    assert _get(server, "/health") == (200, {"matches": 3, "cache_hits": 0, "cache_misses": 1})
+    assert _get(server, "/nowhere")[0] == 404
+
+
+@pytest.mark.parametrize("query", ["limit=inf", "offset=nan", "min_price=abc", "days=-inf", "sort=zip"])
+def test_server_rejects_bad_parameters(server, query):
+    status, body = _get(server, f"/matches?{query}")
+    assert status == 400 and "error" in body
+
+
+def test_listings_are_read_without_writing(server):
+    # No store yet: an empty page, and no file is created
+    assert _get(server, "/listings")[1]["total"] == 0
+    assert not server.listings_path.exists()
+
+    with ListingStore(server.listings_path) as store:
+        store.upsert([House(listing_id=str(i), address=f"{i} Main St", city="Naperville", state="IL",
+                            zip_code="60540", price=500000 + i) for i in range(3)])
+        store.mark_matched([House(listing_id="1", address="", city="", state="", zip_code="", price=0)])
+    status, body = _get(server, "/listings?matched=1&limit=5")
+    assert status == 200 and body["total"] == 1 and body["items"][0]["listing_id"] == "1"
+    assert _get(server, "/listings?max_price=inf")[0] == 400
+
+
+def test_read_only_store_refuses_writes(tmp_path):
+    path = tmp_path / "listings.sqlite"
+    ListingStore(path).close()
+    with ListingStore(path, read_only=True) as store:
+        assert store.search() == (0, [])
+        with pytest.raises(sqlite3.OperationalError):
+            store.upsert([House(listing_id="1", address="", city="", state="", zip_code="", price=1)])
+    with pytest.raises(sqlite3.OperationalError):
+        ListingStore(tmp_path / "missing.sqlite", read_only=True)
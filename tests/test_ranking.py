@@ -0,0 +1,119 @@
+# tests/test_ranking.py
+"""
+Match ranking: the bounded top-K heap and its remainder, market medians,
+score components, settings, and the market the scraper shows the ranker
+"""
+
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+root_dir = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(root_dir / "src"))
+
+from housewatch.filters.ranking import Ranker, RankingSettings, TopK
+from housewatch.models.house import House
+from housewatch.models.house_batch import HouseBatch
+from housewatch.scraper.redfin_scraper import RedfinScraper
+from housewatch.storage.json_storage import HouseStorage
+
+
+def _house(i, price=600000, sqft=2000, zip_code="60540", **fields) -> House:
+    return House(listing_id=str(i), address=f"{i} Main St", city="Naperville", state="IL",
+                 zip_code=zip_code, price=price, sqft=sqft, **fields)
+
+
+def test_top_k_keeps_the_best_and_summarizes_the_rest():
+    top = TopK(2)
+    for score, price in ((0.5, 500), (0.9, 900), (0.1, 100), (0.7, 700)):
+        top.push(score, f"h{price}", price)
+    assert top.ranked() == [(0.9, "h900"), (0.7, "h700")]
+    assert len(top) == 2
+    remainder = top.remainder
+    assert (remainder.count, remainder.min_price, remainder.max_price) == (2, 100, 500)
+    assert remainder.best_score == 0.5
+
+
+def test_top_k_ties_keep_arrival_order():
+    top = TopK(2)
+    for item in ("a", "b", "c"):
+        top.push(1.0, item)
+    assert [item for _, item in top.ranked()] == ["a", "b"]
+
+
+def test_top_zero_summarizes_everything():
+    top = TopK(0)
+    top.push(1.0, "a", 100)
+    assert top.ranked() == [] and top.remainder.count == 1
+
+
+def test_market_medians_per_zip_code():
+    ranker = Ranker()
+    ranker.observe_market(HouseBatch([
+        _house(1, 400000), _house(2, 600000), _house(3, 800000),
+        _house(4, 900000, zip_code="60565"), _house(5, 500000, sqft=0),
+    ]))
+    assert ranker.medians == {"60540": 300.0, "60565": 450.0}
+    assert ranker.overall_median == pytest.approx(350.0)
+
+
+def test_value_component_prefers_cheaper_per_sqft():
+    ranker = Ranker(RankingSettings(weights={"value": 1, "schools": 0, "lot_size": 0,
+                                             "year_built": 0, "hoa": 0}))
+    ranker.observe_market(HouseBatch([_house(1, 600000), _house(2, 600000)]))
+    scores = list(ranker.scores(HouseBatch([_house(3, 300000), _house(4, 600000),
+                                            _house(5, 600000, zip_code="99999"), _house(6, sqft=0)])))
+    assert scores == [pytest.approx(0.75), pytest.approx(0.5), pytest.approx(0.5), 0.5]
+
+
+def test_other_components():
+    settings = RankingSettings(weights={"value": 0, "schools": 0, "lot_size": 1,
+                                        "year_built": 1, "hoa": 1},
+                               lot_size_target=10000, oldest_year=1950)
+    ranker = Ranker(settings, max_hoa=100, now=datetime(2050, 1, 1))
+    [score] = ranker.scores(HouseBatch([_house(1, lot_size=5000, year_built=2000, hoa_fee=25.0)]))
+    assert score == pytest.approx((0.5 + 0.5 + 0.75) / 3)
+
+
+def test_school_ratings_beat_name_similarity():
+    ranker = Ranker(RankingSettings(weights={"value": 0, "schools": 1, "lot_size": 0,
+                                             "year_built": 0, "hoa": 0}))
+    batch = HouseBatch([_house(1, details={"school_ratings": {"a": 8, "b": 6}}), _house(2)])
+    assert list(ranker.scores(batch)) == [pytest.approx(0.7), 0.5]
+
+
+def test_rank_returns_houses_best_first():
+    ranker = Ranker(RankingSettings(top_k=1))
+    ranker.observe_market(HouseBatch([_house(1), _house(2)]))
+    ranked, remainder = ranker.rank(HouseBatch([_house(1, 700000), _house(2, 400000)]))
+    assert [house.listing_id for _, house in ranked] == ["2"]
+    assert remainder.count == 1 and remainder.min_price == 700000
+
+
+def test_settings_merge_weights():
+    settings = RankingSettings.from_config({"top_k": 5, "weights": {"hoa": 0}, "unknown": 1})
+    assert settings.top_k == 5
+    assert settings.weights["hoa"] == 0 and settings.weights["value"] == 0.35
+
+
+def _home(i, price):
+    return {"propertyId": i, "listingId": i, "state": "IL", "url": f"/IL/Naperville/home/{i}",
+            "price": {"value": price}, "yearBuilt": {"value": 1995}, "hoa": {"value": 0},
+            "sqFt": {"value": 2000}, "streetLine": {"value": f"{i} Main St"},
+            "city": "Naperville", "zip": "60540"}
+
+
+def test_market_includes_seen_and_out_of_criteria_homes(make_config, tmp_path):
+    storage = HouseStorage(tmp_path / "seen.json", tmp_path / "matched.json")
+    storage.make_multiple_as_seen([_house(1), _house(2)])
+    ranker = Ranker()
+    scraper = RedfinScraper(make_config(app={"redfin": {"num_homes": 350}}), storage, ranker=ranker,
+                            detail_fetcher=lambda houses: ([], []))
+    scraper._request_search = lambda: {"payload": {"homes": [
+        _home(1, 600000), _home(2, 640000), _home(3, 800000), _home(4, 99_000_000)]}}
+
+    scraper.fetch()
+    # Median of all four ($/sqft 300, 320, 400, 49500), not just the new in-criteria home
+    assert ranker.medians == {"60540": 360.0}
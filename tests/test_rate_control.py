@@ -0,0 +1,193 @@
+# tests/test_rate_control.py
+"""
+Adaptive per-host rate control: AIMD rate changes, pacing, Retry-After,
+the circuit breaker, persisted state, and the scraper's retry loop
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+root_dir = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(root_dir / "src"))
+
+from housewatch.scraper.rate_control import (
+    AdaptiveRateController, CircuitOpenError, RateSettings, parse_retry_after,
+)
+from housewatch.scraper.redfin_scraper import RedfinScraper
+
+
+class FakeTime:
+    """Monotonic and wall clock that only move when something sleeps"""
+
+    def __init__(self, start: float = 1_000_000.0):
+        self.now = start
+        self.slept = []
+
+    def clock(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+def _controller(fake: FakeTime, state_path=None, **settings) -> AdaptiveRateController:
+    return AdaptiveRateController(RateSettings(**settings), state_path=state_path,
+                                  clock=fake.clock, wall_clock=fake.clock, sleep=fake.sleep)
+
+
+def test_rate_grows_additively_and_halves_on_throttle():
+    rate = _controller(FakeTime(), initial_rps=1.0, increase_rps=0.1, max_rps=1.25)
+    for _ in range(5):
+        rate.on_response("a.com", 200)
+    assert rate.rate("a.com") == 1.25
+    rate.on_response("a.com", 429)
+    assert rate.rate("a.com") == 0.625
+    # Other hosts are paced on their own
+    assert rate.rate("b.com") == 1.0
+
+
+def test_server_errors_do_not_change_the_rate():
+    rate = _controller(FakeTime())
+    rate.on_response("a.com", 500)
+    assert rate.rate("a.com") == 1.0
+
+
+def test_acquire_spaces_requests_by_the_rate():
+    fake = FakeTime()
+    rate = _controller(fake, initial_rps=2.0)
+    for _ in range(3):
+        rate.acquire("a.com")
+    assert fake.slept == [0.5, 0.5]
+
+
+def test_retry_after_delays_the_next_request():
+    fake = FakeTime()
+    rate = _controller(fake, breaker_threshold=5)
+    assert rate.on_response("a.com", 429, "7") == 7.0
+    rate.acquire("a.com")
+    assert fake.slept == [7.0]
+
+
+def test_long_retry_after_pauses_the_host_instead_of_blocking():
+    fake = FakeTime()
+    rate = _controller(fake, backoff_max=60.0, breaker_threshold=5)
+    assert rate.on_response("a.com", 503, "86400") == 60.0
+    assert rate.paused_for("a.com") == 86400
+    with pytest.raises(CircuitOpenError):
+        rate.acquire("a.com")
+    assert fake.slept == []
+
+
+def test_breaker_opens_after_repeated_throttles_and_closes_after_cooldown():
+    fake = FakeTime()
+    rate = _controller(fake, breaker_threshold=3, breaker_cooldown=100.0)
+    for _ in range(2):
+        rate.on_response("a.com", 429)
+    rate.acquire("a.com")
+    rate.on_response("a.com", 403)
+    with pytest.raises(CircuitOpenError) as error:
+        rate.acquire("a.com")
+    assert error.value.host == "a.com"
+
+    fake.now += 101
+    rate.acquire("a.com")
+    # A success resets the streak
+    rate.on_response("a.com", 200)
+    rate.on_response("a.com", 429)
+    rate.acquire("a.com")
+
+
+def test_state_survives_a_restart(tmp_path):
+    path = tmp_path / "rate_state.json"
+    fake = FakeTime()
+    rate = _controller(fake, state_path=path, breaker_threshold=1, breaker_cooldown=100.0)
+    rate.on_response("a.com", 429)
+    rate.save()
+
+    restored = _controller(fake, state_path=path)
+    assert restored.rate("a.com") == 0.5
+    assert restored.paused_for("a.com") == 100.0
+
+
+def test_backoff_is_jittered_and_capped():
+    rate = _controller(FakeTime(), backoff_base=2.0, backoff_max=10.0)
+    for attempt in range(1, 8):
+        cap = min(10.0, 2.0 * 2 ** (attempt - 1))
+        assert cap / 2 <= rate.backoff(attempt) <= cap
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("120", 0) == 120.0
+    assert parse_retry_after("Thu, 01 Jan 1970 00:01:00 GMT", 0) == 60.0
+    assert parse_retry_after("Thu, 01 Jan 1970 00:01:00 GMT", 1000) == 0.0
+    assert parse_retry_after("soon", 0) == 0.0
+
+
+def test_max_retries_must_be_a_non_negative_integer(make_config):
+    from housewatch.config import ConfigError
+
+    make_config(app={"rate_limit": {"max_retries": 0}})
+    for bad in (2.5, -1, True):
+        with pytest.raises(ConfigError, match="max_retries"):
+            make_config(app={"rate_limit": {"max_retries": bad}})
+
+
+# ----------------------------------------------------------------------
+# The scraper's retry loop
+# ----------------------------------------------------------------------
+
+class FakeResponse:
+    def __init__(self, status: int, headers: dict = None, content: bytes = b"ok"):
+        self.status_code = status
+        self.headers = headers or {}
+        self.content = content
+
+    def close(self) -> None:
+        pass
+
+    def raise_for_status(self) -> None:
+        import requests
+
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code}", response=self)
+
+
+@pytest.fixture
+def scraper(make_config, monkeypatch):
+    import requests
+
+    fake = FakeTime()
+    responses = []
+    monkeypatch.setattr(requests, "get", lambda url, **kwargs: responses.pop(0))
+    rate = _controller(fake, max_retries=2, backoff_max=60.0, breaker_threshold=5)
+    scraper = RedfinScraper(make_config(), storage=None, rate_controller=rate)
+    return scraper, responses, fake
+
+
+def test_get_retries_throttled_requests(scraper):
+    scraper, responses, fake = scraper
+    responses += [FakeResponse(429, {"Retry-After": "5"}), FakeResponse(503), FakeResponse(200)]
+    assert scraper._get("https://www.redfin.com/home/1").status_code == 200
+    assert not responses
+    assert 5.0 in fake.slept
+
+
+def test_get_raises_once_retries_are_used_up(scraper):
+    import requests
+
+    scraper, responses, _ = scraper
+    responses += [FakeResponse(500)] * 3
+    with pytest.raises(requests.HTTPError):
+        scraper._get("https://www.redfin.com/home/1")
+
+
+def test_get_does_not_wait_out_a_long_retry_after(scraper):
+    scraper, responses, fake = scraper
+    responses += [FakeResponse(429, {"Retry-After": "86400"}), FakeResponse(200)]
+    with pytest.raises(CircuitOpenError):
+        scraper._get("https://www.redfin.com/home/1")
+    assert sum(fake.slept) < 60
+    assert len(responses) == 1
@@ -0,0 +1,115 @@
+# tests/test_retry_queue.py
+"""
+Retry queue for failed detail fetches: exponential back-off, per-run
+budget, giving up, expiry, persistence, and how the scraper uses it
+"""
+
+import sys
+from pathlib import Path
+
+root_dir = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(root_dir / "src"))
+
+from housewatch.models.house import House
+from housewatch.scraper.redfin_scraper import RedfinScraper
+from housewatch.storage.json_storage import HouseStorage
+from housewatch.storage.retry_queue import RetryQueue, RetrySettings
+
+HOUR = 3600
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _house(i) -> House:
+    return House(listing_id=str(i), address=f"{i} Main St", city="Naperville", state="IL",
+                 zip_code="60540", price=600000, url=f"https://www.redfin.com/home/{i}")
+
+
+def test_failures_back_off_exponentially():
+    clock = Clock()
+    queue = RetryQueue(RetrySettings(base_delay_hours=1, max_attempts=5), clock=clock)
+    house = _house(1)
+    for attempt, delay_hours in ((1, 1), (2, 2), (3, 4)):
+        assert not queue.record_failure(house, "timeout")
+        assert queue.entries["1"]["next_eligible"] == clock.now + delay_hours * HOUR
+        assert queue.entries["1"]["attempts"] == attempt
+
+
+def test_due_retries_go_first_within_the_budget():
+    clock = Clock()
+    queue = RetryQueue(RetrySettings(per_run_budget=1), clock=clock)
+    for i in (1, 2, 3):
+        queue.record_failure(_house(i), "no school data on the page")
+    clock.now += 2 * HOUR
+    queue.record_failure(_house(3), "again")    # not due for another 2 hours
+
+    planned = queue.plan([_house(10), _house(1), _house(2), _house(3)])
+    assert [h.listing_id for h in planned] == ["1", "10"]
+
+
+def test_given_up_after_max_attempts():
+    queue = RetryQueue(RetrySettings(max_attempts=2), clock=Clock())
+    assert not queue.record_failure(_house(1), "timeout")
+    assert queue.record_failure(_house(1), "timeout")
+    assert "1" not in queue
+
+
+def test_success_clears_the_entry():
+    queue = RetryQueue(clock=Clock())
+    queue.record_failure(_house(1), "timeout")
+    queue.record_success(_house(1))
+    assert len(queue) == 0
+
+
+def test_entries_expire_and_persist(tmp_path):
+    clock = Clock()
+    path = tmp_path / "retry.json"
+    queue = RetryQueue(RetrySettings(expire_days=1), path, clock=clock)
+    queue.record_failure(_house(1), "timeout")
+    clock.now += 2 * 86400
+    queue.record_failure(_house(2), "timeout")
+    queue.save()
+
+    reloaded = RetryQueue(RetrySettings(), path, clock=clock)
+    assert "1" not in reloaded and "2" in reloaded
+    assert reloaded.entries["2"]["last_error"] == "timeout"
+
+
+def _home(i):
+    return {"propertyId": i, "listingId": i, "state": "IL", "url": f"/IL/Naperville/home/{i}",
+            "price": {"value": 600000}, "yearBuilt": {"value": 1995}, "hoa": {"value": 0},
+            "streetLine": {"value": f"{i} Main St"}, "city": "Naperville", "zip": "60540"}
+
+
+def test_failed_houses_stay_unseen_for_the_next_run(make_config, tmp_path):
+    schools = {"elementary": ["Highlands Elementary School"], "middle": ["Kennedy Junior High School"],
+               "high": ["Naperville North High School"]}
+
+    def fetch_details(houses):
+        details, failed = [], []
+        for house in houses:
+            if house.listing_id == "1":
+                details.append((house, schools))
+            elif house.listing_id == "2":
+                details.append((house, {"elementary": [], "middle": [], "high": []}))
+            else:
+                failed.append((house, "fetch failed: timeout"))
+        return details, failed
+
+    storage = HouseStorage(tmp_path / "seen.json", tmp_path / "matched.json")
+    queue = RetryQueue(path=tmp_path / "retry.json")
+    config = make_config(app={"redfin": {"num_homes": 350}})     # no incremental search
+    scraper = RedfinScraper(config, storage, retry_queue=queue, detail_fetcher=fetch_details)
+    scraper._request_search = lambda: {"payload": {"homes": [_home(1), _home(2), _home(3)]}}
+
+    matches = scraper.fetch()
+    assert [h.listing_id for h in matches] == ["1"]
+    assert set(storage.seen_houses) == {"1"}
+    assert queue.entries["2"]["last_error"] == "no school data on the page"
+    assert queue.entries["3"]["last_error"] == "fetch failed: timeout"
@@ -0,0 +1,99 @@
+# tests/test_schedule.py
+"""
+Adaptive region polling: interval from listing velocity, EWMA updates,
+clamping, due regions, expedited backlogs and persistence
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+root_dir = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(root_dir / "src"))
+
+from housewatch.scraper.schedule import DUE_SLACK_S, RegionScheduler, ScheduleSettings
+
+HOUR = 3600
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1_700_000_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _scheduler(clock, path=None, **settings) -> RegionScheduler:
+    return RegionScheduler(ScheduleSettings(**settings), path, clock=clock)
+
+
+def test_unknown_regions_are_due():
+    assert _scheduler(Clock()).due(["a", "b"]) == ["a", "b"]
+
+
+def test_first_poll_estimates_the_rate_over_a_week():
+    clock = Clock()
+    scheduler = _scheduler(clock)
+    # 14 listings in the last week (and one older): 1 every 12 hours
+    times = [clock.now - i * 12 * HOUR for i in range(14)] + [clock.now - 30 * 24 * HOUR, None]
+    scheduler.observe("a", times)
+    assert scheduler.regions["a"]["rate_per_hour"] == pytest.approx(1 / 12)
+    assert scheduler.regions["a"]["interval_s"] == pytest.approx(12 * HOUR)
+
+
+def test_later_polls_blend_new_arrivals_into_the_rate():
+    clock = Clock()
+    scheduler = _scheduler(clock, smoothing=0.5)
+    scheduler.observe("a", [])
+    scheduler.regions["a"]["rate_per_hour"] = 1.0
+    clock.now += 2 * HOUR
+    # 6 listings since the last poll: 3 per hour
+    scheduler.observe("a", [clock.now - 60] * 6 + [clock.now - 3 * HOUR])
+    assert scheduler.regions["a"]["rate_per_hour"] == pytest.approx(0.5 * 3 + 0.5 * 1)
+
+
+def test_interval_is_clamped():
+    scheduler = _scheduler(Clock(), min_interval_minutes=30, max_interval_hours=24)
+    assert scheduler._interval(100.0) == 30 * 60
+    assert scheduler._interval(0.0) == 24 * HOUR
+    assert scheduler._interval(0.001) == 24 * HOUR
+
+
+def test_region_is_due_once_its_interval_has_elapsed():
+    clock = Clock()
+    scheduler = _scheduler(clock)
+    scheduler.observe("a", [clock.now - i * 2 * HOUR for i in range(84)])     # 1 every 2 hours
+    clock.now += HOUR
+    assert scheduler.due(["a", "new"]) == ["new"]
+    clock.now += HOUR - DUE_SLACK_S
+    assert scheduler.due(["a"]) == ["a"]
+
+
+def test_expedited_region_is_due_after_the_minimum_interval():
+    clock = Clock()
+    scheduler = _scheduler(clock, min_interval_minutes=30)
+    scheduler.observe("a", [])
+    scheduler.expedite("a")
+    clock.now += 30 * 60
+    assert scheduler.due(["a"]) == ["a"]
+    # The next successful poll clears the backlog
+    scheduler.observe("a", [])
+    assert "backlog" not in scheduler.regions["a"]
+
+
+def test_disabled_schedule_polls_everything():
+    clock = Clock()
+    scheduler = _scheduler(clock, enabled=False)
+    scheduler.observe("a", [])
+    assert scheduler.due(["a"]) == ["a"]
+
+
+def test_state_is_saved_and_reloaded(tmp_path):
+    clock = Clock()
+    path = tmp_path / "schedule.json"
+    scheduler = _scheduler(clock, path)
+    scheduler.observe("a", [clock.now - HOUR])
+    scheduler.save()
+    assert _scheduler(clock, path).regions == scheduler.regions
@@ -0,0 +1,95 @@
+# tests/test_school_index.py
+"""
+Fuzzy school names: normalization, exact and trigram lookups, memoizing,
+and the SchoolMatcher built on them
+"""
+
+import pickle
+import sys
+from pathlib import Path
+
+root_dir = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(root_dir / "src"))
+
+from housewatch.filters.school_filter import (
+    SchoolMatcher, filter_by_schools, filter_by_schools_exact, get_school_tiers,
+)
+from housewatch.filters.school_index import SchoolNameIndex, normalize
+from housewatch.models.house import House
+
+CRITERIA = {
+    "elementary": ["Highlands Elementary School", "Ranch View Elementary School"],
+    "middle": ["Kennedy Junior High School"],
+    "high": [],
+}
+
+
+def test_normalize():
+    assert normalize("Kennedy Jr. High School") == "kennedy junior high"
+    assert normalize("St. Mary's School of the Arts & Sciences") == "saint marys arts sciences"
+    assert normalize("") == ""
+
+
+def test_same_words_in_any_order_are_an_exact_hit():
+    index = SchoolNameIndex(["Kennedy Junior High School"])
+    assert index.lookup("kennedy jr high") == ("Kennedy Junior High School", 1.0)
+    assert index.lookup("Junior High Kennedy") == ("Kennedy Junior High School", 1.0)
+
+
+def test_close_spelling_is_found_through_trigrams():
+    index = SchoolNameIndex(["Highlands Elementary School", "Ranch View Elementary School"])
+    name, score = index.lookup("Ranch Vieww Elementary")
+    assert name == "Ranch View Elementary School" and 0.85 <= score < 1.0
+    assert index.lookup("Meadow Glens Elementary") is None
+    assert index.lookup("!!!") is None
+
+
+def test_shared_level_words_do_not_make_a_hit():
+    # Different schools whose names differ only outside "Elementary School"
+    assert SchoolNameIndex(["Highlands Elementary School"]).lookup("Highland Elementary School") is None
+    assert SchoolNameIndex(["Prairie Elementary School"]).lookup("Prairie Ridge Elementary School") is None
+    # The level words alone still make an exact hit
+    assert SchoolNameIndex(["Highlands Elementary School"]).lookup("Highlands") == (
+        "Highlands Elementary School", 1.0)
+
+
+def test_threshold_decides_a_hit():
+    loose = SchoolNameIndex(["Highlands Elementary School"], threshold=0.5)
+    strict = SchoolNameIndex(["Highlands Elementary School"], threshold=0.99)
+    assert loose.lookup("Highland Elementary") is not None
+    assert strict.lookup("Highland Elementary") is None
+
+
+def test_lookups_are_memoized_but_not_pickled():
+    index = SchoolNameIndex(["Highlands Elementary School", "Highlands Elementary School"])
+    assert len(index) == 1
+    index.lookup("Highland Elementary")
+    assert "Highland Elementary" in index._memo
+    assert pickle.loads(pickle.dumps(index))._memo == {}
+
+
+def test_matcher_needs_a_hit_on_every_level_with_criteria():
+    matcher = SchoolMatcher.from_config(CRITERIA)
+    assert matcher.matches({"elementary": ["Ranch View Elem"], "middle": ["Kennedy Jr High"],
+                            "high": ["Anything High"]})
+    assert not matcher.matches({"elementary": ["Ranch View Elem"], "middle": ["Other Middle"]})
+    assert matcher.best("high", []) == ("", 1.0)
+
+
+def test_similarity_averages_levels_with_criteria():
+    matcher = SchoolMatcher.from_config(CRITERIA)
+    assert matcher.similarity({"elementary": ["Highlands Elementary"], "middle": []}) == 0.5
+    assert SchoolMatcher.from_config({}).similarity({}) == 1.0
+
+
+def test_legacy_filters():
+    house = House(listing_id="1", address="1 Main St", city="Naperville", state="IL",
+                  zip_code="60540", price=600000,
+                  schools={"elementary": ["Ranch Vieww Elementary"], "middle": ["Kennedy Jr. High"],
+                           "high": ["Naperville North High School"]})
+    assert filter_by_schools(house, CRITERIA)
+    assert not filter_by_schools_exact(house, CRITERIA)
+    assert get_school_tiers(house, CRITERIA) == {
+        "elementary": ["Ranch Vieww Elementary"], "middle": ["Kennedy Jr. High"],
+        "high": [], "other": ["Naperville North High School"],
+    }
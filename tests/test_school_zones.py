@@ -0,0 +1,135 @@
+# tests/test_school_zones.py
+"""
+Attendance-zone lookups: polygon geometry, the grid index, certainty rules
+near boundaries and overlaps, and offline resolution in the scraper
+"""
+
+import dataclasses
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+root_dir = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(root_dir / "src"))
+
+from housewatch.filters.school_filter import SchoolMatcher
+from housewatch.geo.school_zones import SchoolZoneIndex
+from housewatch.geo.spatial import GridIndex, Polygon, haversine_m, iter_polygons
+from housewatch.models.house import House
+from housewatch.scraper.redfin_scraper import RedfinScraper
+
+
+def _square(min_lng, min_lat, max_lng, max_lat):
+    return [[min_lng, min_lat], [max_lng, min_lat], [max_lng, max_lat], [min_lng, max_lat], [min_lng, min_lat]]
+
+
+def _feature(level, name, ring):
+    return {"type": "Feature", "properties": {"level": level, "name": name},
+            "geometry": {"type": "Polygon", "coordinates": [ring]}}
+
+
+@pytest.fixture
+def zones_file(tmp_path):
+    # Two elementary zones split at lng -88.15; one middle and one high zone over both
+    collection = {"type": "FeatureCollection", "features": [
+        _feature("ES", "West Elementary", _square(-88.20, 41.70, -88.15, 41.80)),
+        _feature("ES", "East Elementary", _square(-88.15, 41.70, -88.10, 41.80)),
+        _feature("Junior High", "Central Middle", _square(-88.20, 41.70, -88.10, 41.80)),
+        _feature("hs", "North High", _square(-88.20, 41.70, -88.10, 41.80)),
+        _feature("daycare", "Skipped", _square(-88.20, 41.70, -88.10, 41.80)),
+    ]}
+    path = tmp_path / "zones.geojson"
+    path.write_text(json.dumps(collection))
+    return path
+
+
+@pytest.fixture
+def index(zones_file):
+    return SchoolZoneIndex.from_config({"path": str(zones_file), "boundary_tolerance_m": 25})
+
+
+def test_polygon_with_hole():
+    polygon = Polygon([_square(0, 0, 10, 10), _square(4, 4, 6, 6)])
+    assert polygon.contains(1, 1)
+    assert not polygon.contains(5, 5)
+    assert not polygon.contains(11, 5)
+    assert polygon.edge_distance_m(5, 0.001) == pytest.approx(111.2, rel=0.01)
+
+
+def test_grid_lists_items_in_every_cell_they_touch():
+    grid = GridIndex.build([(0, (0.0, 0.0, 0.025, 0.005)), (1, (0.02, 0.0, 0.03, 0.005))], cell_size=0.01)
+    assert grid.candidates(0.001, 0.001) == [0]
+    assert grid.candidates(0.021, 0.001) == [0, 1]
+    assert grid.candidates(0.5, 0.5) == []
+
+
+def test_multipolygon_parts_share_properties():
+    feature = {"type": "Feature", "properties": {"name": "A"},
+               "geometry": {"type": "MultiPolygon",
+                            "coordinates": [[_square(0, 0, 1, 1)], [_square(2, 2, 3, 3)]]}}
+    polygons = list(iter_polygons(feature))
+    assert len(polygons) == 2
+    assert all(p.props == {"name": "A"} for p in polygons)
+
+
+def test_haversine():
+    assert haversine_m(41.0, -88.0, 42.0, -88.0) == pytest.approx(111195, rel=0.001)
+
+
+def test_index_normalizes_levels_and_skips_unknown(index):
+    assert len(index) == 4
+    assert index.levels == {"elementary", "middle", "high"}
+
+
+def test_lookup_inside_one_zone_per_level(index):
+    assert index.lookup(41.75, -88.18) == {
+        "elementary": ["West Elementary"], "middle": ["Central Middle"], "high": ["North High"]}
+    assert index.lookup(41.75, -88.12)["elementary"] == ["East Elementary"]
+
+
+def test_lookup_is_uncertain_near_a_boundary(index):
+    # About 8 m from the line between the two elementary zones
+    assert index.lookup(41.75, -88.1501) is None
+    # Only the levels asked for are checked
+    assert index.lookup(41.75, -88.1501, ["high"]) == {"high": ["North High"]}
+
+
+def test_lookup_is_uncertain_outside_coverage_or_without_coordinates(index):
+    assert index.lookup(40.0, -88.18) is None
+    assert index.lookup(None, -88.18) is None
+
+
+def test_lookup_without_levels_resolves_nothing(index):
+    assert index.lookup(41.75, -88.18, ()) is None
+
+
+def test_missing_file_disables_the_index(tmp_path):
+    assert SchoolZoneIndex.from_config({"path": str(tmp_path / "missing.geojson")}) is None
+    assert SchoolZoneIndex.from_config(None) is None
+
+
+def _house(i, lat, lng):
+    return House(listing_id=str(i), address=f"{i} Main St", city="Naperville", state="IL",
+                 zip_code="60540", price=600000, latitude=lat, longitude=lng)
+
+
+def test_scraper_resolves_certain_houses_offline(make_config, zones_file):
+    config = make_config(app={"school_zones": {"path": str(zones_file)}})
+    scraper = RedfinScraper(config, storage=None)
+    houses = [_house(1, 41.75, -88.18), _house(2, 41.75, -88.1501), _house(3, None, None)]
+
+    resolved, to_fetch = scraper._resolve_schools_offline(houses)
+    assert [(h.listing_id, schools["elementary"]) for h, schools in resolved] == [("1", ["West Elementary"])]
+    assert [h.listing_id for h in to_fetch] == ["2", "3"]
+
+
+def test_scraper_skips_offline_resolution_without_levels(make_config, zones_file):
+    config = make_config(app={"school_zones": {"path": str(zones_file)}})
+    config.compiled = dataclasses.replace(config.compiled, schools=SchoolMatcher({}))
+    scraper = RedfinScraper(config, storage=None)
+
+    resolved, to_fetch = scraper._resolve_schools_offline([_house(1, 41.75, -88.18)])
+    assert resolved == []
+    assert len(to_fetch) == 1
@@ -0,0 +1,81 @@
+# tests/test_search_stream.py
+"""
+Streaming search decoder: guard handling, chunk boundaries anywhere (inside
+strings, keys and multi-byte characters), field slimming and truncation
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+root_dir = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(root_dir / "src"))
+
+from housewatch.scraper.search_stream import HomesStreamDecoder, iter_search_homes, slim_home
+
+HOMES = [
+    {"propertyId": 1, "price": {"value": 600000}, "city": "Naperville", "photos": ["a.jpg"] * 3},
+    {"propertyId": 2, "price": {"value": 700000}, "city": "Lisle", "streetLine": {"value": "1 \"Oak\" Ct"}},
+    {"propertyId": 3, "price": {"value": 800000}, "city": "Zürich", "listingRemarks": "[{not json}]"},
+]
+
+
+def _body(homes=HOMES, guard=True) -> bytes:
+    # A decoy "homes" key elsewhere in the envelope must not be picked up
+    envelope = {"version": 1, "errorMessage": "Success",
+                "meta": {"homes": [{"propertyId": -1}]},
+                "payload": {"dataSources": [], "homes": homes, "searchMedian": {"price": 1}}}
+    text = json.dumps(envelope, ensure_ascii=False)
+    return (("{}&&" if guard else "") + text).encode("utf-8")
+
+
+def _chunks(data: bytes, size: int):
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 64, 100000])
+def test_decodes_homes_across_any_chunk_boundary(size):
+    homes = list(iter_search_homes(_chunks(_body(), size)))
+    assert [h["propertyId"] for h in homes] == [1, 2, 3]
+    assert homes[1]["streetLine"] == {"value": "1 \"Oak\" Ct"}
+    assert homes[2]["city"] == "Zürich"
+
+
+def test_slims_homes_to_the_parsed_fields():
+    homes = list(iter_search_homes([_body()]))
+    assert "photos" not in homes[0]
+    assert "listingRemarks" not in homes[2]
+    assert slim_home({"propertyId": 1, "x": 2}) == {"propertyId": 1}
+
+
+def test_body_without_guard():
+    assert len(list(iter_search_homes(_chunks(_body(guard=False), 5)))) == 3
+
+
+def test_stops_reading_after_the_homes_array():
+    chunks = _chunks(_body(), 16)
+
+    consumed = []
+    def source():
+        for chunk in chunks:
+            consumed.append(chunk)
+            yield chunk
+
+    assert len(list(iter_search_homes(source()))) == 3
+    assert len(consumed) < len(chunks)
+
+
+def test_truncated_body_raises():
+    data = _body()
+    cut = data.index(b'"propertyId": 3')
+    with pytest.raises(ValueError):
+        list(iter_search_homes([data[:cut]]))
+
+
+def test_envelope_without_homes_yields_nothing():
+    decoder = HomesStreamDecoder()
+    assert list(decoder.feed(b'{}&&{"errorMessage": "bad region", "payload": {}}')) == []
+    assert decoder.done
+    decoder.close()
@@ -0,0 +1,119 @@
+# tests/test_timeseries.py
+"""
+Price history: the segment file format, sampling only changes, flushing
+and compaction, per-property history and recent price drops
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+root_dir = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(root_dir / "src"))
+
+from housewatch.storage.timeseries import (
+    PriceHistory, PriceHistorySettings, Segment, record_search_homes,
+)
+
+DAY = 86400
+T0 = 1_700_000_000
+
+
+def test_segment_round_trip(tmp_path):
+    path = tmp_path / "segment-00000001.bin"
+    samples = [(7, T0 + 50, 500000, 1), (3, T0 + 10, 410000, 1), (7, T0, 510000, 1),
+               (3, T0 + 20, 400000, 4)]
+    Segment.write(path, samples)
+    segment = Segment(path)
+    assert len(segment) == 4
+    assert list(segment.property_ids) == [3, 7]
+    assert segment.samples(segment.find(3)) == [(T0 + 10, 410000, 1), (T0 + 20, 400000, 4)]
+    assert segment.samples(segment.find(7)) == [(T0, 510000, 1), (T0 + 50, 500000, 1)]
+    assert segment.find(5) is None
+    segment.close()
+
+
+def test_a_file_of_another_format_is_rejected(tmp_path):
+    path = tmp_path / "segment-00000001.bin"
+    path.write_bytes(b"\0" * 64)
+    with pytest.raises(ValueError):
+        Segment(path)
+    # ... and skipped when the history is opened
+    with PriceHistory(tmp_path) as history:
+        assert history.segments == []
+
+
+def test_only_changes_are_sampled(tmp_path):
+    with PriceHistory(tmp_path) as history:
+        assert history.record("7", 500000, "Active", ts=T0)
+        assert not history.record(7, 500000, "Active", ts=T0 + 1)
+        assert history.record(7, 500000, "Pending", ts=T0 + 2)
+        assert not history.record(None, 500000)
+        history.flush()
+
+    # The latest samples are known again after reopening
+    with PriceHistory(tmp_path) as history:
+        assert len(history) == 2
+        assert not history.record(7, 500000, "Pending", ts=T0 + 3)
+
+
+def test_history_merges_segments_and_pending_samples(tmp_path):
+    with PriceHistory(tmp_path) as history:
+        history.record(7, 500000, "Active", ts=T0)
+        history.flush()
+        history.record(7, 480000, "Active", ts=T0 + DAY)
+        assert history.history("7") == [(T0, 500000, "Active"), (T0 + DAY, 480000, "Active")]
+        assert history.history(8) == []
+
+
+def test_segments_are_merged_past_max_segments(tmp_path):
+    settings = PriceHistorySettings(max_segments=2)
+    with PriceHistory(tmp_path, settings) as history:
+        for run in range(3):
+            history.record(7, 500000 - run * 1000, ts=T0 + run * DAY)
+            history.flush()
+        assert len(history.segments) == 1
+        assert [price for _, price, _ in history.history(7)] == [500000, 499000, 498000]
+    assert len(list(tmp_path.glob("segment-*.bin"))) == 1
+
+
+def _history(tmp_path, runs) -> PriceHistory:
+    """One segment per run of (property, days after T0, price) samples"""
+    history = PriceHistory(tmp_path)
+    for run in runs:
+        for property_id, days, price in run:
+            history.record(property_id, price, ts=T0 + days * DAY)
+        history.flush()
+    return history
+
+
+def test_price_drops_against_the_peak_in_the_window(tmp_path):
+    history = _history(tmp_path, [
+        [(1, 0, 500000), (1, 5, 520000), (2, 0, 300000), (3, 0, 200000)],
+        [(1, 8, 450000), (2, 9, 290000), (3, 9, 210000)],
+    ])
+    drops = history.price_drops(min_drop_pct=2, days=7, now=T0 + 10 * DAY)
+    assert [(d.property_id, d.peak_price, d.price) for d in drops] == [(1, 520000, 450000),
+                                                                     (2, 300000, 290000)]
+    assert drops[0].drop_pct == pytest.approx(70000 / 520000 * 100)
+    assert drops[0].changed_at == T0 + 8 * DAY
+    history.close()
+
+
+def test_price_in_effect_when_the_window_starts_counts(tmp_path):
+    # 500k since day 0, cut to 450k on day 9: a drop within the last 7 days
+    history = _history(tmp_path, [[(1, 0, 500000), (1, 9, 450000)]])
+    [drop] = history.price_drops(min_drop_pct=5, days=7, now=T0 + 10 * DAY)
+    assert drop.peak_price == 500000
+    # A cut before the window is not a recent drop
+    assert history.price_drops(min_drop_pct=5, days=0.5, now=T0 + 10 * DAY) == []
+    history.close()
+
+
+def test_record_search_homes(tmp_path):
+    homes = [{"propertyId": 1, "price": {"value": 500000}, "mlsStatus": "Active"},
+             {"propertyId": 2, "price": {}}, {"price": {"value": 1}}]
+    with PriceHistory(tmp_path) as history:
+        assert record_search_homes(history, homes, ts=T0) == 1
+        assert history.history(1) == [(T0, 500000, "Active")]
@@ -0,0 +1,109 @@
+# tests/test_tracing.py
+"""
+Span tracer and trace report: parent links across stacks and threads, error
+capture, percentiles and rendering
+"""
+
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+root_dir = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(root_dir / "src"))
+
+from housewatch.utils.tracing import NullTracer, Tracer
+from housewatch.utils.trace_report import (
+    latest_trace, load_spans, percentile, render_host_table, render_report, render_waterfall,
+)
+
+
+def test_null_tracer_accepts_everything():
+    tracer = NullTracer()
+    with tracer.span("run", kind="run", anything=1) as span:
+        span.set(status=200)
+    assert tracer.current() is None
+    tracer.close()
+
+
+def test_spans_link_to_their_parent(tmp_path):
+    tracer = Tracer(tmp_path, run_id="r1")
+    with tracer.span("run", kind="run") as run:
+        with tracer.span("search") as stage:
+            assert tracer.current() is stage
+            with tracer.span("GET", kind="http", host="example.com") as request:
+                request.set(status=200, bytes=2048)
+        # Work handed to another thread names its parent explicitly
+        def fetch():
+            with tracer.span("details", parent=run):
+                pass
+        worker = threading.Thread(target=fetch)
+        worker.start()
+        worker.join()
+    tracer.close()
+
+    spans = {s["name"]: s for s in load_spans(tracer.path)}
+    assert tracer.path == tmp_path / "r1.jsonl"
+    assert spans["run"]["parent_id"] is None
+    assert spans["search"]["parent_id"] == spans["run"]["span_id"]
+    assert spans["GET"]["parent_id"] == spans["search"]["span_id"]
+    assert spans["details"]["parent_id"] == spans["run"]["span_id"]
+    assert spans["GET"]["attrs"] == {"host": "example.com", "status": 200, "bytes": 2048}
+    assert {s["trace_id"] for s in spans.values()} == {"r1"}
+
+
+def test_span_records_the_error_and_reraises(tmp_path):
+    tracer = Tracer(tmp_path, run_id="r2")
+    with pytest.raises(ValueError):
+        with tracer.span("parse"):
+            raise ValueError("bad page")
+    tracer.close()
+    [span] = load_spans(tracer.path)
+    assert span["error"] == "ValueError: bad page"
+    assert tracer.current() is None
+
+
+def test_percentile_is_nearest_rank():
+    values = [10.0, 20.0, 30.0, 40.0]
+    assert percentile([], 50) == 0.0
+    assert percentile(values, 50) == 20.0
+    assert percentile(values, 95) == 40.0
+    assert percentile(values, 0) == 10.0
+
+
+def _http(span_id, host, ms, status=200, start=0.0, parent=None):
+    return {"span_id": span_id, "parent_id": parent, "name": "GET", "kind": "http", "start": start,
+            "duration_ms": ms, "error": None, "attrs": {"host": host, "status": status, "bytes": 1024}}
+
+
+def test_host_table_counts_errors_per_host():
+    spans = [_http("1", "a.com", 10), _http("2", "a.com", 30, status=503), _http("3", "b.com", 5)]
+    table = render_host_table(spans).splitlines()
+    a = next(line for line in table if line.startswith("a.com")).split()
+    assert a[1:3] == ["2", "1"]         # requests, errors
+    assert render_host_table([]) == "(no HTTP spans)"
+
+
+def test_waterfall_indents_children_and_limits_rows():
+    run = {"span_id": "r", "parent_id": None, "name": "run", "kind": "run", "start": 0.0,
+           "duration_ms": 100.0, "error": None, "attrs": {}}
+    spans = [run] + [_http(str(i), "a.com", 10, start=i / 100, parent="r") for i in range(5)]
+    lines = render_waterfall(spans).splitlines()
+    assert len(lines) == 1 + len(spans)
+    assert "  GET" in lines[2]
+    limited = render_waterfall(spans, limit=2).splitlines()
+    assert limited[-1] == "... 4 more spans not shown"
+    assert render_waterfall([]) == "(no spans)"
+
+
+def test_report_uses_the_latest_trace(tmp_path):
+    for run_id in ("20240101-000000", "20240102-000000"):
+        tracer = Tracer(tmp_path, run_id=run_id)
+        with tracer.span("run", kind="run"):
+            pass
+        tracer.close()
+    path = latest_trace(tmp_path)
+    assert path.name == "20240102-000000.jsonl"
+    assert render_report(path).startswith(f"Trace: {path} (1 spans)")
+    assert latest_trace(tmp_path / "missing") is None